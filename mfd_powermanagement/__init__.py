@@ -3,7 +3,9 @@
 """Module for powermanagement."""
 
 from .ipmi import IpmiStates, Ipmi
-from .pdu import PDUStates, APC, Raritan
-from .dli import DLI, DliSocketPowerStates
+from .pdu import PDUStates, PDUCompletionMode, PDUTelemetrySample, PDUTelemetrySampler, APC, Raritan
+from .dli import DLI, DliBackend, DliSocketPowerStates
+from .fleet import IpmiFleet, IpmiFleetResult, PDUFleet, PDUFleetResult
+from .inrush import InrushScheduler, InrushTarget
 from .ccsg import CCSG, CCSGPowerStates
 from .system.base import SystemPowerManagement
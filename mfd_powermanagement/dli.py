@@ -2,13 +2,31 @@
 # SPDX-License-Identifier: MIT
 """Module for controlling Digital Loggers web power switches."""
 
-import dlipower
+import logging
+import queue
+import threading
+import time
+import weakref
+from contextlib import ExitStack, contextmanager
 from enum import Enum
+from types import TracebackType
+from typing import ClassVar, Dict, Iterable, Iterator, List, Optional, Tuple, Type
+
+import dlipower
+import requests
+from requests.adapters import HTTPAdapter
+from requests.auth import HTTPDigestAuth
 from .base import PowerManagement
-from mfd_common_libs import os_supported
+from .exceptions import PowerManagementException
+from mfd_common_libs import add_logging_level, log_levels, os_supported
 from mfd_typing import OSName
 from mfd_connect import LocalConnection
 
+logger = logging.getLogger(__name__)
+add_logging_level("MODULE_DEBUG", log_levels.MODULE_DEBUG)
+
+REST_OUTLETS_PATH = "/restapi/relay/outlets/"
+
 
 class DliSocketPowerStates(Enum):
     """Available states in PowerManagement."""
@@ -17,10 +35,340 @@ class DliSocketPowerStates(Enum):
     off = "off"
 
 
+class DliBackend(Enum):
+    """API used to control switch."""
+
+    auto = "auto"
+    rest = "rest"
+    dlipower = "dlipower"
+
+
+class DliRestClient:
+    """
+    Client of JSON REST API of Digital Loggers power switches (`/restapi/relay/outlets/`).
+
+    Requests are sent over keep-alive HTTP sessions with digest authentication, so they don't pay for new
+    connection and authentication handshake. State of many outlets is changed by single request with matrix URI
+    (`/restapi/relay/outlets/=0,1,4/state/`). Outlets are numbered from 1, like in dlipower.
+    `requests.Session` isn't safe to share between threads, so each request borrows a session from bounded pool,
+    sessions are created on demand up to `pool_size` and requests over the limit wait for a free one.
+
+    Usage example:
+    >>> client = DliRestClient("10.10.10.10", "admin", "*****")
+    >>> client.set_states([1, 2, 5], False)
+    True
+    """
+
+    def __init__(
+        self,
+        host: str,
+        username: str,
+        password: str,
+        *,
+        timeout: float = 5,
+        use_https: bool = False,
+        pool_size: int = 4,
+    ) -> None:
+        """
+        Init of DliRestClient.
+
+        :param host: Hostname or IP address of switch, optionally with port
+        :param username: User to authenticate
+        :param password: Password of user
+        :param timeout: Timeout of request in seconds
+        :param use_https: Use HTTPS instead of HTTP
+        :param pool_size: Maximal number of HTTP sessions, each keeping one keep-alive connection to switch
+        """
+        self.timeout = timeout
+        self.base_url = f"{'https' if use_https else 'http'}://{host}{REST_OUTLETS_PATH}"
+        self.pool_size = pool_size
+        # switch rejects modifying requests without CSRF header
+        self.headers = {"Accept": "application/json", "X-CSRF": "x"}
+        self._username = username
+        self._password = password
+        self._idle_sessions: "queue.LifoQueue[requests.Session]" = queue.LifoQueue()
+        self._sessions: List[requests.Session] = []
+        self._sessions_lock = threading.Lock()
+        self._pool = threading.BoundedSemaphore(pool_size)
+
+    @property
+    def session_count(self) -> int:
+        """Number of HTTP sessions created by the client."""
+        return len(self._sessions)
+
+    def _create_session(self) -> requests.Session:
+        """Create HTTP session with digest authentication and single keep-alive connection."""
+        session = requests.Session()
+        session.auth = HTTPDigestAuth(self._username, self._password)
+        session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        with self._sessions_lock:
+            self._sessions.append(session)
+        return session
+
+    @contextmanager
+    def _session(self) -> Iterator[requests.Session]:
+        """
+        Borrow HTTP session from pool, waiting when all sessions are in use.
+
+        :return: Session used by current thread only, until it's returned
+        """
+        with self._pool:
+            try:
+                session = self._idle_sessions.get_nowait()
+            except queue.Empty:
+                session = self._create_session()
+            try:
+                yield session
+            finally:
+                self._idle_sessions.put(session)
+
+    def _url(self, outlets: Iterable[int], leaf: str) -> str:
+        """
+        Create URL of outlets resource.
+
+        :param outlets: Numbers of outlets, from 1
+        :param leaf: Resource of outlet e.g. `state`
+        :return: URL with single outlet index or matrix of indexes
+        """
+        indexes = [str(outlet - 1) for outlet in outlets]
+        selector = indexes[0] if len(indexes) == 1 else f"={','.join(indexes)}"
+        return f"{self.base_url}{selector}/{leaf}/"
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send request to switch.
+
+        :param method: HTTP method
+        :param url: URL of resource
+        :return: Response
+        :raises PowerManagementException: when switch is unreachable or returns error
+        """
+        try:
+            with self._session() as session:
+                response = session.request(method, url, timeout=self.timeout, **kwargs)
+        except requests.RequestException as e:
+            raise PowerManagementException(f"DLI REST request {method} {url} failed: {e}") from e
+        if not response.ok:
+            raise PowerManagementException(f"DLI REST request {method} {url} failed with status {response.status_code}")
+        return response
+
+    def available(self) -> bool:
+        """
+        Check whether switch serves REST API, old firmware doesn't.
+
+        :return: True when REST API is available
+        :raises PowerManagementException: when switch is unreachable or rejects credentials
+        """
+        try:
+            with self._session() as session:
+                response = session.get(self.base_url, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise PowerManagementException(f"DLI switch {self.base_url} is unreachable: {e}") from e
+        if response.status_code == 404:
+            return False
+        if response.status_code == 401:
+            raise PowerManagementException(f"DLI switch {self.base_url} rejected credentials")
+        return response.ok
+
+    def get_states(self) -> List[bool]:
+        """
+        Read state of all outlets.
+
+        :return: States of outlets in order of outlet numbers, True for on
+        :raises PowerManagementException: when states can't be read
+        """
+        return [outlet["state"] for outlet in self._request("GET", self.base_url).json()]
+
+    def set_states(self, outlets: Iterable[int], state: bool) -> bool:
+        """
+        Set state of outlets by single request.
+
+        :param outlets: Numbers of outlets, from 1
+        :param state: True for on
+        :return: True (operation succeeded)
+        :raises PowerManagementException: when request fails
+        """
+        outlets = list(outlets)
+        if not outlets:
+            return True
+        self._request("PUT", self._url(outlets, "state"), data={"value": "true" if state else "false"})
+        logger.log(
+            level=log_levels.MODULE_DEBUG,
+            msg=f"Outlets {', '.join(map(str, outlets))} powered {'on' if state else 'off'} via REST API",
+        )
+        return True
+
+    def close(self) -> None:
+        """Close keep-alive connections of all sessions, new sessions are created by next request."""
+        with self._sessions_lock:
+            sessions, self._sessions = self._sessions, []
+        self._idle_sessions = queue.LifoQueue()
+        for session in sessions:
+            session.close()
+
+
+class DliClient:
+    """
+    Client of single switch, using REST API or dlipower, shared by DLI objects of the same switch and credentials.
+
+    Nothing is sent to switch until :meth:`connect`, which probes REST API (depending on backend)
+    and falls back to dlipower, so clients can be created for whole inventory without touching network.
+    Operations on the same outlet are serialized by :meth:`lock_outlets`, operations on different outlets
+    run in parallel. dlipower keeps single HTTP session, so its calls are serialized by `dlipower_lock`.
+
+    Usage example:
+    >>> client = DliClient.shared("10.10.10.10", "admin", "*****")
+    >>> client.connect()
+    >>> client.rest.set_states([1, 2], True)
+    >>> client.close()
+    """
+
+    _shared_clients: ClassVar["weakref.WeakValueDictionary[Tuple[str, str, str, DliBackend], DliClient]"] = (
+        weakref.WeakValueDictionary()
+    )
+    _shared_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, host: str, username: str, password: str, backend: DliBackend = DliBackend.auto) -> None:
+        """
+        Init of DliClient.
+
+        :param host: Hostname or IP address of switch, optionally with port
+        :param username: User to authenticate
+        :param password: Password of user
+        :param backend: API used to control switch
+        """
+        self.host = host
+        self.username = username
+        self.password = password
+        self.backend = backend
+        self.rest: Optional[DliRestClient] = None
+        self.wps: Optional[dlipower.PowerSwitch] = None
+        self.dlipower_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._outlet_locks: Dict[int, threading.Lock] = {}
+        self._shared_key: Optional[Tuple[str, str, str, DliBackend]] = None
+        self._references = 0
+
+    @classmethod
+    def shared(cls, host: str, username: str, password: str, backend: DliBackend = DliBackend.auto) -> "DliClient":
+        """
+        Get process-wide client for given switch and credentials, create it if not existing.
+
+        Every call increases reference counter of the client, shared client is closed
+        when :meth:`close` was called for each acquired reference. Client, which isn't referenced anymore,
+        is forgotten even if it wasn't closed.
+
+        :param host: Hostname or IP address of switch, optionally with port
+        :param username: User to authenticate
+        :param password: Password of user
+        :param backend: API used to control switch
+        :return: Shared DliClient object, not connected yet
+        """
+        key = (host, username, password, backend)
+        with cls._shared_lock:
+            client = cls._shared_clients.get(key)
+            if client is None:
+                client = cls(host, username, password, backend)
+                client._shared_key = key
+                cls._shared_clients[key] = client
+            client._references += 1
+            return client
+
+    @property
+    def connected(self) -> bool:
+        """Whether backend of switch was chosen and created."""
+        return self.rest is not None or self.wps is not None
+
+    def connect(self) -> None:
+        """
+        Choose backend and create its client, if not done yet.
+
+        :raises PowerManagementException: when REST backend is requested and switch doesn't serve REST API
+        """
+        with self._lock:
+            if self.connected:
+                return
+            if self.backend is not DliBackend.dlipower:
+                client = DliRestClient(self.host, self.username, self.password)
+                if self._rest_available(client, required=self.backend is DliBackend.rest):
+                    self.rest = client
+                    return
+                client.close()
+            self.wps = dlipower.PowerSwitch(hostname=self.host, userid=self.username, password=self.password)
+
+    @contextmanager
+    def lock_outlets(self, outlet_numbers: Iterable[int]) -> Iterator[None]:
+        """
+        Hold locks of outlets, waiting for operations on them started by other threads.
+
+        Locks are acquired in order of outlet numbers, so threads locking overlapping outlets don't deadlock.
+
+        :param outlet_numbers: Numbers of electrical sockets to be controlled
+        """
+        with self._lock:
+            locks = [
+                self._outlet_locks.setdefault(outlet_number, threading.Lock())
+                for outlet_number in sorted(set(outlet_numbers))
+            ]
+        with ExitStack() as stack:
+            for lock in locks:
+                stack.enter_context(lock)
+            yield
+
+    @staticmethod
+    def _rest_available(client: DliRestClient, *, required: bool) -> bool:
+        """
+        Probe REST API of switch.
+
+        :param client: REST client of switch
+        :param required: Raise instead of returning False
+        :return: True when REST API is available
+        :raises PowerManagementException: when REST API is required and not available
+        """
+        try:
+            if client.available():
+                return True
+            reason = "switch doesn't serve REST API"
+        except PowerManagementException as e:
+            if required:
+                raise
+            reason = str(e)
+        if required:
+            raise PowerManagementException(f"DLI REST API is not available: {reason}")
+        logger.log(level=log_levels.MODULE_DEBUG, msg=f"Using dlipower, {reason}")
+        return False
+
+    def close(self) -> None:
+        """Release reference to client, HTTP sessions are closed when the last reference is released."""
+        if self._shared_key is not None:
+            with self._shared_lock:
+                self._references -= 1
+                if self._references > 0:
+                    return
+                if self._shared_clients.get(self._shared_key) is self:
+                    self._shared_clients.pop(self._shared_key)
+        with self._lock:
+            rest, self.rest = self.rest, None
+            wps, self.wps = self.wps, None
+        if rest is not None:
+            rest.close()
+        session = getattr(wps, "session", None)
+        if session is not None:
+            session.close()
+
+
 class DLI(PowerManagement):
     """
     Implementation of Digital Loggers web power switches management.
 
+    Newer firmware is controlled by JSON REST API over keep-alive HTTP session, old firmware by dlipower,
+    which scrapes HTML pages. With `DliBackend.auto` REST API is probed and dlipower is used when it's missing.
+    Switch is contacted on first operation or :meth:`connect`, client is shared by DLI objects of the same switch
+    and credentials.
+
     Usage example (for derived class):
     >>> power_switch = DLI(connection=LocalConnection(), ip='10.10.10.10', user='admin' password='*****')
     >>> power_switch.power_on(outlet_number=5)
@@ -28,6 +376,9 @@ class DLI(PowerManagement):
     >>>
     >>> power_switch.power_cycle(outlet_number=2, time_delay=15)
     Outlet no. 2 is power cycled.
+    >>>
+    >>> with DLI(ip='10.10.10.10', username='admin', password='*****') as power_switch:
+    >>>     power_switch.power_off(outlet_number=1)
     """
 
     @os_supported(OSName.WINDOWS, OSName.LINUX, OSName.ESXI, OSName.FREEBSD)
@@ -39,6 +390,7 @@ class DLI(PowerManagement):
         password: str = None,
         *,
         connection: LocalConnection = LocalConnection(),
+        backend: DliBackend = DliBackend.auto,
     ):
         """
         Init of Digital Logic web power switch.
@@ -49,6 +401,7 @@ class DLI(PowerManagement):
         :param ip: **NOT USED, declared only to match base class params**
         :param connection: Not required if you need local execution, for remote execution required Connection object
         from mfd_connect
+        :param backend: API used to control switch, REST API with fallback to dlipower by default
         """
         PowerManagement.__init__(
             self,
@@ -59,8 +412,66 @@ class DLI(PowerManagement):
             password=password,
             executable_name=None,
         )
+        self._backend = backend
+        self._client: Optional[DliClient] = None
+
+    def __enter__(self) -> "DLI":
+        """Enter context of DLI."""
+        return self
+
+    def __exit__(
+        self,
+        __exc_type: Type[BaseException] | None,
+        __exc_value: BaseException | None,
+        __traceback: TracebackType | None,
+    ) -> None:
+        """Release client of switch."""
+        self.close()
+
+    def connect(self) -> DliClient:
+        """
+        Acquire shared client of switch and connect it, if not done yet.
+
+        :return: Connected client
+        :raises PowerManagementException: when REST backend is requested and switch doesn't serve REST API
+        """
+        if self._client is None:
+            self._client = DliClient.shared(str(self._host), self._username, self._password, self._backend)
+        self._client.connect()
+        return self._client
+
+    def close(self) -> None:
+        """Release reference to shared client of switch, it's acquired again by next operation."""
+        client, self._client = self._client, None
+        if client is not None:
+            client.close()
 
-        self.wps = dlipower.PowerSwitch(hostname=self._host, userid=self._username, password=self._password)
+    @property
+    def rest(self) -> Optional[DliRestClient]:
+        """REST client of switch, None when dlipower is used."""
+        return self.connect().rest
+
+    @property
+    def wps(self) -> Optional[dlipower.PowerSwitch]:
+        """Dlipower client of switch, None when REST API is used."""
+        return self.connect().wps
+
+    def _set_outlet(self, client: DliClient, outlet_number: int, state: DliSocketPowerStates) -> bool:
+        """
+        Set state of single outlet, caller holds lock of the outlet.
+
+        :param client: Connected client of switch
+        :param outlet_number: Number of electrical socket to be controlled
+        :param state: State to set
+        :returns True (operation succeeded) or false (operation failed).
+        """
+        if client.rest is not None:
+            return client.rest.set_states([outlet_number], state is DliSocketPowerStates.on)
+        # dlipower returns True on failure
+        with client.dlipower_lock:
+            if state is DliSocketPowerStates.on:
+                return not client.wps.on(outlet=outlet_number)
+            return not client.wps.off(outlet=outlet_number)
 
     def power_off(self, *, outlet_number: int) -> bool:
         """
@@ -69,7 +480,9 @@ class DLI(PowerManagement):
         :param outlet_number: Number of electrical socket to be controlled.
         :returns True (operation succeeded) or false (operation failed).
         """
-        return self.wps.off(outlet=outlet_number)
+        client = self.connect()
+        with client.lock_outlets([outlet_number]):
+            return self._set_outlet(client, outlet_number, DliSocketPowerStates.off)
 
     def power_on(self, *, outlet_number: int) -> bool:
         """
@@ -78,18 +491,27 @@ class DLI(PowerManagement):
         :param outlet_number: Number of electrical socket to be controlled.
         :returns True (operation succeeded) or false (operation failed).
         """
-        return self.wps.on(outlet=outlet_number)
+        client = self.connect()
+        with client.lock_outlets([outlet_number]):
+            return self._set_outlet(client, outlet_number, DliSocketPowerStates.on)
 
     def power_cycle(self, *, outlet_number: int, time_delay: int) -> bool:
         """
-        Power cycle the specified outlet. The cycle delay depends on the PDU setting for the outlet.
+        Power cycle the specified outlet: power it off, wait given delay and power it on.
+
+        Delay is passed per call, cycle delay configured on the switch isn't changed, so outlets
+        can be cycled in parallel with different delays. Other operations on the outlet wait until cycle ends.
 
         :param outlet_number: Number of electrical socket to be controlled.
         :param time_delay: Power cycle time delay in seconds.
         :returns True (operation succeeded) or false (operation failed).
         """
-        self.wps.cycletime = time_delay
-        return self.wps.cycle(outlet=outlet_number)
+        client = self.connect()
+        with client.lock_outlets([outlet_number]):
+            if not self._set_outlet(client, outlet_number, DliSocketPowerStates.off):
+                return False
+            time.sleep(time_delay)
+            return self._set_outlet(client, outlet_number, DliSocketPowerStates.on)
 
     def set_state(self, *, state: DliSocketPowerStates, outlet_number: int) -> bool:
         """Set given power state for a particular socket."""
@@ -97,3 +519,78 @@ class DLI(PowerManagement):
             return self.power_on(outlet_number=outlet_number)
         else:
             return self.power_off(outlet_number=outlet_number)
+
+    def _set_outlets(self, client: DliClient, outlet_numbers: List[int], state: DliSocketPowerStates) -> bool:
+        """
+        Set the same state of many outlets, caller holds locks of the outlets.
+
+        :param client: Connected client of switch
+        :param outlet_numbers: Numbers of electrical sockets to be controlled
+        :param state: State to set
+        :returns True (operation succeeded for all outlets) or false (operation failed for some of them).
+        """
+        if client.rest is not None:
+            return client.rest.set_states(outlet_numbers, state is DliSocketPowerStates.on)
+        # old firmware has no multi-outlet request
+        return all([self._set_outlet(client, outlet_number, state) for outlet_number in outlet_numbers])
+
+    def set_states(self, states: Dict[int, DliSocketPowerStates]) -> bool:
+        """
+        Set given power states for many outlets, by single request per state with REST API.
+
+        :param states: Power state to set for each outlet number
+        :returns True (operation succeeded for all outlets) or false (operation failed for some of them).
+        :raises PowerManagementException: when REST request fails
+        """
+        client = self.connect()
+        with client.lock_outlets(states):
+            results = [
+                self._set_outlets(
+                    client, [outlet for outlet, outlet_state in states.items() if outlet_state is state], state
+                )
+                for state in DliSocketPowerStates
+                if state in states.values()
+            ]
+        return all(results)
+
+    def power_off_outlets(self, outlet_numbers: Iterable[int]) -> bool:
+        """
+        Power off the specified outlets, by single request with REST API.
+
+        :param outlet_numbers: Numbers of electrical sockets to be controlled
+        :returns True (operation succeeded for all outlets) or false (operation failed for some of them).
+        """
+        return self.set_states({outlet_number: DliSocketPowerStates.off for outlet_number in outlet_numbers})
+
+    def power_on_outlets(self, outlet_numbers: Iterable[int]) -> bool:
+        """
+        Power on the specified outlets, by single request with REST API.
+
+        :param outlet_numbers: Numbers of electrical sockets to be controlled
+        :returns True (operation succeeded for all outlets) or false (operation failed for some of them).
+        """
+        return self.set_states({outlet_number: DliSocketPowerStates.on for outlet_number in outlet_numbers})
+
+    def power_cycle_outlets(self, outlet_numbers: Iterable[int], time_delay: float) -> bool:
+        """
+        Power cycle the specified outlets together: power off all of them, wait once and power on all of them.
+
+        :param outlet_numbers: Numbers of electrical sockets to be controlled
+        :param time_delay: Power cycle time delay in seconds.
+        :returns True (operation succeeded for all outlets) or false (operation failed for some of them).
+        Outlets, which failed to power off, are powered on as well.
+        :raises PowerManagementException: when REST request fails
+        """
+        outlet_numbers = list(outlet_numbers)
+        if not outlet_numbers:
+            return True
+        client = self.connect()
+        with client.lock_outlets(outlet_numbers):
+            powered_off = self._set_outlets(client, outlet_numbers, DliSocketPowerStates.off)
+            time.sleep(time_delay)
+            powered_on = self._set_outlets(client, outlet_numbers, DliSocketPowerStates.on)
+        logger.log(
+            level=log_levels.MODULE_DEBUG,
+            msg=f"Outlets {', '.join(map(str, outlet_numbers))} power cycled with {time_delay} seconds delay",
+        )
+        return powered_off and powered_on
@@ -15,5 +15,33 @@ class PDUSNMPException(PowerManagementException):
     """Exception for errors returned from remote device e.g. incorrect OID, wrong value set."""
 
 
+class PDUBatchException(PDUSNMPException):
+    """Exception for batch of PDU outlet operations, in which operation failed for some of the outlets."""
+
+    def __init__(self, errors: "dict[int, PowerManagementException]"):
+        """
+        Init of PDUBatchException.
+
+        :param errors: Exceptions for each failed outlet number
+        """
+        self.errors = errors
+        details = ", ".join(f"outlet {outlet}: {error}" for outlet, error in sorted(errors.items()))
+        super().__init__(f"Operation failed for {len(errors)} outlet(s) - {details}")
+
+
 class OSNotSupported(PowerManagementException):
     """Exception for not supported OS."""
+
+
+class IpmiSessionException(PowerManagementException):
+    """Exception for native IPMI session errors e.g. authentication failure, no response, error completion code."""
+
+    def __init__(self, message: str, *, completion_code: "int | None" = None):
+        """
+        Init of IpmiSessionException.
+
+        :param message: Description of error
+        :param completion_code: IPMI completion code returned by BMC, None if error is not related to command result
+        """
+        self.completion_code = completion_code
+        super().__init__(message)
@@ -0,0 +1,332 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: MIT
+"""Module for driving many power management devices concurrently."""
+
+import asyncio
+import logging
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple, Union
+
+from mfd_common_libs import add_logging_level, log_levels
+
+from .exceptions import PDUBatchException, PowerManagementException
+from .ipmi import Ipmi
+from .pdu import PDU, PDUStates
+from .snmp import shared_snmp_engine
+
+logger = logging.getLogger(__name__)
+add_logging_level("MODULE_DEBUG", log_levels.MODULE_DEBUG)
+
+
+@dataclass
+class PDUFleetResult:
+    """Result of setting power state of single outlet by PDUFleet."""
+
+    pdu: PDU
+    outlet_number: int
+    state: PDUStates
+    error: Optional[Exception]
+    elapsed: float
+
+    @property
+    def success(self) -> bool:
+        """Whether outlet state was set successfully."""
+        return self.error is None
+
+
+class PDUFleet:
+    """
+    Concurrent driver of outlets on many PDUs.
+
+    All requests are run on single event loop with one shared SNMP engine.
+    Outlets requested for the same PDU object are sent in batched SNMP SET requests.
+    Number of requests in flight is limited per device and globally, because PDU agents fail when hammered.
+
+    Usage example:
+    >>> fleet = PDUFleet(max_per_device=2)
+    >>> results = fleet.run([(apc, 1, PDUStates.off), (apc, 2, PDUStates.off), (raritan, 7, PDUStates.cycle)])
+    >>> [result for result in results if not result.success]
+    []
+    """
+
+    def __init__(self, *, max_concurrency: int = 64, max_per_device: int = 4) -> None:
+        """
+        Init of PDUFleet.
+
+        :param max_concurrency: Maximal number of requests in flight for all devices.
+        :param max_per_device: Maximal number of requests in flight for single device (IP address and UDP port).
+        """
+        if max_concurrency < 1 or max_per_device < 1:
+            raise ValueError("Concurrency limits must be positive numbers")
+        self._max_concurrency = max_concurrency
+        self._max_per_device = max_per_device
+
+    def run(self, targets: Iterable[Tuple[PDU, int, PDUStates]]) -> List[PDUFleetResult]:
+        """
+        Set power states of outlets concurrently in new event loop.
+
+        :param targets: PDU object, outlet number and state to set for each target
+        :return: Result for each target, in order of targets
+        """
+        return asyncio.run(self.async_run(targets))
+
+    async def async_run(self, targets: Iterable[Tuple[PDU, int, PDUStates]]) -> List[PDUFleetResult]:
+        """
+        Set power states of outlets concurrently in running event loop.
+
+        :param targets: PDU object, outlet number and state to set for each target
+        :return: Result for each target, in order of targets
+        """
+        targets = list(targets)
+        global_limit = asyncio.Semaphore(self._max_concurrency)
+        device_limits: Dict[Hashable, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(self._max_per_device))
+        results: List[Optional[PDUFleetResult]] = [None] * len(targets)
+        start_time = time.monotonic()
+        with shared_snmp_engine():
+            await asyncio.gather(
+                *(
+                    self._async_run_group(pdu, group, results, global_limit, device_limits[self._device_key(pdu)])
+                    for pdu, group in self._group_targets(targets)
+                )
+            )
+        failed = sum(not result.success for result in results)
+        logger.log(
+            level=log_levels.MODULE_DEBUG,
+            msg=f"Fleet operation for {len(results)} outlet(s) finished in {time.monotonic() - start_time:.2f} "
+            f"seconds, {failed} failed.",
+        )
+        return results
+
+    @staticmethod
+    def _device_key(pdu: PDU) -> Hashable:
+        """
+        Get key identifying physical device of PDU object.
+
+        :param pdu: PDU object
+        :return: Key of device
+        """
+        return pdu._ip, pdu._udp_port
+
+    @staticmethod
+    def _group_targets(
+        targets: List[Tuple[PDU, int, PDUStates]],
+    ) -> List[Tuple[PDU, Dict[int, Tuple[int, PDUStates]]]]:
+        """
+        Group targets by PDU object into batches, in which every outlet is present once.
+
+        :param targets: PDU object, outlet number and state to set for each target
+        :return: PDU object and batch of target index and state for each outlet number
+        """
+        groups: List[Tuple[PDU, Dict[int, Tuple[int, PDUStates]]]] = []
+        open_groups: Dict[int, Dict[int, Tuple[int, PDUStates]]] = {}
+        for index, (pdu, outlet_number, state) in enumerate(targets):
+            group = open_groups.get(id(pdu))
+            if group is None or outlet_number in group:
+                group = open_groups[id(pdu)] = {}
+                groups.append((pdu, group))
+            group[outlet_number] = (index, state)
+        return groups
+
+    @staticmethod
+    async def _async_run_group(
+        pdu: PDU,
+        group: Dict[int, Tuple[int, PDUStates]],
+        results: List[Optional[PDUFleetResult]],
+        global_limit: asyncio.Semaphore,
+        device_limit: asyncio.Semaphore,
+    ) -> None:
+        """
+        Set power states of outlets of single PDU in batched request and store result for each target.
+
+        :param pdu: PDU object
+        :param group: Target index and state for each outlet number
+        :param results: Results to be filled in
+        :param global_limit: Semaphore limiting requests in flight for all devices
+        :param device_limit: Semaphore limiting requests in flight for device of PDU
+        """
+        errors: Dict[int, Exception] = {}
+        async with device_limit, global_limit:
+            start_time = time.monotonic()
+            try:
+                await pdu.async_set_states({outlet_number: state for outlet_number, (_, state) in group.items()})
+            except PDUBatchException as e:
+                errors = e.errors
+            except Exception as e:
+                errors = {outlet_number: e for outlet_number in group}
+            elapsed = time.monotonic() - start_time
+
+        for outlet_number, (index, state) in group.items():
+            results[index] = PDUFleetResult(
+                pdu=pdu, outlet_number=outlet_number, state=state, error=errors.get(outlet_number), elapsed=elapsed
+            )
+
+
+@dataclass
+class IpmiFleetResult:
+    """Result of action executed on single BMC by IpmiFleet."""
+
+    ipmi: Ipmi
+    result: Any
+    error: Optional[Exception]
+    attempts: int
+    elapsed: float
+
+    @property
+    def success(self) -> bool:
+        """Whether action was executed successfully."""
+        return self.error is None
+
+
+class IpmiFleet:
+    """
+    Concurrent executor of the same action on many BMCs.
+
+    Actions are run in bounded thread pool, so slow or unresponsive BMC occupies only one worker.
+    Every target is retried independently of the others and results are streamed as soon as they finish.
+    Actions of Ipmi objects pointing to the same BMC are serialized, targets of busy BMC wait outside thread pool.
+
+    Usage example:
+    >>> fleet = IpmiFleet(max_workers=64, attempts=2)
+    >>> for result in fleet.stream(ipmis, "powercycle"):
+    >>>     print(result.ipmi._host, result.success, result.attempts, result.elapsed)
+    >>>
+    >>> results = fleet.run(ipmis, lambda ipmi: ipmi.set_state(state=IpmiStates.soft))
+    """
+
+    def __init__(
+        self, *, max_workers: int = 32, max_per_bmc: int = 1, attempts: int = 1, retry_delay: float = 1
+    ) -> None:
+        """
+        Init of IpmiFleet.
+
+        :param max_workers: Maximal number of actions executed at the same time.
+        :param max_per_bmc: Maximal number of actions executed at the same time on single BMC (host and port).
+        :param attempts: Number of attempts of action for each target, action is repeated on PowerManagementException.
+        :param retry_delay: Time in seconds between attempts of single target.
+        """
+        if max_workers < 1 or max_per_bmc < 1 or attempts < 1:
+            raise ValueError("Concurrency limits and number of attempts must be positive numbers")
+        self._max_workers = max_workers
+        self._max_per_bmc = max_per_bmc
+        self._attempts = attempts
+        self._retry_delay = retry_delay
+
+    def run(self, targets: Iterable[Ipmi], action: Union[str, Callable[[Ipmi], Any]]) -> List[IpmiFleetResult]:
+        """
+        Execute action on all targets and wait for all of them.
+
+        :param targets: Ipmi objects
+        :param action: Name of Ipmi method called without arguments e.g. "powercycle", or callable taking Ipmi object
+        :return: Result for each target, in order of targets
+        :raises ValueError: when Ipmi has no method with given name
+        """
+        targets = list(targets)
+        order = {id(ipmi): index for index, ipmi in enumerate(targets)}
+        if len(order) != len(targets):
+            raise ValueError("Every Ipmi object can be passed only once")
+        return sorted(self.stream(targets, action), key=lambda result: order[id(result.ipmi)])
+
+    def stream(self, targets: Iterable[Ipmi], action: Union[str, Callable[[Ipmi], Any]]) -> Iterator[IpmiFleetResult]:
+        """
+        Execute action on all targets and yield results in order of completion.
+
+        Actions not started yet are cancelled, when iteration is stopped early.
+
+        :param targets: Ipmi objects
+        :param action: Name of Ipmi method called without arguments e.g. "powercycle", or callable taking Ipmi object
+        :return: Iterator of results, in order of completion
+        :raises ValueError: when Ipmi has no method with given name
+        """
+        action = self._resolve_action(action)
+        targets = list(targets)
+        if not targets:
+            return
+        # targets waiting for free slot of their BMC, submitted when action on the BMC finishes,
+        # so no worker is blocked by busy BMC while targets of other BMCs wait
+        waiting: Dict[Hashable, Deque[Ipmi]] = defaultdict(deque)
+        running: Dict[Future, Hashable] = {}
+        active: Dict[Hashable, int] = defaultdict(int)
+        start_time = time.monotonic()
+        failed = 0
+        executor = ThreadPoolExecutor(max_workers=min(self._max_workers, len(targets)), thread_name_prefix="ipmi-fleet")
+        try:
+            for ipmi in targets:
+                key = self._bmc_key(ipmi)
+                if active[key] < self._max_per_bmc:
+                    running[executor.submit(self._run_target, ipmi, action)] = key
+                    active[key] += 1
+                else:
+                    waiting[key].append(ipmi)
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = running.pop(future)
+                    if waiting[key]:
+                        running[executor.submit(self._run_target, waiting[key].popleft(), action)] = key
+                    else:
+                        active[key] -= 1
+                    result = future.result()
+                    failed += not result.success
+                    yield result
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        logger.log(
+            level=log_levels.MODULE_DEBUG,
+            msg=f"Fleet action for {len(targets)} BMC(s) finished in {time.monotonic() - start_time:.2f} seconds, "
+            f"{failed} failed.",
+        )
+
+    @staticmethod
+    def _resolve_action(action: Union[str, Callable[[Ipmi], Any]]) -> Callable[[Ipmi], Any]:
+        """
+        Get callable executing action.
+
+        :param action: Name of Ipmi method called without arguments, or callable taking Ipmi object
+        :return: Callable taking Ipmi object
+        :raises ValueError: when Ipmi has no method with given name
+        """
+        if not isinstance(action, str):
+            return action
+        if not callable(getattr(Ipmi, action, None)):
+            raise ValueError(f"Ipmi has no method {action}")
+        return lambda ipmi: getattr(ipmi, action)()
+
+    @staticmethod
+    def _bmc_key(ipmi: Ipmi) -> Hashable:
+        """
+        Get key identifying BMC of Ipmi object.
+
+        :param ipmi: Ipmi object
+        :return: Key of BMC
+        """
+        return str(ipmi._host), ipmi._port
+
+    def _run_target(self, ipmi: Ipmi, action: Callable[[Ipmi], Any]) -> IpmiFleetResult:
+        """
+        Execute action on single target with retries, run in worker thread.
+
+        :param ipmi: Ipmi object
+        :param action: Callable taking Ipmi object
+        :return: Result of target
+        """
+        start_time = time.monotonic()
+        error = None
+        for attempt in range(1, self._attempts + 1):
+            try:
+                result = action(ipmi)
+            except PowerManagementException as e:
+                error = e
+                logger.log(
+                    level=log_levels.MODULE_DEBUG,
+                    msg=f"Attempt {attempt} of action on {ipmi._host} failed: {e}",
+                )
+                if attempt < self._attempts:
+                    time.sleep(self._retry_delay)
+                continue
+            except Exception as e:
+                return IpmiFleetResult(ipmi, None, e, attempt, time.monotonic() - start_time)
+            return IpmiFleetResult(ipmi, result, None, attempt, time.monotonic() - start_time)
+        return IpmiFleetResult(ipmi, None, error, self._attempts, time.monotonic() - start_time)
@@ -0,0 +1,243 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: MIT
+"""Module for staggered power on of many outlets within inrush current limits."""
+
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Hashable, Iterable, List, Optional
+
+from mfd_common_libs import add_logging_level, log_levels
+
+from .base import PowerManagement
+from .exceptions import PowerManagementException
+from .snmp import shared_snmp_engine
+
+logger = logging.getLogger(__name__)
+add_logging_level("MODULE_DEBUG", log_levels.MODULE_DEBUG)
+
+# Tolerance for comparing times and currents computed with floats
+EPSILON = 1e-9
+
+
+@dataclass
+class InrushTarget:
+    """Outlet to be powered on, with its circuit and inrush current profile."""
+
+    device: PowerManagement
+    outlet_number: int
+    circuit: Hashable
+    inrush: float = 1.0
+    inrush_duration: float = 1.0
+
+
+@dataclass
+class InrushScheduleEntry:
+    """Planned and actual power on time of outlet, in seconds since start of schedule."""
+
+    target: InrushTarget
+    planned_start: float
+    start: Optional[float] = None
+    end: Optional[float] = None
+    error: Optional[Exception] = None
+
+    @property
+    def planned_end(self) -> float:
+        """Planned end of inrush current of outlet."""
+        return self.planned_start + self.target.inrush_duration
+
+    @property
+    def success(self) -> bool:
+        """Whether outlet was powered on successfully."""
+        return self.end is not None and self.error is None
+
+
+class InrushScheduler:
+    """
+    Scheduler of staggered power on of outlets of PDUs and DLI switches.
+
+    Each outlet draws `inrush` amperes for `inrush_duration` seconds after power on.
+    Schedule keeps summary inrush current of every circuit within its budget and keeps at least `min_stagger`
+    seconds between power on commands on the same circuit. Circuits are scheduled independently of each other
+    and outlets with the highest inrush are placed first (first-fit decreasing),
+    so the whole schedule finishes as early as possible within the limits.
+
+    Usage example:
+    >>> scheduler = InrushScheduler(budgets={"rack1-A": 16, "rack1-B": 16}, min_stagger=0.2)
+    >>> targets = [InrushTarget(apc, outlet, "rack1-A", inrush=6, inrush_duration=0.5) for outlet in range(1, 25)]
+    >>> targets += [InrushTarget(dli, outlet, "rack1-B", inrush=4) for outlet in range(1, 9)]
+    >>> for entry in scheduler.plan(targets):
+    >>>     print(entry.target.outlet_number, entry.planned_start)
+    >>> timeline = scheduler.run(targets)
+    >>> [entry for entry in timeline if not entry.success]
+    []
+    """
+
+    def __init__(
+        self, *, budgets: Dict[Hashable, float], min_stagger: float = 0.5, default_budget: Optional[float] = None
+    ) -> None:
+        """
+        Init of InrushScheduler.
+
+        :param budgets: Maximal summary inrush current in amperes for each circuit.
+        :param min_stagger: Minimal time in seconds between power on commands on the same circuit.
+        :param default_budget: Budget of circuits not present in budgets, circuit has to be listed when not passed.
+        """
+        if min_stagger < 0:
+            raise ValueError("Stagger time can't be negative")
+        self._budgets = budgets
+        self._min_stagger = min_stagger
+        self._default_budget = default_budget
+
+    def _get_budget(self, circuit: Hashable) -> float:
+        """
+        Get inrush budget of circuit.
+
+        :param circuit: Circuit identifier
+        :return: Maximal summary inrush current in amperes
+        :raises ValueError: when circuit has no budget
+        """
+        budget = self._budgets.get(circuit, self._default_budget)
+        if budget is None:
+            raise ValueError(f"Inrush budget is not defined for circuit {circuit}")
+        return budget
+
+    def plan(self, targets: Iterable[InrushTarget]) -> List[InrushScheduleEntry]:
+        """
+        Compute power on schedule of outlets.
+
+        :param targets: Outlets to be powered on
+        :return: Schedule entries ordered by planned start
+        :raises ValueError: when inrush of single outlet exceeds budget of its circuit
+        """
+        circuits: Dict[Hashable, List[InrushTarget]] = defaultdict(list)
+        for target in targets:
+            budget = self._get_budget(target.circuit)
+            if target.inrush > budget + EPSILON:
+                raise ValueError(
+                    f"Inrush {target.inrush} A of outlet no. {target.outlet_number} exceeds budget {budget} A "
+                    f"of circuit {target.circuit}"
+                )
+            circuits[target.circuit].append(target)
+
+        schedule = []
+        for circuit, circuit_targets in circuits.items():
+            schedule.extend(self._plan_circuit(circuit_targets, self._get_budget(circuit)))
+        schedule.sort(key=lambda entry: entry.planned_start)
+        return schedule
+
+    def _plan_circuit(self, targets: List[InrushTarget], budget: float) -> List[InrushScheduleEntry]:
+        """
+        Compute power on schedule of outlets of single circuit.
+
+        :param targets: Outlets of circuit
+        :param budget: Maximal summary inrush current of circuit
+        :return: Schedule entries ordered by planned start
+        """
+        pending = sorted(targets, key=lambda target: target.inrush, reverse=True)
+        active: List[InrushScheduleEntry] = []
+        schedule = []
+        now = 0.0
+        last_start = None
+        while pending:
+            if last_start is not None:
+                now = max(now, last_start + self._min_stagger)
+            active = [entry for entry in active if entry.planned_end > now + EPSILON]
+            available = budget - sum(entry.target.inrush for entry in active)
+            target = next((target for target in pending if target.inrush <= available + EPSILON), None)
+            if target is None:
+                now = min(entry.planned_end for entry in active)
+                continue
+            pending.remove(target)
+            entry = InrushScheduleEntry(target=target, planned_start=now)
+            active.append(entry)
+            schedule.append(entry)
+            last_start = now
+        return schedule
+
+    def run(self, targets: Iterable[InrushTarget]) -> List[InrushScheduleEntry]:
+        """
+        Power on outlets according to computed schedule in new event loop.
+
+        :param targets: Outlets to be powered on
+        :return: Schedule entries with actual start, end and error of each outlet, ordered by planned start
+        :raises ValueError: when inrush of single outlet exceeds budget of its circuit
+        """
+        return asyncio.run(self.async_run(targets))
+
+    async def async_run(self, targets: Iterable[InrushTarget]) -> List[InrushScheduleEntry]:
+        """
+        Power on outlets according to computed schedule in running event loop.
+
+        Commands of each circuit are issued in planned order. When command is issued late,
+        following commands of the circuit are shifted, so planned gaps between them are never shortened.
+        Failure of single outlet doesn't stop the others.
+        SNMP requests of all PDUs share single SNMP engine, which is closed when all outlets were powered on.
+
+        :param targets: Outlets to be powered on
+        :return: Schedule entries with actual start, end and error of each outlet, ordered by planned start
+        :raises ValueError: when inrush of single outlet exceeds budget of its circuit
+        """
+        schedule = self.plan(targets)
+        circuits: Dict[Hashable, List[InrushScheduleEntry]] = defaultdict(list)
+        for entry in schedule:
+            circuits[entry.target.circuit].append(entry)
+
+        start_time = time.monotonic()
+        commands: List[asyncio.Task] = []
+        with shared_snmp_engine():
+            await asyncio.gather(
+                *(self._async_run_circuit(entries, start_time, commands) for entries in circuits.values())
+            )
+            await asyncio.gather(*commands)
+        late = max((entry.start - entry.planned_start for entry in schedule), default=0)
+        logger.log(
+            level=log_levels.MODULE_DEBUG,
+            msg=f"Powered on {len(schedule)} outlet(s) in {time.monotonic() - start_time:.2f} seconds, "
+            f"planned {max((entry.planned_start for entry in schedule), default=0):.2f} seconds of staggering, "
+            f"maximal delay of command {late:.2f} seconds.",
+        )
+        return schedule
+
+    async def _async_run_circuit(
+        self, entries: List[InrushScheduleEntry], start_time: float, commands: List[asyncio.Task]
+    ) -> None:
+        """
+        Issue power on commands of single circuit at planned times.
+
+        :param entries: Schedule entries of circuit ordered by planned start
+        :param start_time: Monotonic time of schedule start
+        :param commands: List to be extended with tasks of issued commands
+        """
+        shift = 0.0
+        for entry in entries:
+            delay = start_time + entry.planned_start + shift - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            entry.start = time.monotonic() - start_time
+            shift = max(shift, entry.start - entry.planned_start)
+            commands.append(asyncio.create_task(self._async_power_on(entry, start_time)))
+
+    @staticmethod
+    async def _async_power_on(entry: InrushScheduleEntry, start_time: float) -> None:
+        """
+        Power on outlet of schedule entry and record its result.
+
+        :param entry: Schedule entry
+        :param start_time: Monotonic time of schedule start
+        """
+        device = entry.target.device
+        outlet_number = entry.target.outlet_number
+        try:
+            async_power_on = getattr(device, "async_power_on", None)
+            if async_power_on is not None:
+                await async_power_on(outlet_number=outlet_number)
+            # DLI returns False on failure with both backends, other devices raise
+            elif await asyncio.to_thread(device.power_on, outlet_number=outlet_number) is False:
+                raise PowerManagementException(f"Power on of outlet no. {outlet_number} failed")
+        except Exception as e:
+            entry.error = e
+            logger.log(level=log_levels.MODULE_DEBUG, msg=f"Power on of outlet no. {outlet_number} failed: {e}")
+        entry.end = time.monotonic() - start_time
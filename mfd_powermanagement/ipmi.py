@@ -3,18 +3,31 @@
 """Module for IPMI."""
 
 import logging
+import re
+import threading
 import time
 import typing
+import uuid
+import weakref
+from dataclasses import dataclass
 from enum import Enum
+from subprocess import CalledProcessError
+from types import TracebackType
+from typing import Dict, List, Optional, Set, Type
 
 from .base import PowerManagement
-from .exceptions import PowerManagementException
+from .exceptions import IpmiSessionException, PowerManagementException
+from .retry import IpmiAttempt, IpmiFailureKind, IpmiRetryPolicy
+from .rmcp import IPMI_PORT, RmcpPlusSession
+from .sol import SolConsole
 from mfd_common_libs import add_logging_level, log_levels, os_supported
 from mfd_connect import LocalConnection
 from mfd_typing import OSName
 
 if typing.TYPE_CHECKING:
+    from pathlib import Path
     from mfd_connect import Connection
+    from mfd_connect.process import RemoteProcess
 
 logger = logging.getLogger(__name__)
 add_logging_level("MODULE_DEBUG", log_levels.MODULE_DEBUG)
@@ -25,24 +38,389 @@ class IpmiType(Enum):
 
     IPMITool = "ipmitool"
     IPMIUtil = "ipmiutil"
+    RMCPPlus = "rmcpplus"
 
 
 ipmi_ver = {IpmiType.IPMIUtil: "ipmiutil ver", IpmiType.IPMITool: "ipmitool -V"}
 
+# IPMI tools found available on each connection, probe is run once per connection and tool
+_available_tools: "weakref.WeakKeyDictionary[Connection, Set[IpmiType]]" = weakref.WeakKeyDictionary()
+_available_tools_lock = threading.Lock()
+
+
+def clear_tool_availability_cache(connection: Optional["Connection"] = None) -> None:
+    """
+    Forget results of IPMI tool availability probe, so it is run again by next Ipmi object.
+
+    :param connection: Connection, for which results are forgotten, all connections when not passed
+    """
+    with _available_tools_lock:
+        if connection is None:
+            _available_tools.clear()
+        else:
+            _available_tools.pop(connection, None)
+
+
+IPMITOOL_SHELL_PROMPT = "ipmitool> "
+# "Chassis Power is on" printed by ipmitool, "Chassis Status   = 01   (on, restore_policy=stay_off)" by ipmiutil
+POWER_STATUS_REGEX = re.compile(r"Chassis (?:Power is|Status\s*=\s*\w+\s*\()\s*(?P<state>on|off)", re.IGNORECASE)
+# First and maximal interval in seconds between power status polls
+STATUS_POLL_INTERVAL = 0.25
+STATUS_POLL_MAX_INTERVAL = 2
+# Success lines of chassis power command: "Chassis Power Control: Up/On" printed by ipmitool,
+# "ipmiutil power, completed successfully" by ipmiutil. Error line of rejected command
+# "Set Chassis Power Control to Cycle failed: Command not supported in present state" doesn't match.
+SET_STATE_SUCCESS_REGEX = re.compile(r"^\s*Chassis Power Control:|completed successfully", re.IGNORECASE | re.MULTILINE)
+FIRMWARE_REVISION_REGEX = re.compile(r"Firmware Revision\s*:\s*(?P<firmware>\S+)")
+# Prefix of SDR repository dump files, cached on connection per BMC and firmware
+SDR_CACHE_PREFIX = "mfd-ipmi-sdr"
+# Line printed by `echo` after each command of batch, to split output of `ipmitool exec` per command
+BATCH_MARKER = "mfd-ipmi-batch-end"
+
 
 class IpmiStates(Enum):
     """Available states in PowerManagement."""
 
-    up = {IpmiType.IPMIUtil.value: "-u", IpmiType.IPMITool.value: "on"}
-    down = {IpmiType.IPMIUtil.value: "-d", IpmiType.IPMITool.value: "off"}
-    reset = {IpmiType.IPMIUtil.value: "-r", IpmiType.IPMITool.value: "reset"}
-    cycle = {IpmiType.IPMIUtil.value: "-c", IpmiType.IPMITool.value: "cycle"}
-    soft = {IpmiType.IPMIUtil.value: "-D", IpmiType.IPMITool.value: "soft"}
+    up = {IpmiType.IPMIUtil.value: "-u", IpmiType.IPMITool.value: "on", IpmiType.RMCPPlus.value: 1}
+    down = {IpmiType.IPMIUtil.value: "-d", IpmiType.IPMITool.value: "off", IpmiType.RMCPPlus.value: 0}
+    reset = {IpmiType.IPMIUtil.value: "-r", IpmiType.IPMITool.value: "reset", IpmiType.RMCPPlus.value: 3}
+    cycle = {IpmiType.IPMIUtil.value: "-c", IpmiType.IPMITool.value: "cycle", IpmiType.RMCPPlus.value: 2}
+    soft = {IpmiType.IPMIUtil.value: "-D", IpmiType.IPMITool.value: "soft", IpmiType.RMCPPlus.value: 5}
+
+
+@dataclass
+class IpmiSensor:
+    """Reading of single sensor from `ipmitool sdr list`."""
+
+    name: str
+    value: Optional[float]
+    unit: str
+    status: str
+
+
+def parse_sdr_list(output: str) -> List[IpmiSensor]:
+    """
+    Parse output of `ipmitool sdr list`.
+
+    Line looks like `CPU Temp         | 45 degrees C      | ok`, readings which aren't numeric
+    (`no reading`, `0x00`, `disabled`) have no value and are kept in unit.
+
+    :param output: Output of command
+    :return: Sensors in order of SDR repository
+    """
+    sensors = []
+    for line in output.splitlines():
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) != 3:
+            continue
+        name, reading, status = fields
+        number, _, unit = reading.partition(" ")
+        try:
+            value = float(number)
+        except ValueError:
+            value, unit = None, reading
+        sensors.append(IpmiSensor(name=name, value=value, unit=unit, status=status))
+    return sensors
+
+
+class IpmiToolShell:
+    """
+    Long-lived `ipmitool shell` process, which executes commands written to its stdin.
+
+    Process is started through mfd_connect connection on first command and kept alive, so commands don't pay
+    for process startup and RMCP+ session negotiation. Output of command is everything printed before next prompt.
+    Process is restarted when it is found dead before command, process hanging in command is killed.
+
+    Usage example:
+    >>> with IpmiToolShell(connection, "ipmitool -I lanplus -H 10.10.10.10 -U admin -P ***** shell") as shell:
+    >>>     shell.execute("chassis power status")
+    'Chassis Power is on'
+    """
+
+    def __init__(
+        self, connection: "Connection", command: str, *, prompt: str = IPMITOOL_SHELL_PROMPT, timeout: float = 30
+    ) -> None:
+        """
+        Init of IpmiToolShell.
+
+        :param connection: Connection, on which ipmitool is started
+        :param command: Command starting ipmitool in shell mode
+        :param prompt: Prompt printed by shell when it is ready for next command
+        :param timeout: Time in seconds to wait for prompt after command
+        """
+        self._connection = connection
+        self._command = command
+        self._prompt = prompt
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._output = threading.Condition()
+        self._buffer: typing.List[str] = []
+        self._eof = True
+        self._process: Optional["RemoteProcess"] = None
+        self._started = False
+        self.restarts = 0
+
+    def __enter__(self) -> "IpmiToolShell":
+        """Enter context of shell."""
+        return self
+
+    def __exit__(
+        self,
+        __exc_type: Type[BaseException] | None,
+        __exc_value: BaseException | None,
+        __traceback: TracebackType | None,
+    ) -> None:
+        """Stop shell process."""
+        self.close()
+
+    @property
+    def running(self) -> bool:
+        """Whether shell process is alive."""
+        return self._process is not None and not self._eof and self._process.running
+
+    def _read_output(self, process: "RemoteProcess") -> None:
+        """
+        Collect output of shell process until end of stream, run in background thread.
+
+        Output and end of stream of process, which was already killed or restarted, are dropped.
+
+        :param process: Shell process
+        """
+        stream = process.stdout_stream
+        while True:
+            try:
+                char = stream.read(1)
+            except Exception as e:
+                logger.log(level=log_levels.MODULE_DEBUG, msg=f"Reading ipmitool shell output failed: {e}")
+                char = ""
+            with self._output:
+                if process is not self._process:
+                    return
+                if not char:
+                    self._eof = True
+                    self._output.notify_all()
+                    return
+                self._buffer.append(char)
+                if char == self._prompt[-1]:
+                    self._output.notify_all()
+
+    def _wait_for_prompt(self, timeout: float) -> str:
+        """
+        Wait until shell prints prompt.
+
+        :param timeout: Time in seconds to wait
+        :return: Output printed before prompt
+        :raises PowerManagementException: when shell exits or doesn't print prompt in time
+        """
+        prompt_length = len(self._prompt)
+
+        def prompt_printed() -> bool:
+            return self._eof or "".join(self._buffer[-prompt_length:]) == self._prompt
+
+        with self._output:
+            if not self._output.wait_for(prompt_printed, timeout):
+                raise PowerManagementException(f"ipmitool shell didn't respond in {timeout} seconds")
+            output, self._buffer = "".join(self._buffer), []
+            if self._eof:
+                raise PowerManagementException(f"ipmitool shell exited, output: {output}")
+        return output[:-prompt_length]
+
+    def _start(self) -> None:
+        """
+        Start shell process and wait for its first prompt.
+
+        :raises PowerManagementException: when shell doesn't start
+        """
+        self._stop()
+        process = self._connection.start_process(self._command, enable_input=True, stderr_to_stdout=True)
+        with self._output:
+            self._buffer = []
+            self._eof = False
+            self._process = process
+        threading.Thread(target=self._read_output, args=(process,), name="ipmitool-shell", daemon=True).start()
+        try:
+            self._wait_for_prompt(self.timeout)
+        except PowerManagementException:
+            self._stop()
+            raise
+        self._started = True
+        logger.log(level=log_levels.MODULE_DEBUG, msg="Started ipmitool shell")
+
+    def _stop(self) -> None:
+        """Kill shell process, if any."""
+        with self._output:
+            process, self._process = self._process, None
+            self._eof = True
+        if process is not None and process.running:
+            try:
+                process.kill(wait=5)
+            except Exception as e:
+                logger.log(level=log_levels.MODULE_DEBUG, msg=f"Killing ipmitool shell failed: {e}")
+
+    def execute(self, command: str) -> str:
+        """
+        Execute command in shell, start or restart shell process when needed.
+
+        :param command: ipmitool command without connection parameters e.g. `chassis power on`
+        :return: Output of command
+        :raises PowerManagementException: when shell can't be started, exits or hangs in command
+        """
+        with self._lock:
+            if not self.running:
+                if self._started:
+                    logger.log(level=log_levels.MODULE_DEBUG, msg="ipmitool shell is not running, restarting")
+                    self.restarts += 1
+                self._start()
+            stdin = self._process.stdin_stream
+            stdin.write(f"{command}\n")
+            stdin.flush()
+            try:
+                output = self._wait_for_prompt(self.timeout)
+            except PowerManagementException:
+                self._stop()
+                raise
+        # shell echoes command when it reads stdin with readline
+        first_line, _, rest = output.partition("\n")
+        return rest if first_line.strip() == command else output
+
+    def close(self) -> None:
+        """Exit shell process."""
+        with self._lock:
+            if self.running:
+                try:
+                    stdin = self._process.stdin_stream
+                    stdin.write("exit\n")
+                    stdin.flush()
+                    self._process.wait(timeout=5)
+                except Exception as e:
+                    logger.log(level=log_levels.MODULE_DEBUG, msg=f"Exiting ipmitool shell failed: {e}")
+            self._stop()
+            self._started = False
+
+
+class IpmiBatch:
+    """
+    Builder of ipmitool commands, which are executed in one process and one RMCP+ session.
+
+    Commands are written to script file on connection and executed by `ipmitool ... exec <file>`,
+    so session with BMC is established once instead of once per command.
+    After each command marker is echoed, by which output is split back per command.
+    With persistent shell commands are executed in the shell one by one.
+
+    Usage example:
+    >>> ipmi = Ipmi(ip="10.10.10.10", username="admin", password="*****", ipmi_type=IpmiType.IPMITool)
+    >>> outputs = ipmi.batch().set_state(IpmiStates.down).add("chassis bootdev pxe").set_state(IpmiStates.up).run()
+    """
+
+    def __init__(self, ipmi: "Ipmi") -> None:
+        """
+        Init of IpmiBatch.
+
+        :param ipmi: Ipmi object, which executes batch
+        """
+        self._ipmi = ipmi
+        self.commands: List[str] = []
+        self.errors = ""
+
+    def __len__(self) -> int:
+        """Get number of commands in batch."""
+        return len(self.commands)
+
+    def add(self, command: str) -> "IpmiBatch":
+        """
+        Add command to batch.
+
+        :param command: ipmitool command without connection parameters e.g. `chassis bootdev pxe`
+        :return: Batch, so calls can be chained
+        :raises ValueError: when command is empty or has more than one line
+        """
+        command = command.strip()
+        if not command or "\n" in command:
+            raise ValueError(f"Batch command must be single line, got: {command!r}")
+        self.commands.append(command)
+        return self
+
+    def set_state(self, state: IpmiStates) -> "IpmiBatch":
+        """
+        Add chassis power command to batch.
+
+        :param state: State to set
+        :return: Batch, so calls can be chained
+        """
+        return self.add(f"chassis power {state.value[IpmiType.IPMITool.value]}")
+
+    def get_state(self) -> "IpmiBatch":
+        """
+        Add chassis power status command to batch.
+
+        :return: Batch, so calls can be chained
+        """
+        return self.add("chassis power status")
+
+    @staticmethod
+    def split_output(output: str, count: int) -> List[Optional[str]]:
+        """
+        Split output of `ipmitool exec` per command by echoed markers.
+
+        :param output: Standard output of `ipmitool exec`
+        :param count: Number of commands in batch
+        :return: Output of each command, None for commands, which weren't executed
+        """
+        results: List[Optional[str]] = []
+        lines = []
+        for line in output.splitlines(keepends=True):
+            if line.strip() == f"{BATCH_MARKER} {len(results)}":
+                results.append("".join(lines))
+                lines = []
+            else:
+                lines.append(line)
+        return (results + [None] * count)[:count]
+
+    def _script(self) -> str:
+        """Create content of script file executed by `ipmitool exec`."""
+        return "".join(f"{command}\necho {BATCH_MARKER} {index}\n" for index, command in enumerate(self.commands))
+
+    def run(self) -> List[Optional[str]]:
+        """
+        Execute commands of batch.
+
+        Error output of tool is not split per command, it is stored in `errors`.
+
+        :return: Output of each command, None for commands, which weren't executed
+        """
+        self.errors = ""
+        if not self.commands:
+            return []
+        if self._ipmi._shell is not None:
+            return [self._ipmi._shell.execute(command) for command in self.commands]
+
+        connection = self._ipmi._connection
+        script = connection.path(self._ipmi._temp_dir(), f"{BATCH_MARKER}-{uuid.uuid4().hex}.txt")
+        script.write_text(self._script())
+        try:
+            process = connection.execute_command(
+                self._ipmi._ipmitool_command(f"exec {script}"), expected_return_codes=None
+            )
+        finally:
+            try:
+                script.unlink()
+            except Exception as e:
+                logger.log(level=log_levels.MODULE_DEBUG, msg=f"Removing batch script {script} failed: {e}")
+        self.errors = process.stderr or ""
+        results = self.split_output(process.stdout, len(self.commands))
+        logger.log(
+            level=log_levels.MODULE_DEBUG,
+            msg=f"Batch of {len(self.commands)} commands executed, {results.count(None)} not executed",
+        )
+        return results
 
 
 class Ipmi(PowerManagement):
     """
-    Implementation of managing power on machine by IPMITool or IpmiUtil.
+    Implementation of managing power on machine by IPMITool, IpmiUtil or native RMCP+ session.
+
+    With `IpmiType.RMCPPlus` no tool is required, commands are sent from Python over authenticated session,
+    which is shared by all Ipmi objects of the same BMC and user in the process.
 
     Usage example:
     >>> powermanagement = Ipmi(ip="10.10.10.10",username='admin',password='*****')
@@ -51,6 +429,11 @@ class Ipmi(PowerManagement):
     >>>
     >>> powermanagement.set_state(state=IpmiStates.down)
     Machine is poweroff by AC
+    >>>
+    >>> with Ipmi(ip="10.10.10.10", username="admin", password="*****", ipmi_type=IpmiType.RMCPPlus) as ipmi:
+    >>>     ipmi.power_up()
+    >>>     ipmi.session.get_chassis_status()
+    True
     """
 
     @os_supported(OSName.WINDOWS, OSName.LINUX, OSName.ESXI, OSName.FREEBSD)
@@ -63,6 +446,10 @@ class Ipmi(PowerManagement):
         ipmi_type: IpmiType = IpmiType.IPMIUtil,
         *,
         connection: "Connection" = LocalConnection(),
+        port: int = IPMI_PORT,
+        persistent_shell: bool = False,
+        retry_policy: Optional[IpmiRetryPolicy] = None,
+        sdr_cache_dir: Optional[str] = None,
     ):
         """
         Init of IPMI.
@@ -74,9 +461,39 @@ class Ipmi(PowerManagement):
         :param ipmi_type: Choose between available tools.
         :param connection: Not required if you need local execution, for remote execution required Connection object
         from mfd_connect
+        :param port: UDP port of BMC, used by `IpmiType.RMCPPlus`
+        :param persistent_shell: Execute commands in long-lived `ipmitool shell` process, only for `IpmiType.IPMITool`
+        :param retry_policy: Policy of retrying failed `set_state` attempts, default policy when not passed
+        :param sdr_cache_dir: Directory on connection for SDR repository dumps, temporary directory when not passed
+        :raises ValueError: when persistent shell is requested for other type than `IpmiType.IPMITool`
         """
         super().__init__(host, ip, username, password, ipmi_type.value, connection=connection)
+        if persistent_shell and ipmi_type is not IpmiType.IPMITool:
+            raise ValueError("Persistent shell is available only for ipmitool")
+        self._port = port
+        self._session: Optional[RmcpPlusSession] = None
+        self._shell: Optional[IpmiToolShell] = None
+        self._retry_policy = retry_policy if retry_policy is not None else IpmiRetryPolicy()
+        self.last_attempts: List[IpmiAttempt] = []
+        self._sdr_cache_dir = sdr_cache_dir
+        self._sdr_cache: Optional["Path"] = None
+        if persistent_shell:
+            self._shell = IpmiToolShell(self._connection, self._ipmitool_command("shell"))
+        if ipmi_type is IpmiType.RMCPPlus:
+            return
 
+        self._check_tool_availability(ipmi_type)
+
+    def _check_tool_availability(self, ipmi_type: IpmiType) -> None:
+        """
+        Check that tool is installed on connection, positive result is cached for the connection.
+
+        :param ipmi_type: Tool to check
+        :raises PowerManagementException: when tool is not available
+        """
+        with _available_tools_lock:
+            if ipmi_type in _available_tools.get(self._connection, ()):
+                return
         tool_availability_test_command = ipmi_ver[ipmi_type]
         try:
             result = self._connection.execute_command(
@@ -86,13 +503,285 @@ class Ipmi(PowerManagement):
                 raise FileNotFoundError
         except FileNotFoundError:
             raise PowerManagementException(f"{self._executable_name} is not available in OS")
+        with _available_tools_lock:
+            _available_tools.setdefault(self._connection, set()).add(ipmi_type)
+
+    def _ipmitool_command(self, arguments: str) -> str:
+        """
+        Create ipmitool command with connection parameters.
 
-    def powercycle(self) -> None:
-        """Reset platform by setting down and up state with delay."""
+        :param arguments: ipmitool command e.g. `chassis power status`
+        """
+        return f"ipmitool -I lanplus -H {self._host} -U {self._username} -P {self._password} {arguments}"
+
+    def _temp_dir(self) -> str:
+        """Get temporary directory of connection."""
+        return "C:\\Windows\\Temp" if self._connection.get_os_name() == OSName.WINDOWS else "/tmp"
+
+    def _get_sdr_cache(self) -> "Path":
+        """
+        Get SDR repository dump of BMC, dump it when it isn't cached for current firmware yet.
+
+        :return: Path of dump file on connection
+        :raises PowerManagementException: when firmware can't be read or SDR can't be dumped
+        """
+        if self._sdr_cache is not None:
+            return self._sdr_cache
+        try:
+            output = self._connection.execute_command(self._ipmitool_command("mc info")).stdout
+        except CalledProcessError as e:
+            raise PowerManagementException(f"Unable to read BMC info: {e.stderr or e.stdout}") from e
+        match = FIRMWARE_REVISION_REGEX.search(output)
+        if match is None:
+            raise PowerManagementException(f"Unable to read firmware revision from output: {output}")
+        key = re.sub(r"[^\w.-]", "_", f"{self._host}-{match.group('firmware')}")
+        cache = self._connection.path(self._sdr_cache_dir or self._temp_dir(), f"{SDR_CACHE_PREFIX}-{key}.bin")
+        if not cache.exists():
+            logger.log(level=log_levels.MODULE_DEBUG, msg=f"Dumping SDR repository of {self._host} to {cache}")
+            try:
+                self._connection.execute_command(self._ipmitool_command(f"sdr dump {cache}"))
+            except CalledProcessError as e:
+                raise PowerManagementException(f"Unable to dump SDR repository: {e.stderr or e.stdout}") from e
+        self._sdr_cache = cache
+        return cache
+
+    def clear_sdr_cache(self) -> None:
+        """Remove SDR repository dump, so it is dumped again by next sensor read."""
+        cache, self._sdr_cache = self._sdr_cache, None
+        if cache is not None and cache.exists():
+            cache.unlink()
+
+    def get_sensors(self) -> List[IpmiSensor]:
+        """
+        Read all sensors of BMC in one pass.
+
+        SDR repository is downloaded from BMC once and cached in file on connection, keyed by BMC and firmware,
+        following reads use it by `ipmitool -S <file>` and only read sensor values.
+        With persistent shell SDR repository is cached by the shell process itself.
+
+        :return: Sensors in order of SDR repository
+        :raises PowerManagementException: when Ipmi doesn't use `IpmiType.IPMITool` or sensors can't be read
+        """
+        if self._executable_name != IpmiType.IPMITool.value:
+            raise PowerManagementException(f"Reading sensors is not available for {self._executable_name}")
+        if self._shell is not None:
+            return parse_sdr_list(self._shell.execute("sdr list full"))
+        cache = self._get_sdr_cache()
+        try:
+            output = self._connection.execute_command(self._ipmitool_command(f"-S {cache} sdr list full")).stdout
+        except CalledProcessError as e:
+            # dump may be corrupted or outdated, it is dumped again by next read
+            self.clear_sdr_cache()
+            raise PowerManagementException(f"Unable to read sensors: {e.stderr or e.stdout}") from e
+        return parse_sdr_list(output)
+
+    def batch(self) -> IpmiBatch:
+        """
+        Create builder of commands executed in one ipmitool process.
+
+        :return: Empty batch
+        :raises PowerManagementException: when Ipmi doesn't use `IpmiType.IPMITool`
+        """
+        if self._executable_name != IpmiType.IPMITool.value:
+            raise PowerManagementException(f"Batch execution is not available for {self._executable_name}")
+        return IpmiBatch(self)
+
+    def __enter__(self) -> "Ipmi":
+        """Enter context of Ipmi."""
+        return self
+
+    def __exit__(
+        self,
+        __exc_type: Type[BaseException] | None,
+        __exc_value: BaseException | None,
+        __traceback: TracebackType | None,
+    ) -> None:
+        """Release RMCP+ session and stop ipmitool shell."""
+        self.close()
+
+    @property
+    def session(self) -> RmcpPlusSession:
+        """
+        Shared RMCP+ session with BMC, acquired on first use.
+
+        :raises PowerManagementException: when Ipmi doesn't use `IpmiType.RMCPPlus`
+        """
+        if self._executable_name != IpmiType.RMCPPlus.value:
+            raise PowerManagementException(f"RMCP+ session is not available for {self._executable_name}")
+        if self._session is None:
+            self._session = RmcpPlusSession.shared(str(self._host), self._username, self._password, port=self._port)
+        return self._session
+
+    def close(self) -> None:
+        """
+        Release reference to shared RMCP+ session and stop ipmitool shell.
+
+        RMCP+ session is closed on BMC when no other Ipmi object uses it.
+        Shell is started again by next command.
+        """
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        if self._shell is not None:
+            self._shell.close()
+
+    def _sol_command(self) -> str:
+        """Create command activating Serial-over-LAN session based on the tool used."""
+        if self._executable_name == IpmiType.IPMIUtil.value:
+            return f"{self._executable_name} sol -a -F lan2 -N {self._host} -U {self._username} -P {self._password}"
+        return self._ipmitool_command("sol activate")
+
+    def sol(self, patterns: Optional[Dict[str, str]] = None) -> SolConsole:
+        """
+        Create Serial-over-LAN console of platform, started by `start()` or context manager.
+
+        :param patterns: Regular expressions of console events by name, `sol.BOOT_PATTERNS` when not passed
+        :return: Console, which isn't started yet
+        :raises PowerManagementException: when Ipmi uses `IpmiType.RMCPPlus`
+        """
+        if self._executable_name == IpmiType.RMCPPlus.value:
+            raise PowerManagementException(f"SOL console is not available for {self._executable_name}")
+        return SolConsole(self._connection, self._sol_command(), patterns=patterns)
+
+    def powercycle(
+        self,
+        *,
+        timeout: float = 60,
+        boot_event: Optional[str] = None,
+        boot_timeout: float = 600,
+        native_cycle: bool = False,
+    ) -> None:
+        """
+        Reset platform by setting down and up state, each confirmed by power status.
+
+        With `native_cycle` single power cycle command is sent and off to on transition is confirmed by power status,
+        setting down and up state is fallback for BMCs, which reject cycle e.g. when chassis is off.
+        With `boot_event` SOL console is read during power cycle and method returns as soon as console prints
+        the event, e.g. `login_prompt`.
+
+        :param timeout: Time in seconds to wait for each of the states
+        :param boot_event: Name of SOL console event ending the power cycle, see `sol.BOOT_PATTERNS`
+        :param boot_timeout: Time in seconds to wait for boot event after power up
+        :param native_cycle: Send power cycle command instead of down and up
+        :raises PowerManagementException: when state can't be set or isn't reached in time, or boot event
+        isn't printed in time
+        """
+        if boot_event is None:
+            logger.log(level=log_levels.MODULE_DEBUG, msg="Resetting platform via IPMI...")
+            self._powercycle(timeout, native_cycle=native_cycle)
+            return
         logger.log(level=log_levels.MODULE_DEBUG, msg="Resetting platform via IPMI and looking for reboot prompts...")
+        with self.sol() as console:
+            self._powercycle(timeout, console, native_cycle=native_cycle)
+            console.wait_for(boot_event, timeout=boot_timeout)
+
+    def _powercycle(self, timeout: float, console: Optional[SolConsole] = None, *, native_cycle: bool = False) -> None:
+        """
+        Set down and up state or send power cycle command, confirmed by power status.
+
+        Down and up state is fallback only when BMC rejects cycle command. Once cycle is accepted it isn't
+        repeated by down and up, because platform could be cycled twice when short off period is missed.
+
+        :param timeout: Time in seconds to wait for each of the states
+        :param console: SOL console, which events are forgotten once platform is down
+        :param native_cycle: Send power cycle command, fall back to down and up when it's rejected
+        """
+        if native_cycle:
+            try:
+                self.set_state(state=IpmiStates.cycle, retry_count=3)
+            except PowerManagementException as e:
+                logger.log(
+                    level=log_levels.MODULE_DEBUG, msg=f"Power cycle rejected, falling back to power down and up: {e}"
+                )
+            else:
+                self._wait_for_cycle(timeout, console)
+                return
         self.set_state(state=IpmiStates.down, retry_count=3)
-        time.sleep(10)
+        self.wait_for_state(IpmiStates.down, timeout=timeout)
+        if console is not None:
+            console.reset()
         self.set_state(state=IpmiStates.up, retry_count=3)
+        self.wait_for_state(IpmiStates.up, timeout=timeout)
+
+    def _wait_for_cycle(self, timeout: float, console: Optional[SolConsole] = None) -> None:
+        """
+        Wait until chassis goes off and on again after accepted power cycle command.
+
+        Power status is polled at constant short interval until chassis is off, so short off period isn't missed.
+
+        :param timeout: Time in seconds to wait for each of the states
+        :param console: SOL console, which events are forgotten once platform is down
+        :raises PowerManagementException: when states aren't reached in time
+        """
+        self.wait_for_state(IpmiStates.down, timeout=timeout, max_interval=STATUS_POLL_INTERVAL)
+        if console is not None:
+            console.reset()
+        self.wait_for_state(IpmiStates.up, timeout=timeout)
+
+    def _get_state_command(self) -> str:
+        """Create power status command based on the tool used."""
+        if self._executable_name == IpmiType.IPMIUtil.value:
+            return f"{self._executable_name} health -F lan2 -N {self._host} -U {self._username} -P {self._password}"
+        if self._executable_name == IpmiType.IPMITool.value:
+            return self._ipmitool_command("chassis power status")
+
+    def get_state(self) -> IpmiStates:
+        """
+        Read chassis power status.
+
+        :return: IpmiStates.up when power is on, IpmiStates.down otherwise
+        :raises PowerManagementException: when status can't be read
+        """
+        if self._executable_name == IpmiType.RMCPPlus.value:
+            power_on = self.session.get_chassis_status()
+        else:
+            if self._shell is not None:
+                output = self._shell.execute("chassis power status")
+            else:
+                try:
+                    output = self._connection.execute_command(self._get_state_command()).stdout
+                except CalledProcessError as e:
+                    raise PowerManagementException(f"Unable to read power status: {e.stderr or e.stdout}") from e
+            match = POWER_STATUS_REGEX.search(output)
+            if match is None:
+                raise PowerManagementException(f"Unable to read power status from output: {output}")
+            power_on = match.group("state").casefold() == "on"
+        return IpmiStates.up if power_on else IpmiStates.down
+
+    def wait_for_state(
+        self, state: IpmiStates, timeout: float = 60, *, max_interval: float = STATUS_POLL_MAX_INTERVAL
+    ) -> None:
+        """
+        Poll power status until chassis reaches given state.
+
+        Interval between polls starts short and doubles up to a limit, so quick transitions are noticed
+        almost immediately without flooding BMC during slow ones. Failed reads are retried until timeout.
+
+        :param state: IpmiStates.up or IpmiStates.down
+        :param timeout: Time in seconds to wait
+        :param max_interval: Maximal interval in seconds between polls
+        :raises ValueError: when state is not up or down
+        :raises PowerManagementException: when state isn't reached in time
+        """
+        if state not in (IpmiStates.up, IpmiStates.down):
+            raise ValueError(f"Power status can't be {state.name}, only up or down")
+        start_time = time.monotonic()
+        interval = min(STATUS_POLL_INTERVAL, max_interval)
+        while True:
+            try:
+                if self.get_state() is state:
+                    logger.log(
+                        level=log_levels.MODULE_DEBUG,
+                        msg=f"Chassis reached state {state.name} after {time.monotonic() - start_time:.2f} seconds",
+                    )
+                    return
+            except PowerManagementException as e:
+                logger.log(level=log_levels.MODULE_DEBUG, msg=f"Reading power status failed: {e}")
+            remaining = start_time + timeout - time.monotonic()
+            if remaining <= 0:
+                raise PowerManagementException(f"Chassis didn't reach state {state.name} in {timeout} seconds")
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 2, max_interval)
 
     def power_down(self) -> None:
         """Power off platform."""
@@ -114,39 +803,113 @@ class Ipmi(PowerManagement):
                 f"-U {self._username} -P {self._password} {state.value[self._executable_name]} -V 4"
             )
         if self._executable_name == IpmiType.IPMITool.value:
-            return (
-                f"{self._executable_name} -I lanplus -H {self._host} "
-                f"-U {self._username} -P {self._password} chassis power {state.value[self._executable_name]}"
-            )
+            return self._ipmitool_command(f"chassis power {state.value[self._executable_name]}")
 
-    def set_state(self, *, state: IpmiStates, retry_count: int = 3) -> None:
+    def _set_state_native(self, state: IpmiStates) -> typing.Tuple[str, bool]:
         """
-        Set given power state. Cannot set state, which is already set.
+        Send Chassis Control command over RMCP+ session.
 
-        :param state: State to set
-        :param retry_count: Number of times to retry on failure
+        :param state: State to set.
+        :return: Output in format of ipmitool or error message, and whether command succeeded
         """
-        if retry_count == 0:
-            logger.log(level=log_levels.MODULE_DEBUG, msg="Multiple (on failure) IPMI calls attempt timed out")
-            raise PowerManagementException(
-                f"Multiple failure on calls, cannot set {state.value[self._executable_name]}"
-            )
+        try:
+            self.session.chassis_control(state.value[self._executable_name])
+        except IpmiSessionException as e:
+            return str(e), False
+        return f"Chassis Power Control: {state.name}", True
+
+    def _set_state_shell(self, state: IpmiStates) -> typing.Tuple[str, bool]:
+        """
+        Execute chassis power command in ipmitool shell.
+
+        Shell doesn't report exit code and prints error output of command together with its output,
+        so failure is recognized by output only.
 
+        :param state: State to set.
+        :return: Output of command or error message, and whether shell executed command
+        """
+        try:
+            return self._shell.execute(f"chassis power {state.value[self._executable_name]}"), True
+        except PowerManagementException as e:
+            return str(e), False
+
+    def _execute_set_state(self, state: IpmiStates) -> typing.Tuple[str, bool]:
+        """
+        Execute single attempt of setting power state with configured backend.
+
+        :param state: State to set.
+        :return: Output of command including error output of tool, and whether tool exited successfully
+        """
+        if self._executable_name == IpmiType.RMCPPlus.value:
+            return self._set_state_native(state)
+        if self._shell is not None:
+            return self._set_state_shell(state)
         command = self._set_state_command(state)
+        try:
+            process = self._connection.execute_command(command)
+        except CalledProcessError as e:
+            return f"{e.stdout or ''}{e.stderr or ''}", False
+        return process.stdout, True
+
+    @staticmethod
+    def _set_state_succeeded(output: str, exited: bool) -> bool:
+        """
+        Check result of setting power state.
 
-        process = self._connection.execute_command(command)
-        output = process.stdout
+        Only success line of the tool is looked for, warnings and verbose output of tools
+        e.g. `ipmiutil -V 4` may contain words like `error` or `failed` even when power state was changed.
 
-        if "completed successfully" not in output and "chassis power" not in output.casefold():
+        :param output: Output of command including error output of tool
+        :param exited: Whether tool exited successfully
+        :return: True when tool exited successfully and printed its success line
+        """
+        return exited and SET_STATE_SUCCESS_REGEX.search(output) is not None
+
+    def set_state(self, *, state: IpmiStates, retry_count: int = 3) -> None:
+        """
+        Set given power state. Cannot set state, which is already set.
+
+        Failed attempts are classified by retry policy: fatal failures are not retried, transient and busy ones
+        are retried after delay computed by the policy. Attempts of the last call are stored in `last_attempts`.
+
+        :param state: State to set
+        :param retry_count: Number of attempts
+        :raises PowerManagementException: when state can't be set
+        """
+        self.last_attempts = []
+        start_time = time.monotonic()
+        for attempt in range(1, retry_count + 1):
+            attempt_start = time.monotonic()
+            output, exited = self._execute_set_state(state)
+            elapsed = time.monotonic() - attempt_start
             logger.log(level=log_levels.MODULE_DEBUG, msg=f"set_state output: {output}")
-            logger.log(
-                level=log_levels.MODULE_DEBUG,
-                msg=f"Unable to perform action: {state.name} - Attempts left: {retry_count}",
+            if self._set_state_succeeded(output, exited):
+                self.last_attempts.append(IpmiAttempt(attempt=attempt, success=True, elapsed=elapsed, output=output))
+                logger.log(
+                    level=log_levels.MODULE_DEBUG,
+                    msg=f"Action performed successfully: Chassis {state.value[self._executable_name]} "
+                    f"in attempt {attempt}, {elapsed:.2f} seconds",
+                )
+                return
+
+            kind = self._retry_policy.classify(output)
+            last_attempt = kind is IpmiFailureKind.fatal or attempt == retry_count
+            delay = 0 if last_attempt else self._retry_policy.get_delay(attempt, kind)
+            self.last_attempts.append(
+                IpmiAttempt(attempt=attempt, success=False, elapsed=elapsed, output=output, kind=kind, delay=delay)
             )
-            self.set_state(state=state, retry_count=retry_count - 1)
-        else:
-            logger.log(level=log_levels.MODULE_DEBUG, msg=f"set_state output: {output}")
             logger.log(
                 level=log_levels.MODULE_DEBUG,
-                msg=f"Action performed successfully: Chassis {state.value[self._executable_name]}",
+                msg=f"Unable to perform action: {state.name} - {kind.value} failure in {elapsed:.2f} seconds - "
+                f"Attempts left: {0 if kind is IpmiFailureKind.fatal else retry_count - attempt}",
             )
+            if last_attempt:
+                break
+            time.sleep(delay)
+
+        logger.log(
+            level=log_levels.MODULE_DEBUG,
+            msg=f"IPMI calls failed after {len(self.last_attempts)} attempt(s) in {time.monotonic() - start_time:.2f} "
+            "seconds",
+        )
+        raise PowerManagementException(f"Multiple failure on calls, cannot set {state.value[self._executable_name]}")
@@ -4,20 +4,23 @@
 
 import asyncio
 import logging
+import math
+import threading
 import time
+import warnings
 from abc import ABC
+from array import array
 from enum import Enum
-from typing import Optional
+from types import TracebackType
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Type
 
 from mfd_common_libs import add_logging_level, log_levels
-from pysnmp.entity.engine import SnmpEngine
-from pysnmp.hlapi.v3arch import CommunityData, UdpTransportTarget, ContextData
-from pysnmp.hlapi.v3arch.asyncio.cmdgen import set_cmd
-from pysnmp.proto.rfc1902 import Integer32
-from pysnmp.smi.rfc1902 import ObjectIdentity, ObjectType
+from pysnmp.hlapi.v3arch import UsmUserData
+from pysnmp.proto.rfc1905 import NoSuchInstance, NoSuchObject
 
 from .base import PowerManagement
-from .exceptions import PDUConfigurationException, PDUSNMPException, PowerManagementException
+from .exceptions import PDUBatchException, PDUConfigurationException, PDUSNMPException, PowerManagementException
+from .snmp import SnmpClient, TOO_BIG_ERROR_STATUS, compile_var_bind, get_var_bind_size
 
 logger = logging.getLogger(__name__)
 add_logging_level("MODULE_DEBUG", log_levels.MODULE_DEBUG)
@@ -31,6 +34,22 @@ class PDUStates(Enum):
     cycle = "CYCLE"
 
 
+class PDUCompletionMode(Enum):
+    """Available ways of waiting for execution of outlet commands."""
+
+    poll = "POLL"
+    cool_down = "COOL_DOWN"
+
+
+class PDUTelemetrySample(NamedTuple):
+    """Load reading of single outlet, NaN for measurement not reported by PDU."""
+
+    timestamp: float
+    current: float
+    power: float
+    energy: float
+
+
 class PDU(PowerManagement, ABC):
     """
     Implementation of Power Distribution Units management via SNMP.
@@ -45,10 +64,44 @@ class PDU(PowerManagement, ABC):
     >>>
     >>> power_switch.set_state(state=PDUStates.cycle, outlet_number=2)
     Outlet no. 2 is power cycled.
+    >>>
+    >>> with APC(ip='10.10.10.10', share_snmp_client=True) as power_switch:
+    >>>     power_switch.power_off(outlet_number=1)
+    >>>
+    >>> async with APC(ip='10.10.10.10') as power_switch:
+    >>>     await asyncio.gather(*(power_switch.async_power_on(outlet_number=n) for n in range(1, 9)))
+    >>>
+    >>> power_switch.set_states({1: PDUStates.off, 2: PDUStates.on, 3: PDUStates.cycle})
+    >>> power_switch.power_off_outlets([4, 5, 6])
+    >>>
+    >>> power_switch.get_state(outlet_number=4)
+    PDUStates.off
+    >>> power_switch.get_outlet_states(cache_ttl=5)
+    {1: PDUStates.off, 2: PDUStates.on, ...}
+    >>> power_switch.get_outlet_metering()
+    {1: PDUTelemetrySample(timestamp=1700000000.0, current=0.4, power=52.0, energy=12.3), ...}
     """
 
+    OUTLET_STATUS: Optional[str] = None
+    # Measurement name, table column OID walked with GETBULK, index suffix of measurement and scale to A, W and kWh
+    OUTLET_METERING: Tuple[Tuple[str, str, Tuple[int, ...], float], ...] = ()
+    COOL_DOWN_TIME = 2
+    POLL_INITIAL_INTERVAL = 0.05
+    POLL_MAX_INTERVAL = 1
+    POLL_BACKOFF_FACTOR = 1.5
+
     def __init__(
-        self, *, ip: str, udp_port: int = 161, community_string: str = "private", outlet_number: Optional[int] = None
+        self,
+        *,
+        ip: str,
+        udp_port: int = 161,
+        community_string: str = "private",
+        outlet_number: Optional[int] = None,
+        snmp_client: Optional[SnmpClient] = None,
+        share_snmp_client: bool = False,
+        completion_mode: PDUCompletionMode = PDUCompletionMode.poll,
+        completion_timeout: float = 10,
+        usm_user: Optional[UsmUserData] = None,
     ) -> None:
         """
         Init of PDU.
@@ -57,12 +110,78 @@ class PDU(PowerManagement, ABC):
         :param udp_port: UDP port for SNMP connection. By default, it is 161.
         :param community_string: Community to use for SNMP connection, available in configuration of PDU
         :param outlet_number: Optional Outlet number, when want to store it in object of PDU.
+        :param snmp_client: Optional SNMP client to be used, it won't be closed together with PDU object.
+        :param share_snmp_client: Use process-wide SNMP client shared by all PDU objects of the same device.
+        :param completion_mode: How to wait for execution of outlet commands, polling of outlet status
+        or fixed cool-down. Cool-down is always used for vendors without outlet status OID.
+        :param completion_timeout: Time in seconds to wait for outlets reaching requested state when polling.
+        :param usm_user: SNMPv3 USM user to be used instead of community string, eg. for authPriv security level.
+        Keys are localized once per agent engine ID in process, engine ID is discovered on first command.
         """
-        self._transport_target = None
         self._ip = ip
         self._udp_port = udp_port
         self._community_string = community_string
+        self._usm_user = usm_user
         self._outlet_number = outlet_number
+        self._snmp_client = snmp_client
+        self._owns_snmp_client = snmp_client is None
+        self._share_snmp_client = share_snmp_client
+        self._completion_mode = completion_mode
+        self._completion_timeout = completion_timeout
+        self._outlet_states: Optional[Dict[int, PDUStates]] = None
+        self._outlet_states_timestamp = 0.0
+
+    def __enter__(self) -> "PDU":
+        """Enter context of PDU."""
+        return self
+
+    def __exit__(
+        self,
+        __exc_type: Type[BaseException] | None,
+        __exc_value: BaseException | None,
+        __traceback: TracebackType | None,
+    ) -> None:
+        """Close SNMP client of PDU."""
+        self.close()
+
+    async def __aenter__(self) -> "PDU":
+        """Enter asynchronous context of PDU."""
+        return self
+
+    async def __aexit__(
+        self,
+        __exc_type: Type[BaseException] | None,
+        __exc_value: BaseException | None,
+        __traceback: TracebackType | None,
+    ) -> None:
+        """Close SNMP client of PDU."""
+        self.close()
+
+    @property
+    def snmp_client(self) -> SnmpClient:
+        """SNMP client used for communication with PDU, created on first use."""
+        if self._snmp_client is None:
+            if self._share_snmp_client:
+                self._snmp_client = SnmpClient.shared(
+                    ip=self._ip,
+                    udp_port=self._udp_port,
+                    community_string=self._community_string,
+                    usm_user=self._usm_user,
+                )
+            else:
+                self._snmp_client = SnmpClient(
+                    ip=self._ip,
+                    udp_port=self._udp_port,
+                    community_string=self._community_string,
+                    usm_user=self._usm_user,
+                )
+        return self._snmp_client
+
+    def close(self) -> None:
+        """Close SNMP client, when it is owned by PDU object."""
+        if self._snmp_client is not None and self._owns_snmp_client:
+            self._snmp_client.close()
+            self._snmp_client = None
 
     def power_off(self, *, outlet_number: Optional[int] = None) -> None:
         """
@@ -106,24 +225,382 @@ class PDU(PowerManagement, ABC):
         :raises PDUSNMPException: if there is an error returned from remote PDU via SNMP eg. wrong value set
         :raises PowerManagementException: when not passed outlet number
         """
+        number = self._get_outlet_number(outlet_number)
+        self._set_oid(oid=self.OUTLET_CONTROL, instance_number=number, value=getattr(self, f"{state.value}_COMMAND"))
+
+    async def async_power_off(self, *, outlet_number: Optional[int] = None) -> None:
+        """
+        Power off the specified outlet, awaitable in running event loop.
+
+        :param outlet_number: Number of electrical socket to be controlled, otherwise will be used from object
+        :raises PDUConfigurationException: if there is a misconfiguration or timeout eg. wrong IP selected
+        :raises PDUSNMPException: if there is an error returned from remote PDU via SNMP eg. wrong value set
+        :raises PowerManagementException: when not passed outlet number
+        """
+        await self.async_set_state(state=PDUStates.off, outlet_number=outlet_number)
+
+    async def async_power_on(self, *, outlet_number: Optional[int] = None) -> None:
+        """
+        Power on the specified outlet, awaitable in running event loop.
+
+        :param outlet_number: Number of electrical socket to be controlled, otherwise will be used from object
+        :raises PDUConfigurationException: if there is a misconfiguration or timeout eg. wrong IP selected
+        :raises PDUSNMPException: if there is an error returned from remote PDU via SNMP eg. wrong value set
+        :raises PowerManagementException: when not passed outlet number
+        """
+        await self.async_set_state(state=PDUStates.on, outlet_number=outlet_number)
+
+    async def async_power_cycle(self, *, outlet_number: Optional[int] = None) -> None:
+        """
+        Power cycle the specified outlet, awaitable in running event loop.
+
+        :param outlet_number: Number of electrical socket to be controlled, otherwise will be used from object
+        :raises PDUConfigurationException: if there is a misconfiguration or timeout eg. wrong IP selected
+        :raises PDUSNMPException: if there is an error returned from remote PDU via SNMP eg. wrong value set
+        :raises PowerManagementException: when not passed outlet number
+        """
+        await self.async_set_state(state=PDUStates.cycle, outlet_number=outlet_number)
+
+    async def async_set_state(self, *, state: PDUStates, outlet_number: Optional[int] = None) -> None:
+        """
+        Set given power state, awaitable in running event loop.
+
+        :param state: State to set
+        :param outlet_number: Number of electrical socket to be controlled, otherwise will be used from object
+        :raises PDUConfigurationException: if there is a misconfiguration or timeout eg. wrong IP selected
+        :raises PDUSNMPException: if there is an error returned from remote PDU via SNMP eg. wrong value set
+        :raises PowerManagementException: when not passed outlet number
+        """
+        number = self._get_outlet_number(outlet_number)
+        await self._async_set_oid(
+            oid=self.OUTLET_CONTROL, instance_number=number, value=getattr(self, f"{state.value}_COMMAND")
+        )
+
+    def power_off_outlets(self, outlet_numbers: Iterable[int]) -> None:
+        """
+        Power off the specified outlets using as few SNMP requests as possible.
+
+        :param outlet_numbers: Numbers of electrical sockets to be controlled
+        :raises PDUConfigurationException: if there is a misconfiguration or timeout eg. wrong IP selected
+        :raises PDUBatchException: if operation failed for some of the outlets, with error per outlet
+        """
+        self.set_states({outlet_number: PDUStates.off for outlet_number in outlet_numbers})
+
+    def power_on_outlets(self, outlet_numbers: Iterable[int]) -> None:
+        """
+        Power on the specified outlets using as few SNMP requests as possible.
+
+        :param outlet_numbers: Numbers of electrical sockets to be controlled
+        :raises PDUConfigurationException: if there is a misconfiguration or timeout eg. wrong IP selected
+        :raises PDUBatchException: if operation failed for some of the outlets, with error per outlet
+        """
+        self.set_states({outlet_number: PDUStates.on for outlet_number in outlet_numbers})
+
+    def power_cycle_outlets(self, outlet_numbers: Iterable[int]) -> None:
+        """
+        Power cycle the specified outlets using as few SNMP requests as possible.
+
+        :param outlet_numbers: Numbers of electrical sockets to be controlled
+        :raises PDUConfigurationException: if there is a misconfiguration or timeout eg. wrong IP selected
+        :raises PDUBatchException: if operation failed for some of the outlets, with error per outlet
+        """
+        self.set_states({outlet_number: PDUStates.cycle for outlet_number in outlet_numbers})
+
+    def set_states(self, states: Dict[int, PDUStates]) -> None:
+        """
+        Set given power states for many outlets, packing them into as few SNMP SET requests as possible.
+
+        :param states: Power state to set for each outlet number
+        :raises PDUConfigurationException: if there is a misconfiguration or timeout eg. wrong IP selected
+        :raises PDUBatchException: if operation failed for some of the outlets, with error per outlet
+        """
+        self.snmp_client.run(self.async_set_states(states))
+
+    async def async_set_states(self, states: Dict[int, PDUStates]) -> None:
+        """
+        Set given power states for many outlets, awaitable in running event loop.
+
+        Outlets are split into batches fitting into maximum message size of SNMP agent,
+        each batch is sent as single SNMP SET request.
+        SNMP SET is atomic, so when agent rejects one of variable bindings (pointed by error index),
+        the outlet is reported as failed and the rest of the batch is sent again.
+
+        :param states: Power state to set for each outlet number
+        :raises PDUConfigurationException: if there is a misconfiguration or timeout eg. wrong IP selected
+        :raises PDUBatchException: if operation failed or didn't complete for some of the outlets, with error per outlet
+        """
+        commands = [
+            (outlet_number, f"{self.OUTLET_CONTROL}.{outlet_number}", int(getattr(self, f"{state.value}_COMMAND")))
+            for outlet_number, state in states.items()
+        ]
+        if not commands:
+            return
+
+        errors = {}
+        batches = self.snmp_client.split_var_binds([get_var_bind_size(oid, value) for _, oid, value in commands])
+        for batch in batches:
+            await self._async_set_batch([commands[index] for index in batch], errors)
+
+        if len(errors) == len(commands) and all(isinstance(e, PDUConfigurationException) for e in errors.values()):
+            raise next(iter(errors.values()))
+
+        if len(errors) < len(commands):
+            logger.log(
+                level=log_levels.MODULE_DEBUG,
+                msg=f"Commands for {len(commands) - len(errors)} outlet(s) received successfully in {len(batches)} "
+                f"request(s).",
+            )
+            not_completed = await self._async_wait_for_execution(
+                {outlet_number: state for outlet_number, state in states.items() if outlet_number not in errors}
+            )
+            for outlet_number in not_completed:
+                errors[outlet_number] = PowerManagementException(
+                    f"Outlet no. {outlet_number} didn't reach {states[outlet_number].name} state "
+                    f"within {self._completion_timeout} seconds"
+                )
+
+        if errors:
+            raise PDUBatchException(errors)
+
+    async def _async_set_batch(
+        self, batch: List[Tuple[int, str, int]], errors: Dict[int, PowerManagementException]
+    ) -> None:
+        """
+        Send batch of outlet commands in single SNMP SET request.
+
+        :param batch: Outlet number, OID and value for each command
+        :param errors: Dictionary to be filled with errors for failed outlet numbers
+        """
+        while batch:
+            result = await self.snmp_client.async_set(*(compile_var_bind(oid, value) for _, oid, value in batch))
+            error_indication, error_status, error_index, var_binds = result
+            if error_indication:
+                for outlet_number, _, _ in batch:
+                    errors[outlet_number] = PDUConfigurationException(
+                        f"{error_indication} - check your configuration and network connection"
+                    )
+                return
+            if not error_status:
+                logger.log(
+                    level=log_levels.MODULE_DEBUG,
+                    msg=f"Commands for outlets {[number for number, _, _ in batch]} received successfully.",
+                )
+                return
+
+            if int(error_status) == TOO_BIG_ERROR_STATUS and len(batch) > 1:
+                message_size = self.snmp_client.message_overhead + sum(
+                    get_var_bind_size(oid, value) for _, oid, value in batch
+                )
+                self.snmp_client.max_message_size = min(self.snmp_client.max_message_size, message_size - 1)
+                logger.log(
+                    level=log_levels.MODULE_DEBUG,
+                    msg=f"Request of {message_size} octets is too big for agent, splitting batch.",
+                )
+                middle = len(batch) // 2
+                await self._async_set_batch(batch[:middle], errors)
+                await self._async_set_batch(batch[middle:], errors)
+                return
+
+            error_index = int(error_index)
+            if 0 < error_index <= len(batch):
+                outlet_number, oid, _ = batch.pop(error_index - 1)
+                errors[outlet_number] = PDUSNMPException(f"{error_status} error occurred for {oid}")
+            else:
+                for outlet_number, oid, _ in batch:
+                    errors[outlet_number] = PDUSNMPException(f"{error_status} error occurred for {oid}")
+                return
+
+    def get_state(self, *, outlet_number: Optional[int] = None) -> PDUStates:
+        """
+        Read current power state of the specified outlet.
+
+        :param outlet_number: Number of electrical socket to be checked, otherwise will be used from object
+        :return: PDUStates.on or PDUStates.off
+        :raises PDUConfigurationException: if there is a misconfiguration or timeout eg. wrong IP selected
+        :raises PDUSNMPException: if there is an error returned from remote PDU via SNMP eg. wrong outlet number
+        :raises PowerManagementException: when not passed outlet number or vendor has no status OID
+        """
+        return self.snmp_client.run(self.async_get_state(outlet_number=outlet_number))
+
+    async def async_get_state(self, *, outlet_number: Optional[int] = None) -> PDUStates:
+        """
+        Read current power state of the specified outlet, awaitable in running event loop.
+
+        :param outlet_number: Number of electrical socket to be checked, otherwise will be used from object
+        :return: PDUStates.on or PDUStates.off
+        :raises PDUConfigurationException: if there is a misconfiguration or timeout eg. wrong IP selected
+        :raises PDUSNMPException: if there is an error returned from remote PDU via SNMP eg. wrong outlet number
+        :raises PowerManagementException: when not passed outlet number or vendor has no status OID
+        """
+        number = self._get_outlet_number(outlet_number)
+        oid = f"{self._get_outlet_status_oid()}.{number}"
+        result = await self.snmp_client.async_get(compile_var_bind(oid))
+        error_indication, error_status, error_index, var_binds = result
+        if error_indication:
+            raise PDUConfigurationException(f"{error_indication} - check your configuration and network connection")
+        if error_status:
+            raise PDUSNMPException(f"{error_status} error occurred for {oid}")
+        _, value = var_binds[0]
+        if isinstance(value, (NoSuchInstance, NoSuchObject)):
+            raise PDUSNMPException(f"Outlet no. {number} doesn't exist - no instance for {oid}")
+        return self._status_to_state(value)
+
+    def get_outlet_states(self, *, cache_ttl: float = 0) -> Dict[int, PDUStates]:
+        """
+        Read current power state of all outlets of PDU using GETBULK.
+
+        :param cache_ttl: Maximal age in seconds of previously read states to be returned without reading them again,
+        cache is dropped by every outlet state change requested via this object.
+        :return: Power state for each outlet number
+        :raises PDUConfigurationException: if there is a misconfiguration or timeout eg. wrong IP selected
+        :raises PDUSNMPException: if there is an error returned from remote PDU via SNMP
+        :raises PowerManagementException: when vendor has no status OID
+        """
+        if self._is_outlet_states_cache_valid(cache_ttl):
+            return dict(self._outlet_states)
+        return self.snmp_client.run(self.async_get_outlet_states(cache_ttl=cache_ttl))
+
+    async def async_get_outlet_states(self, *, cache_ttl: float = 0) -> Dict[int, PDUStates]:
+        """
+        Read current power state of all outlets of PDU using GETBULK, awaitable in running event loop.
+
+        :param cache_ttl: Maximal age in seconds of previously read states to be returned without reading them again,
+        cache is dropped by every outlet state change requested via this object.
+        :return: Power state for each outlet number
+        :raises PDUConfigurationException: if there is a misconfiguration or timeout eg. wrong IP selected
+        :raises PDUSNMPException: if there is an error returned from remote PDU via SNMP
+        :raises PowerManagementException: when vendor has no status OID
+        """
+        if self._is_outlet_states_cache_valid(cache_ttl):
+            return dict(self._outlet_states)
+        values = await self.snmp_client.async_bulk_walk(self._get_outlet_status_oid())
+        states = {index[-1]: self._status_to_state(value) for index, value in values.items()}
+        self._outlet_states = states
+        self._outlet_states_timestamp = time.monotonic()
+        return dict(states)
+
+    def get_outlet_metering(self) -> Dict[int, PDUTelemetrySample]:
+        """
+        Read current, power and energy of all outlets of PDU using GETBULK.
+
+        :return: Load reading for each outlet number
+        :raises PDUConfigurationException: if there is a misconfiguration or timeout eg. wrong IP selected
+        :raises PDUSNMPException: if there is an error returned from remote PDU via SNMP
+        :raises PowerManagementException: when vendor has no metering OIDs
+        """
+        return self.snmp_client.run(self.async_get_outlet_metering())
+
+    async def async_get_outlet_metering(self) -> Dict[int, PDUTelemetrySample]:
+        """
+        Read current, power and energy of all outlets of PDU using GETBULK, awaitable in running event loop.
+
+        Each distinct metering column is walked once, even if it holds more than one measurement.
+
+        :return: Load reading for each outlet number
+        :raises PDUConfigurationException: if there is a misconfiguration or timeout eg. wrong IP selected
+        :raises PDUSNMPException: if there is an error returned from remote PDU via SNMP
+        :raises PowerManagementException: when vendor has no metering OIDs
+        """
+        if not self.OUTLET_METERING:
+            raise PowerManagementException(f"Outlet metering is not supported for {self.__class__.__name__}")
+        columns = {}
+        for _, oid, _, _ in self.OUTLET_METERING:
+            if oid not in columns:
+                columns[oid] = await self.snmp_client.async_bulk_walk(oid)
+        timestamp = time.time()
+        readings: Dict[int, Dict[str, float]] = {}
+        for measurement, oid, suffix, scale in self.OUTLET_METERING:
+            for index, value in columns[oid].items():
+                if index[1:] == suffix:
+                    readings.setdefault(index[0], {})[measurement] = float(int(value) * scale)
+        return {
+            outlet_number: PDUTelemetrySample(
+                timestamp=timestamp,
+                current=values.get("current", math.nan),
+                power=values.get("power", math.nan),
+                energy=values.get("energy", math.nan),
+            )
+            for outlet_number, values in sorted(readings.items())
+        }
+
+    def _is_outlet_states_cache_valid(self, cache_ttl: float) -> bool:
+        """
+        Check whether cached outlet states are younger than given time.
+
+        :param cache_ttl: Maximal age of cached states in seconds
+        :return: True if cached states can be used, False otherwise
+        """
+        return (
+            cache_ttl > 0
+            and self._outlet_states is not None
+            and time.monotonic() - self._outlet_states_timestamp < cache_ttl
+        )
+
+    def _get_outlet_status_oid(self) -> str:
+        """
+        Get OID of outlet status column.
+
+        :return: OID of outlet status
+        :raises PowerManagementException: when vendor has no status OID
+        """
+        if self.OUTLET_STATUS is None:
+            raise PowerManagementException(f"Reading of outlet state is not supported for {self.__class__.__name__}")
+        return self.OUTLET_STATUS
+
+    def _status_to_state(self, value: object) -> PDUStates:
+        """
+        Convert value of outlet status OID into power state.
+
+        :param value: Value read from outlet status OID
+        :return: PDUStates.on or PDUStates.off
+        :raises PDUSNMPException: when value is not known status
+        """
+        statuses = {self.ON_STATUS: PDUStates.on, self.OFF_STATUS: PDUStates.off}
+        try:
+            return statuses[str(int(value))]
+        except (KeyError, ValueError, TypeError):
+            raise PDUSNMPException(f"Unknown outlet status value: {value}")
+
+    def _get_outlet_number(self, outlet_number: Optional[int]) -> int:
+        """
+        Get outlet number to be controlled.
+
+        :param outlet_number: Number of electrical socket passed to method, has priority over value from object
+        :return: Outlet number
+        :raises PowerManagementException: when not passed outlet number
+        """
         number = self._outlet_number if self._outlet_number is not None else None
         number = outlet_number if outlet_number is not None else number
 
         if number is None:
             raise PowerManagementException("Missing outlet number value, not passed in constructor or method parameter")
-
-        self._set_oid(oid=self.OUTLET_CONTROL, instance_number=number, value=getattr(self, f"{state.value}_COMMAND"))
+        return number
 
     async def set_transport_target(self, ip: str, udp_port: int) -> None:
         """
-        Update UDP transport target for SNMP connection.
+        Point PDU object at another SNMP agent.
+
+        Deprecated, transport target is created and reused by SNMP client of the PDU,
+        create new PDU object for another device instead. Client owned by PDU is closed
+        and created again for new address by next command. Closing waits for private event loop of the client,
+        so it runs in worker thread, not in running event loop.
 
         :param ip: IP address of the PDU device
         :param udp_port: UDP port for SNMP connection
-        :return: UdpTransportTarget object for SNMP connection
+        :raises PowerManagementException: when PDU uses SNMP client passed to constructor
         """
-        target = await UdpTransportTarget.create((ip, udp_port))
-        self._transport_target = target
+        warnings.warn(
+            "PDU.set_transport_target is deprecated, create PDU object for the device instead",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        if not self._owns_snmp_client:
+            raise PowerManagementException("Transport target of SNMP client passed to PDU can't be changed")
+        client, self._snmp_client = self._snmp_client, None
+        self._ip = ip
+        self._udp_port = udp_port
+        if client is not None:
+            await asyncio.to_thread(client.close)
 
     def _set_oid(self, *, oid: str, instance_number: int = 0, value: str = "0") -> None:
         """
@@ -135,30 +612,111 @@ class PDU(PowerManagement, ABC):
         :raises PDUConfigurationException: if there is a misconfiguration or timeout eg. wrong IP selected
         :raises PDUSNMPException: if there is an error returned from remote PDU via SNMP eg. wrong value set
         """
-        command = ObjectIdentity(f"{oid}.{instance_number}")
+        self.snmp_client.run(self._async_set_oid(oid=oid, instance_number=instance_number, value=value))
 
-        asyncio.run(self.set_transport_target(self._ip, self._udp_port))
-        result = asyncio.run(
-            set_cmd(
-                SnmpEngine(),
-                CommunityData(self._community_string),
-                self._transport_target,
-                ContextData(),
-                ObjectType(command, Integer32(int(value))),
-            )
-        )
+    async def _async_set_oid(self, *, oid: str, instance_number: int = 0, value: str = "0") -> None:
+        """
+        Set OID for remote device by awaiting PySNMP set_cmd coroutine. Waits for execution.
+
+        :param oid: SNMP Object Identifier representing single controllable entity in MIB base
+        :param instance_number: Number of instance for specific OID object to be set, eg. outlet number
+        :param value: Value to be set for specific OID representing operation to be performed eg. power on.
+        :raises PDUConfigurationException: if there is a misconfiguration or timeout eg. wrong IP selected
+        :raises PDUSNMPException: if there is an error returned from remote PDU via SNMP eg. wrong value set
+        :raises PowerManagementException: if outlet didn't reach requested state within completion timeout
+        """
+        command = f"{oid}.{instance_number}"
+
+        result = await self.snmp_client.async_set(compile_var_bind(command, int(value)))
         error_indication, error_status, error_index, var_binds = result
         if error_indication:
             raise PDUConfigurationException(f"{error_indication} - check your configuration and network connection")
         elif error_status:
-            raise PDUSNMPException(f"{error_status} error occurred for {var_binds[error_index - 1]}")
+            raise PDUSNMPException(f"{error_status} error occurred for {command} = {value}")
         else:
-            cool_down_time = 2
-            logger.log(
-                level=log_levels.MODULE_DEBUG,
-                msg=f"Command '{var_binds[0]}' received successfully. Waiting for execution {cool_down_time} seconds.",
-            )
-            time.sleep(cool_down_time)
+            logger.log(level=log_levels.MODULE_DEBUG, msg=f"Command '{command} = {value}' received successfully.")
+            state = self._command_to_state(value) if oid == self.OUTLET_CONTROL else None
+            if state is None:
+                self._outlet_states = None
+                await self._async_cool_down()
+                return
+            if await self._async_wait_for_execution({instance_number: state}):
+                raise PowerManagementException(
+                    f"Outlet no. {instance_number} didn't reach {state.name} state "
+                    f"within {self._completion_timeout} seconds"
+                )
+
+    def _command_to_state(self, value: str) -> Optional[PDUStates]:
+        """
+        Convert value of outlet control OID into power state.
+
+        :param value: Value set for outlet control OID
+        :return: Requested power state, None if value is not known command
+        """
+        commands = {
+            self.ON_COMMAND: PDUStates.on,
+            self.OFF_COMMAND: PDUStates.off,
+            self.CYCLE_COMMAND: PDUStates.cycle,
+        }
+        return commands.get(str(value))
+
+    async def _async_cool_down(self) -> None:
+        """Wait fixed time for execution of command."""
+        logger.log(
+            level=log_levels.MODULE_DEBUG,
+            msg=f"Waiting for execution {self.COOL_DOWN_TIME} seconds.",
+        )
+        await asyncio.sleep(self.COOL_DOWN_TIME)
+
+    async def _async_wait_for_execution(self, states: Dict[int, PDUStates]) -> List[int]:
+        """
+        Wait until outlets reach requested states.
+
+        Outlet status is polled with growing intervals until requested state is seen or completion timeout passes.
+        Power cycle is considered executed, when outlet is seen powered off, it's powered on later by PDU after
+        cycle delay configured on the device.
+        Fixed cool-down is used instead of polling in cool-down completion mode and for vendors without status OID.
+
+        :param states: Requested power state for each outlet number
+        :return: Outlet numbers, which didn't reach requested state before timeout
+        """
+        self._outlet_states = None
+        if self._completion_mode is PDUCompletionMode.cool_down or self.OUTLET_STATUS is None:
+            await self._async_cool_down()
+            return []
+
+        pending = {
+            outlet_number: PDUStates.off if state is PDUStates.cycle else state
+            for outlet_number, state in states.items()
+        }
+        start_time = time.monotonic()
+        deadline = start_time + self._completion_timeout
+        interval = self.POLL_INITIAL_INTERVAL
+        while pending:
+            await asyncio.sleep(min(interval, max(deadline - time.monotonic(), 0)))
+            interval = min(interval * self.POLL_BACKOFF_FACTOR, self.POLL_MAX_INTERVAL)
+            if len(pending) == 1:
+                outlet_number = next(iter(pending))
+                current_states = {outlet_number: await self.async_get_state(outlet_number=outlet_number)}
+            else:
+                current_states = await self.async_get_outlet_states()
+            pending = {
+                outlet_number: state
+                for outlet_number, state in pending.items()
+                if current_states.get(outlet_number) is not state
+            }
+            if pending and time.monotonic() >= deadline:
+                logger.log(
+                    level=log_levels.MODULE_DEBUG,
+                    msg=f"Outlets {sorted(pending)} didn't reach requested state within {self._completion_timeout} "
+                    f"seconds.",
+                )
+                return sorted(pending)
+        logger.log(
+            level=log_levels.MODULE_DEBUG,
+            msg=f"Outlets {sorted(states)} reached requested state in {time.monotonic() - start_time:.2f} seconds.",
+        )
+        return []
 
 
 class APC(PDU):
@@ -168,6 +726,15 @@ class APC(PDU):
     OFF_COMMAND = "2"
     ON_COMMAND = "1"
     CYCLE_COMMAND = "3"
+    OUTLET_STATUS = "1.3.6.1.4.1.318.1.1.12.3.5.1.1.4"
+    OFF_STATUS = "2"
+    ON_STATUS = "1"
+    # rPDU2OutletMeteredStatusCurrent (tenths of A), Power (W) and Energy (tenths of kWh)
+    OUTLET_METERING = (
+        ("current", "1.3.6.1.4.1.318.1.1.26.9.4.3.1.6", (), 0.1),
+        ("power", "1.3.6.1.4.1.318.1.1.26.9.4.3.1.7", (), 1),
+        ("energy", "1.3.6.1.4.1.318.1.1.26.9.4.3.1.11", (), 0.1),
+    )
 
 
 class Raritan(PDU):
@@ -177,3 +744,245 @@ class Raritan(PDU):
     OFF_COMMAND = "0"
     ON_COMMAND = "1"
     CYCLE_COMMAND = "2"
+    OUTLET_STATUS = "1.3.6.1.4.1.13742.6.4.1.2.1.3.1"
+    OFF_STATUS = "8"
+    ON_STATUS = "7"
+    # measurementsOutletSensorValue of PDU 1, indexed by outlet and sensor type: rmsCurrent (mA),
+    # activePower (W) and activeEnergy (Wh), for default sensor decimal digits
+    OUTLET_METERING = (
+        ("current", "1.3.6.1.4.1.13742.6.5.4.3.1.4.1", (1,), 0.001),
+        ("power", "1.3.6.1.4.1.13742.6.5.4.3.1.4.1", (5,), 1),
+        ("energy", "1.3.6.1.4.1.13742.6.5.4.3.1.4.1", (8,), 0.001),
+    )
+
+
+class TelemetryRingBuffer:
+    """
+    Fixed-size buffer of outlet load samples, oldest samples are overwritten when it's full.
+
+    Samples are stored in preallocated arrays of doubles, so memory stays bounded for any run length
+    and arrays returned by :meth:`as_arrays` can be wrapped without copy, eg. by `numpy.frombuffer`.
+    Buffer can be read while sampler thread appends to it.
+    """
+
+    FIELDS = PDUTelemetrySample._fields
+
+    def __init__(self, capacity: int) -> None:
+        """
+        Init of TelemetryRingBuffer.
+
+        :param capacity: Maximal number of stored samples.
+        """
+        if capacity < 1:
+            raise ValueError("Capacity of telemetry buffer must be a positive number")
+        self.capacity = capacity
+        self._columns = {field: array("d", bytes(8 * capacity)) for field in self.FIELDS}
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Get number of stored samples."""
+        return min(self._total, self.capacity)
+
+    @property
+    def total(self) -> int:
+        """Number of samples appended since creation, including overwritten ones."""
+        return self._total
+
+    def append(self, sample: PDUTelemetrySample) -> None:
+        """
+        Store sample, overwrite the oldest one if buffer is full.
+
+        :param sample: Load reading of outlet
+        """
+        with self._lock:
+            position = self._total % self.capacity
+            for field, value in zip(self.FIELDS, sample):
+                self._columns[field][position] = value
+            self._total += 1
+
+    def samples_since(self, sequence: int) -> List[PDUTelemetrySample]:
+        """
+        Get samples appended after given sequence number, oldest first.
+
+        :param sequence: Value of :attr:`total` seen previously, samples already overwritten are skipped
+        :return: Stored samples newer than sequence number
+        """
+        with self._lock:
+            start = max(sequence, self._total - self.capacity)
+            return [
+                PDUTelemetrySample(*(self._columns[field][index % self.capacity] for field in self.FIELDS))
+                for index in range(start, self._total)
+            ]
+
+    def __iter__(self) -> Iterator[PDUTelemetrySample]:
+        """Iterate over stored samples, oldest first."""
+        return iter(self.samples_since(0))
+
+    def as_arrays(self) -> Dict[str, array]:
+        """
+        Get stored samples as array of doubles per field, in chronological order.
+
+        :return: Array for each of timestamp, current, power and energy
+        """
+        with self._lock:
+            length = len(self)
+            start = self._total % self.capacity if self._total > self.capacity else 0
+            return {field: column[start:length] + column[:start] for field, column in self._columns.items()}
+
+
+class PDUTelemetrySampler:
+    """
+    Periodic sampler of outlet load of PDU.
+
+    Metering columns are read with GETBULK at fixed rate in background thread, each outlet has own ring buffer.
+
+    Usage example:
+    >>> with PDUTelemetrySampler(APC(ip='10.10.10.10'), interval=0.5, capacity=7200) as sampler:
+    >>>     for sample in sampler.stream(outlet_number=3):
+    >>>         if sample.power > 300:
+    >>>             break
+    >>> numpy.frombuffer(sampler.buffers[3].as_arrays()["power"])
+    """
+
+    def __init__(
+        self,
+        pdu: PDU,
+        *,
+        interval: float = 1,
+        capacity: int = 3600,
+        outlets: Optional[Iterable[int]] = None,
+    ) -> None:
+        """
+        Init of PDUTelemetrySampler.
+
+        :param pdu: PDU to be sampled
+        :param interval: Time in seconds between samples
+        :param capacity: Maximal number of samples kept per outlet
+        :param outlets: Outlet numbers to be sampled, all metered outlets when not passed
+        """
+        self.pdu = pdu
+        self.interval = interval
+        self.capacity = capacity
+        self.buffers: Dict[int, TelemetryRingBuffer] = {}
+        self.last_error: Optional[Exception] = None
+        self._outlets = set(outlets) if outlets is not None else None
+        self._condition = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "PDUTelemetrySampler":
+        """Start sampling."""
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        __exc_type: Type[BaseException] | None,
+        __exc_value: BaseException | None,
+        __traceback: TracebackType | None,
+    ) -> None:
+        """Stop sampling."""
+        self.stop()
+
+    @property
+    def running(self) -> bool:
+        """Whether background sampling is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def sample(self) -> Dict[int, PDUTelemetrySample]:
+        """
+        Read load of outlets once and store it in buffers.
+
+        :return: Load reading for each sampled outlet number
+        :raises PDUConfigurationException: if there is a misconfiguration or timeout eg. wrong IP selected
+        :raises PDUSNMPException: if there is an error returned from remote PDU via SNMP
+        """
+        return self._store(self.pdu.get_outlet_metering())
+
+    async def async_sample(self) -> Dict[int, PDUTelemetrySample]:
+        """
+        Read load of outlets once and store it in buffers, awaitable in running event loop.
+
+        :return: Load reading for each sampled outlet number
+        :raises PDUConfigurationException: if there is a misconfiguration or timeout eg. wrong IP selected
+        :raises PDUSNMPException: if there is an error returned from remote PDU via SNMP
+        """
+        return self._store(await self.pdu.async_get_outlet_metering())
+
+    def _store(self, readings: Dict[int, PDUTelemetrySample]) -> Dict[int, PDUTelemetrySample]:
+        """
+        Append readings of sampled outlets to their buffers and wake up streams.
+
+        :param readings: Load reading for each outlet number
+        :return: Readings of sampled outlets
+        """
+        if self._outlets is not None:
+            readings = {number: sample for number, sample in readings.items() if number in self._outlets}
+        with self._condition:
+            for outlet_number, sample in readings.items():
+                buffer = self.buffers.get(outlet_number)
+                if buffer is None:
+                    buffer = self.buffers[outlet_number] = TelemetryRingBuffer(self.capacity)
+                buffer.append(sample)
+            self._condition.notify_all()
+        return readings
+
+    def start(self) -> None:
+        """Start sampling in background thread."""
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=f"telemetry-{self.pdu._ip}", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop background sampling and wait for its thread."""
+        self._stop_event.set()
+        with self._condition:
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        """Sample at fixed rate until stopped, ticks missed by slow reads are skipped."""
+        next_time = time.monotonic()
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    self.sample()
+                except PowerManagementException as e:
+                    self.last_error = e
+                    logger.log(level=log_levels.MODULE_DEBUG, msg=f"Telemetry sample of {self.pdu._ip} failed: {e}")
+                now = time.monotonic()
+                next_time += max(1, math.ceil((now - next_time) / self.interval)) * self.interval
+                self._stop_event.wait(next_time - now)
+        finally:
+            # wake up streams, so they end when thread dies
+            with self._condition:
+                self._condition.notify_all()
+
+    def stream(self, *, outlet_number: int, timeout: Optional[float] = None) -> Iterator[PDUTelemetrySample]:
+        """
+        Iterate over new samples of outlet as they are taken, until sampling is stopped.
+
+        Samples overwritten in buffer before being consumed are skipped.
+        Iteration ends right away when background sampling is not running, e.g. sampler wasn't started.
+
+        :param outlet_number: Number of outlet
+        :param timeout: Maximal time in seconds to wait for next sample, iteration ends when exceeded
+        :return: Iterator of samples
+        """
+        buffer = self.buffers.get(outlet_number)
+        sequence = buffer.total if buffer is not None else 0
+        while True:
+            with self._condition:
+                buffer = self.buffers.get(outlet_number)
+                if buffer is None or buffer.total == sequence:
+                    if self._stop_event.is_set() or not self.running or not self._condition.wait(timeout):
+                        return
+                    continue
+                samples = buffer.samples_since(sequence)
+                sequence = buffer.total
+            yield from samples
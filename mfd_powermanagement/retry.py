@@ -0,0 +1,128 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: MIT
+"""Module for retry policy of IPMI commands."""
+
+import random
+import re
+from dataclasses import dataclass
+from enum import Enum
+from typing import Iterable, Optional
+
+# Failures, which will not succeed on retry: wrong credentials, missing privilege, unsupported command
+FATAL_PATTERNS = (
+    r"unauthorized name",
+    r"HMAC is invalid",
+    r"invalid (user ?name|password|role)",
+    r"authentication (of user \S+ )?failed",
+    r"insufficient privilege",
+    r"invalid (command|chassis power command)",
+    r"not supported",
+    r"command not found",
+    r"not available in OS",
+    r"completion code 0x(c1|c9|cc|d4|d5)",
+)
+# Failures of BMC, which is alive but temporarily can't serve request
+BUSY_PATTERNS = (
+    r"node busy",
+    r"\bbusy\b",
+    r"in progress",
+    r"insufficient resources",
+    r"out of space",
+    r"completion code 0x(c0|c4|d2)",
+)
+
+
+class IpmiFailureKind(Enum):
+    """Class of failed IPMI command, which determines whether and when it is retried."""
+
+    fatal = "fatal"
+    transient = "transient"
+    busy = "busy"
+
+
+@dataclass
+class IpmiAttempt:
+    """Single attempt of IPMI command."""
+
+    attempt: int
+    success: bool
+    elapsed: float
+    output: str
+    kind: Optional[IpmiFailureKind] = None
+    delay: float = 0
+
+
+class IpmiRetryPolicy:
+    """
+    Retry policy classifying output of failed IPMI command and computing delay before next attempt.
+
+    Fatal failures are not retried. Transient failures (timeouts, lost session) are retried with exponential backoff
+    and jitter, so many clients don't retry in lockstep. Busy BMC is retried after short constant delay,
+    because it recovers quickly and exponential backoff would only add latency.
+    Subclass and override :meth:`classify` or :meth:`get_delay` to change behavior.
+
+    Usage example:
+    >>> policy = IpmiRetryPolicy(base_delay=1, max_delay=30, fatal_patterns=[r"my BMC says no"])
+    >>> ipmi = Ipmi(ip="10.10.10.10", username="admin", password="*****", retry_policy=policy)
+    """
+
+    def __init__(
+        self,
+        *,
+        base_delay: float = 0.5,
+        max_delay: float = 8,
+        busy_delay: float = 0.5,
+        jitter: float = 0.5,
+        fatal_patterns: Iterable[str] = (),
+        busy_patterns: Iterable[str] = (),
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        Init of IpmiRetryPolicy.
+
+        :param base_delay: Delay in seconds after first transient failure, doubled after each next one
+        :param max_delay: Maximal delay in seconds after transient failure
+        :param busy_delay: Delay in seconds after busy failure
+        :param jitter: Part of delay, which is randomized, between 0 and 1
+        :param fatal_patterns: Regular expressions of fatal failures, in addition to default ones
+        :param busy_patterns: Regular expressions of busy failures, in addition to default ones
+        :param seed: Seed of random generator used for jitter
+        """
+        if not 0 <= jitter <= 1:
+            raise ValueError("Jitter must be between 0 and 1")
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.busy_delay = busy_delay
+        self.jitter = jitter
+        self._fatal = re.compile("|".join((*FATAL_PATTERNS, *fatal_patterns)), re.IGNORECASE)
+        self._busy = re.compile("|".join((*BUSY_PATTERNS, *busy_patterns)), re.IGNORECASE)
+        self._random = random.Random(seed)
+
+    def classify(self, output: str) -> IpmiFailureKind:
+        """
+        Classify output of failed command.
+
+        :param output: Output of command or error message
+        :return: Kind of failure, unknown failures are transient
+        """
+        if self._fatal.search(output):
+            return IpmiFailureKind.fatal
+        if self._busy.search(output):
+            return IpmiFailureKind.busy
+        return IpmiFailureKind.transient
+
+    def get_delay(self, attempt: int, kind: IpmiFailureKind) -> float:
+        """
+        Compute delay before next attempt.
+
+        :param attempt: Number of failed attempt, starting from 1
+        :param kind: Kind of failure
+        :return: Delay in seconds
+        """
+        if kind is IpmiFailureKind.fatal:
+            return 0
+        if kind is IpmiFailureKind.busy:
+            delay = self.busy_delay
+        else:
+            delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return delay * (1 - self.jitter * self._random.random())
@@ -0,0 +1,611 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: MIT
+"""Module for native IPMI v2.0 RMCP+ (lanplus) client."""
+
+import hashlib
+import hmac
+import logging
+import os
+import socket
+import struct
+import threading
+import time
+from types import TracebackType
+from typing import Callable, ClassVar, Dict, Optional, Tuple, Type, Union
+
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from mfd_common_libs import add_logging_level, log_levels
+
+from .exceptions import IpmiSessionException
+
+logger = logging.getLogger(__name__)
+add_logging_level("MODULE_DEBUG", log_levels.MODULE_DEBUG)
+
+IPMI_PORT = 623
+# RMCP header: version 6, reserved, sequence number 0xFF (no RMCP ACK), class IPMI
+RMCP_HEADER = b"\x06\x00\xff\x07"
+AUTH_TYPE_NONE = 0x00
+AUTH_TYPE_RMCP_PLUS = 0x06
+# Payload types, IPMI v2.0 table 13-16
+PAYLOAD_IPMI = 0x00
+PAYLOAD_OPEN_SESSION_REQUEST = 0x10
+PAYLOAD_OPEN_SESSION_RESPONSE = 0x11
+PAYLOAD_RAKP_1 = 0x12
+PAYLOAD_RAKP_2 = 0x13
+PAYLOAD_RAKP_3 = 0x14
+PAYLOAD_RAKP_4 = 0x15
+PAYLOAD_ENCRYPTED = 0x80
+PAYLOAD_AUTHENTICATED = 0x40
+# Cipher suite 3: RAKP-HMAC-SHA1, HMAC-SHA1-96 integrity, AES-CBC-128 confidentiality
+AUTH_RAKP_HMAC_SHA1 = 0x01
+INTEGRITY_HMAC_SHA1_96 = 0x01
+CONFIDENTIALITY_AES_CBC_128 = 0x01
+INTEGRITY_CHECK_SIZE = 12
+AES_BLOCK_SIZE = 16
+PRIVILEGE_ADMINISTRATOR = 0x04
+# Bit of requested role in RAKP 1, user is looked up by name only
+NAME_ONLY_LOOKUP = 0x10
+BMC_ADDRESS = 0x20
+REMOTE_CONSOLE_ADDRESS = 0x81
+# Network functions and commands
+NETFN_CHASSIS = 0x00
+NETFN_SENSOR = 0x04
+NETFN_APP = 0x06
+CMD_GET_CHASSIS_STATUS = 0x01
+CMD_CHASSIS_CONTROL = 0x02
+CMD_GET_SENSOR_READING = 0x2D
+CMD_GET_CHANNEL_AUTH_CAPABILITIES = 0x38
+CMD_SET_SESSION_PRIVILEGE = 0x3B
+CMD_CLOSE_SESSION = 0x3C
+# Get Channel Authentication Capabilities for current channel, with IPMI v2.0 extended data
+CURRENT_CHANNEL_V2 = 0x8E
+# Reading of sensor is unavailable, bit of second byte of Get Sensor Reading response
+READING_UNAVAILABLE = 0x20
+# BMC closes inactive session after 60 seconds by default, session is reopened after shorter idle time
+SESSION_IDLE_TIMEOUT = 50
+
+
+def _checksum(data: bytes) -> int:
+    """
+    Compute two's complement checksum of IPMI message part.
+
+    :param data: Checksummed bytes
+    :return: Checksum byte
+    """
+    return -sum(data) & 0xFF
+
+
+def build_ipmi_message(
+    netfn: int, command: int, data: bytes, sequence: int, *, requester: int = REMOTE_CONSOLE_ADDRESS
+) -> bytes:
+    """
+    Build IPMI request message addressed to BMC.
+
+    :param netfn: Network function
+    :param command: Command code
+    :param data: Request data
+    :param sequence: 6-bit requester sequence number
+    :param requester: Software ID of requester
+    :return: Encoded message
+    """
+    header = bytes([BMC_ADDRESS, netfn << 2])
+    body = bytes([requester, (sequence & 0x3F) << 2, command]) + data
+    return header + bytes([_checksum(header)]) + body + bytes([_checksum(body)])
+
+
+def parse_ipmi_message(message: bytes) -> Tuple[int, int, int, bytes]:
+    """
+    Parse IPMI message.
+
+    :param message: Encoded message
+    :return: Network function, 6-bit sequence number, command code and data (completion code first for responses)
+    :raises IpmiSessionException: when message is truncated or checksum doesn't match
+    """
+    if len(message) < 7 or _checksum(message[:2]) != message[2] or _checksum(message[3:-1]) != message[-1]:
+        raise IpmiSessionException(f"Malformed IPMI message: {message.hex()}")
+    return message[1] >> 2, message[4] >> 2, message[5], message[6:-1]
+
+
+def hmac_sha1(key: bytes, data: bytes) -> bytes:
+    """
+    Compute HMAC-SHA1 of data.
+
+    :param key: Key
+    :param data: Authenticated data
+    :return: 20-byte digest
+    """
+    return hmac.new(key, data, hashlib.sha1).digest()
+
+
+def aes_cbc_encrypt(key: bytes, data: bytes, iv: Optional[bytes] = None) -> bytes:
+    """
+    Encrypt payload with AES-CBC-128 using IPMI confidentiality padding.
+
+    :param key: 16-byte key
+    :param data: Plain payload
+    :param iv: Initialization vector, random when not passed
+    :return: Initialization vector followed by encrypted payload
+    """
+    iv = os.urandom(AES_BLOCK_SIZE) if iv is None else iv
+    pad_length = -(len(data) + 1) % AES_BLOCK_SIZE
+    padded = data + bytes(range(1, pad_length + 1)) + bytes([pad_length])
+    encryptor = Cipher(algorithms.AES(key), modes.CBC(iv)).encryptor()
+    return iv + encryptor.update(padded) + encryptor.finalize()
+
+
+def aes_cbc_decrypt(key: bytes, data: bytes) -> bytes:
+    """
+    Decrypt payload encrypted with AES-CBC-128 and remove IPMI confidentiality padding.
+
+    :param key: 16-byte key
+    :param data: Initialization vector followed by encrypted payload
+    :return: Plain payload
+    :raises IpmiSessionException: when payload length or padding is invalid
+    """
+    if len(data) < 2 * AES_BLOCK_SIZE or len(data) % AES_BLOCK_SIZE:
+        raise IpmiSessionException("Invalid length of encrypted payload")
+    decryptor = Cipher(algorithms.AES(key), modes.CBC(data[:AES_BLOCK_SIZE])).decryptor()
+    padded = decryptor.update(data[AES_BLOCK_SIZE:]) + decryptor.finalize()
+    pad_length = padded[-1]
+    if pad_length >= AES_BLOCK_SIZE:
+        raise IpmiSessionException("Invalid padding of encrypted payload")
+    return padded[: -pad_length - 1]
+
+
+def build_session_packet(
+    payload_type: int,
+    payload: bytes,
+    *,
+    session_id: int = 0,
+    sequence: int = 0,
+    integrity_key: Optional[bytes] = None,
+    confidentiality_key: Optional[bytes] = None,
+) -> bytes:
+    """
+    Build RMCP+ packet.
+
+    :param payload_type: Payload type
+    :param payload: Plain payload
+    :param session_id: Session ID assigned by receiver
+    :param sequence: Session sequence number
+    :param integrity_key: Key of HMAC-SHA1-96 integrity, packet is not authenticated when not passed
+    :param confidentiality_key: Key of AES-CBC-128 confidentiality, payload is not encrypted when not passed
+    :return: Encoded packet
+    """
+    if confidentiality_key is not None:
+        payload = aes_cbc_encrypt(confidentiality_key, payload)
+        payload_type |= PAYLOAD_ENCRYPTED
+    if integrity_key is not None:
+        payload_type |= PAYLOAD_AUTHENTICATED
+    packet = struct.pack("<BBIIH", AUTH_TYPE_RMCP_PLUS, payload_type, session_id, sequence, len(payload)) + payload
+    if integrity_key is not None:
+        pad_length = -(len(packet) + 2) % 4
+        packet += b"\xff" * pad_length + bytes([pad_length, 0x07])
+        packet += hmac_sha1(integrity_key, packet)[:INTEGRITY_CHECK_SIZE]
+    return RMCP_HEADER + packet
+
+
+def parse_session_packet(
+    packet: bytes,
+    *,
+    integrity_key: Optional[bytes] = None,
+    confidentiality_key: Optional[bytes] = None,
+) -> Tuple[int, int, int, bytes]:
+    """
+    Parse RMCP+ packet, verify its integrity and decrypt payload.
+
+    :param packet: Encoded packet
+    :param integrity_key: Key of HMAC-SHA1-96 integrity, required for authenticated packets
+    :param confidentiality_key: Key of AES-CBC-128 confidentiality, required for encrypted payloads
+    :return: Payload type without encryption and authentication bits, session ID, session sequence number
+    and plain payload
+    :raises IpmiSessionException: when packet is malformed, not authentic or not protected as expected
+    """
+    if len(packet) < 16 or packet[:4] != RMCP_HEADER or packet[4] != AUTH_TYPE_RMCP_PLUS:
+        raise IpmiSessionException("Not a RMCP+ packet")
+    _, payload_type, session_id, sequence, length = struct.unpack_from("<BBIIH", packet, 4)
+    payload = packet[16:][:length]
+    if len(payload) != length:
+        raise IpmiSessionException("Truncated RMCP+ packet")
+    if payload_type & PAYLOAD_AUTHENTICATED:
+        if integrity_key is None:
+            raise IpmiSessionException("Unexpected authenticated RMCP+ packet")
+        signed, auth_code = packet[4:-INTEGRITY_CHECK_SIZE], packet[-INTEGRITY_CHECK_SIZE:]
+        if not hmac.compare_digest(hmac_sha1(integrity_key, signed)[:INTEGRITY_CHECK_SIZE], auth_code):
+            raise IpmiSessionException("Integrity check of RMCP+ packet failed")
+    elif integrity_key is not None:
+        raise IpmiSessionException("Unauthenticated RMCP+ packet in session")
+    if payload_type & PAYLOAD_ENCRYPTED:
+        if confidentiality_key is None:
+            raise IpmiSessionException("Unexpected encrypted RMCP+ payload")
+        payload = aes_cbc_decrypt(confidentiality_key, payload)
+    elif confidentiality_key is not None:
+        raise IpmiSessionException("Unencrypted RMCP+ payload in session")
+    return payload_type & 0x3F, session_id, sequence, payload
+
+
+def derive_session_keys(sik: bytes) -> Tuple[bytes, bytes]:
+    """
+    Derive integrity and confidentiality keys from Session Integrity Key.
+
+    :param sik: Session Integrity Key
+    :return: K1 used for HMAC-SHA1-96 and first 16 bytes of K2 used for AES-CBC-128
+    """
+    return hmac_sha1(sik, b"\x01" * 20), hmac_sha1(sik, b"\x02" * 20)[:AES_BLOCK_SIZE]
+
+
+class RmcpPlusSession:
+    """
+    Authenticated IPMI v2.0 session with BMC over RMCP+ (same as `ipmitool -I lanplus -C 3`).
+
+    Session is opened lazily on first command: RAKP handshake with HMAC-SHA1 authentication,
+    HMAC-SHA1-96 integrity and AES-CBC-128 confidentiality, then privilege is raised to administrator.
+    Subsequent commands reuse the session, so each of them costs a single UDP round trip.
+    Session is reopened transparently after idle time or when BMC stops responding in it.
+
+    Usage example:
+    >>> with RmcpPlusSession("10.10.10.10", "admin", "*****") as session:
+    >>>     session.chassis_control(1)
+    >>>     session.get_chassis_status()
+    True
+    """
+
+    _shared_sessions: ClassVar[Dict[Tuple[str, int, str, str], "RmcpPlusSession"]] = {}
+    _shared_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(
+        self,
+        host: str,
+        username: str,
+        password: str,
+        *,
+        port: int = IPMI_PORT,
+        timeout: float = 1,
+        retries: int = 3,
+        privilege: int = PRIVILEGE_ADMINISTRATOR,
+    ) -> None:
+        """
+        Init of RmcpPlusSession.
+
+        :param host: Hostname or IP address of BMC
+        :param username: User to authentication
+        :param password: Password of user
+        :param port: UDP port of BMC
+        :param timeout: Time in seconds to wait for single response
+        :param retries: Number of retransmissions of request without response
+        :param privilege: Privilege level of session
+        """
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.retries = retries
+        self.privilege = privilege
+        self._username = username.encode()
+        self._password = password.encode()[:20].ljust(20, b"\x00")
+        self._lock = threading.Lock()
+        self._socket: Optional[socket.socket] = None
+        self._address: Optional[Tuple[str, int]] = None
+        self._console_session_id = 0
+        self._bmc_session_id = 0
+        self._sequence = 0
+        self._request_sequence = 0
+        self._integrity_key: Optional[bytes] = None
+        self._confidentiality_key: Optional[bytes] = None
+        self._last_activity = 0.0
+        self._shared_key: Optional[Tuple[str, int, str, str]] = None
+        self._references = 0
+
+    @classmethod
+    def shared(cls, host: str, username: str, password: str, *, port: int = IPMI_PORT) -> "RmcpPlusSession":
+        """
+        Get process-wide session with given BMC, create it if not existing.
+
+        Every call increases reference counter of the session, shared session is closed
+        when :meth:`close` was called for each acquired reference.
+
+        :param host: Hostname or IP address of BMC
+        :param username: User to authentication
+        :param password: Password of user
+        :param port: UDP port of BMC
+        :return: Shared RmcpPlusSession object
+        """
+        key = (host, port, username, password)
+        with cls._shared_lock:
+            session = cls._shared_sessions.get(key)
+            if session is None:
+                session = cls(host, username, password, port=port)
+                session._shared_key = key
+                cls._shared_sessions[key] = session
+            session._references += 1
+            return session
+
+    def __enter__(self) -> "RmcpPlusSession":
+        """Enter context of session."""
+        return self
+
+    def __exit__(
+        self,
+        __exc_type: Type[BaseException] | None,
+        __exc_value: BaseException | None,
+        __traceback: TracebackType | None,
+    ) -> None:
+        """Close session."""
+        self.close()
+
+    @property
+    def active(self) -> bool:
+        """Whether session is established."""
+        return self._integrity_key is not None
+
+    def close(self) -> None:
+        """Close session on BMC and release socket."""
+        if self._shared_key is not None:
+            with self._shared_lock:
+                self._references -= 1
+                if self._references > 0:
+                    return
+                self._shared_sessions.pop(self._shared_key, None)
+
+        with self._lock:
+            if self.active:
+                try:
+                    self._command(NETFN_APP, CMD_CLOSE_SESSION, struct.pack("<I", self._bmc_session_id), retries=0)
+                except IpmiSessionException as e:
+                    logger.log(level=log_levels.MODULE_DEBUG, msg=f"Closing IPMI session failed: {e}")
+            self._reset()
+
+    def _reset(self) -> None:
+        """Forget session state and close socket."""
+        self._integrity_key = None
+        self._confidentiality_key = None
+        self._bmc_session_id = 0
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def _exchange(
+        self, packet: Union[bytes, Callable[[], bytes]], accept: Callable[[bytes], Optional[bytes]], retries: int
+    ) -> bytes:
+        """
+        Send packet and wait for matching response, retransmit on timeout.
+
+        :param packet: Packet to send, or callable building new packet for each transmission
+        :param accept: Callable returning parsed response for matching datagram, None for datagrams to be ignored
+        :param retries: Number of retransmissions
+        :return: Parsed response
+        :raises IpmiSessionException: when BMC doesn't respond
+        """
+        for _ in range(retries + 1):
+            self._socket.sendto(packet() if callable(packet) else packet, self._address)
+            deadline = time.monotonic() + self.timeout
+            while (remaining := deadline - time.monotonic()) > 0:
+                self._socket.settimeout(remaining)
+                try:
+                    datagram, _ = self._socket.recvfrom(4096)
+                except socket.timeout:
+                    break
+                try:
+                    response = accept(datagram)
+                except IpmiSessionException as e:
+                    logger.log(level=log_levels.MODULE_DEBUG, msg=f"Ignoring invalid packet from BMC: {e}")
+                    continue
+                if response is not None:
+                    self._last_activity = time.monotonic()
+                    return response
+        raise IpmiSessionException(f"No response from BMC {self.host}:{self.port}")
+
+    def _open(self) -> None:
+        """
+        Establish session with BMC.
+
+        :raises IpmiSessionException: when BMC rejects session or authentication fails
+        """
+        self._reset()
+        self._address = socket.getaddrinfo(self.host, self.port, type=socket.SOCK_DGRAM)[0][4][:2]
+        self._socket = socket.socket(socket.AF_INET6 if ":" in self._address[0] else socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            self._handshake()
+        except Exception:
+            self._reset()
+            raise
+        logger.log(
+            level=log_levels.MODULE_DEBUG,
+            msg=f"Opened IPMI session 0x{self._bmc_session_id:08x} with {self.host}:{self.port}",
+        )
+
+    def _handshake(self) -> None:
+        """Perform session setup sequence: channel capabilities, Open Session, RAKP and privilege raise."""
+        self._get_channel_auth_capabilities()
+        tag = int.from_bytes(os.urandom(1), "little")
+        self._console_session_id = int.from_bytes(os.urandom(4), "little") or 1
+        self._sequence = 0
+
+        request = struct.pack("<BBHI", tag, self.privilege, 0, self._console_session_id)
+        for payload_kind, algorithm in enumerate(
+            (AUTH_RAKP_HMAC_SHA1, INTEGRITY_HMAC_SHA1_96, CONFIDENTIALITY_AES_CBC_128)
+        ):
+            request += struct.pack("<BHBB3x", payload_kind, 0, 8, algorithm)
+        response = self._exchange_payload(PAYLOAD_OPEN_SESSION_REQUEST, request, PAYLOAD_OPEN_SESSION_RESPONSE, tag)
+        if response[1]:
+            raise IpmiSessionException(f"BMC rejected session, RMCP+ status code 0x{response[1]:02x}")
+        if len(response) < 36 or struct.unpack_from("<I", response, 4)[0] != self._console_session_id:
+            raise IpmiSessionException("Invalid Open Session response")
+        self._bmc_session_id = struct.unpack_from("<I", response, 8)[0]
+
+        console_random = os.urandom(16)
+        role = self.privilege | NAME_ONLY_LOOKUP
+        user = bytes([role, len(self._username)]) + self._username
+        request = struct.pack("<B3xI", tag, self._bmc_session_id) + console_random
+        request += bytes([role, 0, 0, len(self._username)]) + self._username
+        response = self._exchange_payload(PAYLOAD_RAKP_1, request, PAYLOAD_RAKP_2, tag)
+        if response[1]:
+            raise IpmiSessionException(f"BMC rejected RAKP 1, RMCP+ status code 0x{response[1]:02x}")
+        if len(response) < 60:
+            raise IpmiSessionException("Invalid RAKP 2 message")
+        bmc_random, bmc_guid, key_exchange_code = response[8:24], response[24:40], response[40:60]
+        session_ids = struct.pack("<II", self._console_session_id, self._bmc_session_id)
+        expected = hmac_sha1(self._password, session_ids + console_random + bmc_random + bmc_guid + user)
+        if not hmac.compare_digest(expected, key_exchange_code):
+            raise IpmiSessionException(f"Authentication of user {self._username.decode()} failed, check password")
+
+        auth_code = hmac_sha1(self._password, bmc_random + struct.pack("<I", self._console_session_id) + user)
+        request = struct.pack("<BB2xI", tag, 0, self._bmc_session_id) + auth_code
+        sik = hmac_sha1(self._password, console_random + bmc_random + user)
+        response = self._exchange_payload(PAYLOAD_RAKP_3, request, PAYLOAD_RAKP_4, tag)
+        if response[1]:
+            raise IpmiSessionException(f"BMC rejected RAKP 3, RMCP+ status code 0x{response[1]:02x}")
+        integrity_check = hmac_sha1(sik, console_random + struct.pack("<I", self._bmc_session_id) + bmc_guid)
+        if not hmac.compare_digest(integrity_check[:INTEGRITY_CHECK_SIZE], response[8:20]):
+            raise IpmiSessionException("Integrity check of RAKP 4 failed")
+
+        self._integrity_key, self._confidentiality_key = derive_session_keys(sik)
+        self._command(NETFN_APP, CMD_SET_SESSION_PRIVILEGE, bytes([self.privilege]))
+
+    def _get_channel_auth_capabilities(self) -> None:
+        """
+        Check that BMC supports IPMI v2.0, using session-less IPMI v1.5 request.
+
+        :raises IpmiSessionException: when BMC doesn't support IPMI v2.0
+        """
+        message = build_ipmi_message(
+            NETFN_APP, CMD_GET_CHANNEL_AUTH_CAPABILITIES, bytes([CURRENT_CHANNEL_V2, PRIVILEGE_ADMINISTRATOR]), 0
+        )
+        packet = RMCP_HEADER + struct.pack("<BIIB", AUTH_TYPE_NONE, 0, 0, len(message)) + message
+
+        def accept(datagram: bytes) -> Optional[bytes]:
+            if datagram[:4] != RMCP_HEADER or len(datagram) < 14 or datagram[4] != AUTH_TYPE_NONE:
+                return None
+            message_length = datagram[13]
+            _, _, command, data = parse_ipmi_message(datagram[14:][:message_length])
+            return data if command == CMD_GET_CHANNEL_AUTH_CAPABILITIES else None
+
+        data = self._exchange(packet, accept, self.retries)
+        if data[0]:
+            raise IpmiSessionException(
+                f"Get Channel Authentication Capabilities failed, completion code 0x{data[0]:02x}"
+            )
+        if len(data) < 3 or not data[2] & 0x80:
+            raise IpmiSessionException(f"BMC {self.host} doesn't support IPMI v2.0 RMCP+")
+
+    def _exchange_payload(self, payload_type: int, payload: bytes, response_type: int, tag: int) -> bytes:
+        """
+        Exchange session setup payloads.
+
+        :param payload_type: Type of request payload
+        :param payload: Request payload
+        :param response_type: Expected type of response payload
+        :param tag: Message tag matching request and response
+        :return: Response payload
+        """
+
+        def accept(datagram: bytes) -> Optional[bytes]:
+            received_type, _, _, response = parse_session_packet(datagram)
+            return response if received_type == response_type and response[:1] == bytes([tag]) else None
+
+        return self._exchange(build_session_packet(payload_type, payload), accept, self.retries)
+
+    def _command(self, netfn: int, command: int, data: bytes = b"", *, retries: Optional[int] = None) -> bytes:
+        """
+        Send IPMI command in established session.
+
+        :param netfn: Network function
+        :param command: Command code
+        :param data: Request data
+        :param retries: Number of retransmissions, default from session
+        :return: Response data without completion code
+        :raises IpmiSessionException: when BMC doesn't respond or returns error completion code
+        """
+        self._request_sequence = (self._request_sequence + 1) % 64
+        request_sequence = self._request_sequence
+        message = build_ipmi_message(netfn, command, data, request_sequence)
+
+        def packet() -> bytes:
+            self._sequence = self._sequence % 0xFFFFFFFF + 1
+            return build_session_packet(
+                PAYLOAD_IPMI,
+                message,
+                session_id=self._bmc_session_id,
+                sequence=self._sequence,
+                integrity_key=self._integrity_key,
+                confidentiality_key=self._confidentiality_key,
+            )
+
+        def accept(datagram: bytes) -> Optional[bytes]:
+            payload_type, session_id, _, payload = parse_session_packet(
+                datagram, integrity_key=self._integrity_key, confidentiality_key=self._confidentiality_key
+            )
+            if payload_type != PAYLOAD_IPMI or session_id != self._console_session_id:
+                return None
+            response_netfn, sequence, response_command, response = parse_ipmi_message(payload)
+            if (response_netfn, sequence, response_command) != (netfn | 1, request_sequence, command) or not response:
+                return None
+            return response
+
+        response = self._exchange(packet, accept, self.retries if retries is None else retries)
+        if response[0]:
+            raise IpmiSessionException(
+                f"IPMI command 0x{netfn:02x}/0x{command:02x} failed, completion code 0x{response[0]:02x}",
+                completion_code=response[0],
+            )
+        return response[1:]
+
+    def raw(self, netfn: int, command: int, data: bytes = b"") -> bytes:
+        """
+        Send IPMI command, open or reopen session when needed.
+
+        Command is resent once in new session, when BMC stops responding in current one.
+        Commands returning error completion code are not repeated.
+
+        :param netfn: Network function
+        :param command: Command code
+        :param data: Request data
+        :return: Response data without completion code
+        :raises IpmiSessionException: when session can't be established, BMC doesn't respond
+        or returns error completion code
+        """
+        with self._lock:
+            if self.active and time.monotonic() - self._last_activity > SESSION_IDLE_TIMEOUT:
+                logger.log(level=log_levels.MODULE_DEBUG, msg="IPMI session idle for too long, reopening")
+                self._reset()
+            reopened = not self.active
+            if reopened:
+                self._open()
+            try:
+                return self._command(netfn, command, data)
+            except IpmiSessionException as e:
+                if reopened or e.completion_code is not None:
+                    raise
+            logger.log(level=log_levels.MODULE_DEBUG, msg="No response in IPMI session, reopening")
+            self._open()
+            return self._command(netfn, command, data)
+
+    def chassis_control(self, control: int) -> None:
+        """
+        Send Chassis Control command.
+
+        :param control: Control code: 0 - power down, 1 - power up, 2 - power cycle, 3 - hard reset, 5 - soft off
+        :raises IpmiSessionException: when command fails
+        """
+        self.raw(NETFN_CHASSIS, CMD_CHASSIS_CONTROL, bytes([control]))
+
+    def get_chassis_status(self) -> bool:
+        """
+        Read chassis power status.
+
+        :return: True when system power is on
+        :raises IpmiSessionException: when command fails
+        """
+        return bool(self.raw(NETFN_CHASSIS, CMD_GET_CHASSIS_STATUS)[0] & 0x01)
+
+    def get_sensor_reading(self, sensor_number: int) -> Optional[int]:
+        """
+        Read raw value of sensor.
+
+        :param sensor_number: Number of sensor from SDR
+        :return: Raw reading byte, to be converted with SDR factors, None when reading is unavailable
+        :raises IpmiSessionException: when command fails
+        """
+        response = self.raw(NETFN_SENSOR, CMD_GET_SENSOR_READING, bytes([sensor_number]))
+        if len(response) > 1 and response[1] & READING_UNAVAILABLE:
+            return None
+        return response[0]
@@ -0,0 +1,7 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: MIT
+"""Module for local simulators of power management devices, for tests and benchmarks without hardware."""
+
+from .bmc import BMCSimulator
+from .dli import DLISimulator
+from .snmp_agent import PDUAgentSimulator
@@ -0,0 +1,443 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: MIT
+"""Module for local BMC simulating IPMI v2.0 RMCP+ sessions and chassis commands."""
+
+import asyncio
+import hmac
+import logging
+import os
+import random
+import struct
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Dict, List, Optional, Tuple, Type
+
+from mfd_common_libs import add_logging_level, log_levels
+
+from ..exceptions import IpmiSessionException
+from ..rmcp import (
+    AUTH_TYPE_NONE,
+    CMD_CHASSIS_CONTROL,
+    CMD_CLOSE_SESSION,
+    CMD_GET_CHANNEL_AUTH_CAPABILITIES,
+    CMD_GET_CHASSIS_STATUS,
+    CMD_GET_SENSOR_READING,
+    CMD_SET_SESSION_PRIVILEGE,
+    INTEGRITY_CHECK_SIZE,
+    NETFN_APP,
+    NETFN_CHASSIS,
+    NETFN_SENSOR,
+    PAYLOAD_IPMI,
+    PAYLOAD_OPEN_SESSION_REQUEST,
+    PAYLOAD_OPEN_SESSION_RESPONSE,
+    PAYLOAD_RAKP_1,
+    PAYLOAD_RAKP_2,
+    PAYLOAD_RAKP_3,
+    PAYLOAD_RAKP_4,
+    PRIVILEGE_ADMINISTRATOR,
+    RMCP_HEADER,
+    build_session_packet,
+    derive_session_keys,
+    hmac_sha1,
+    parse_ipmi_message,
+    parse_session_packet,
+)
+
+logger = logging.getLogger(__name__)
+add_logging_level("MODULE_DEBUG", log_levels.MODULE_DEBUG)
+
+# Completion codes, IPMI v2.0 table 5-2
+COMPLETION_OK = 0x00
+INVALID_COMMAND = 0xC1
+NOT_PRESENT = 0xCB
+INSUFFICIENT_PRIVILEGE = 0xD4
+NOT_SUPPORTED_IN_STATE = 0xD5
+# RMCP+ status codes, IPMI v2.0 table 13-15
+UNAUTHORIZED_NAME = 0x0D
+INVALID_INTEGRITY_CHECK = 0x0F
+# Chassis control codes
+POWER_DOWN = 0
+POWER_UP = 1
+POWER_CYCLE = 2
+HARD_RESET = 3
+SOFT_SHUTDOWN = 5
+# Privilege required by Chassis Control command (operator)
+OPERATOR_PRIVILEGE = 0x03
+PRIVILEGE_USER = 0x02
+
+
+@dataclass
+class _BmcSession:
+    """State of session negotiated with remote console."""
+
+    console_session_id: int
+    privilege: int
+    console_random: bytes = b""
+    bmc_random: bytes = b""
+    user: bytes = b""
+    integrity_key: Optional[bytes] = None
+    confidentiality_key: Optional[bytes] = None
+    current_privilege: int = PRIVILEGE_USER
+
+
+class _BmcProtocol(asyncio.DatagramProtocol):
+    """Datagram protocol passing RMCP packets to simulator."""
+
+    def __init__(self, simulator: "BMCSimulator") -> None:
+        self._simulator = simulator
+        self.transport: Optional[asyncio.DatagramTransport] = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        self._simulator._handle_datagram(self.transport, data, addr)
+
+
+class BMCSimulator:
+    """
+    BMC speaking IPMI v2.0 RMCP+ with cipher suite 3 on localhost UDP.
+
+    Supports session setup (Get Channel Authentication Capabilities, Open Session, RAKP 1-4), Set Session
+    Privilege Level, Close Session, Get Chassis Status, Chassis Control and Get Sensor Reading,
+    so native IPMI backend can be tested end to end without hardware.
+    Simulator runs own event loop in background thread.
+
+    Usage example:
+    >>> with BMCSimulator(username="admin", password="secret", sensors={1: 42}) as bmc:
+    >>>     ipmi = Ipmi(ip=bmc.ip, username="admin", password="secret", ipmi_type=IpmiType.RMCPPlus, port=bmc.port)
+    >>>     ipmi.power_down()
+    >>>     bmc.power_on
+    False
+    """
+
+    def __init__(
+        self,
+        *,
+        username: str = "admin",
+        password: str = "admin",
+        power_on: bool = True,
+        sensors: Optional[Dict[int, int]] = None,
+        cycle_time: float = 0.1,
+        reject_cycle_when_off: bool = False,
+        response_delay: float = 0,
+        loss: float = 0,
+        ip: str = "127.0.0.1",
+        port: int = 0,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        Init of BMCSimulator.
+
+        :param username: User accepted by BMC
+        :param password: Password of user
+        :param power_on: Initial chassis power state
+        :param sensors: Raw readings of sensors by sensor number
+        :param cycle_time: Time in seconds for which chassis stays off during power cycle
+        :param reject_cycle_when_off: Reject power cycle of chassis, which is off, like some BMCs do
+        :param response_delay: Time in seconds after which BMC responds to request
+        :param loss: Probability of dropping received packet, between 0 and 1
+        :param ip: IP address to listen on
+        :param port: UDP port to listen on, free port is chosen when 0
+        :param seed: Seed of random generator used for packet loss
+        """
+        self.username = username
+        self.password = password
+        self.power_on = power_on
+        self.sensors = dict(sensors or {})
+        self.cycle_time = cycle_time
+        self.reject_cycle_when_off = reject_cycle_when_off
+        self.response_delay = response_delay
+        self.loss = loss
+        self.ip = ip
+        self.port = port
+        self.requests: Counter = Counter()
+        self.controls: List[int] = []
+        self._random = random.Random(seed)
+        self._sessions: Dict[int, _BmcSession] = {}
+        self._guid = os.urandom(16)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "BMCSimulator":
+        """Start BMC."""
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        __exc_type: Type[BaseException] | None,
+        __exc_value: BaseException | None,
+        __traceback: TracebackType | None,
+    ) -> None:
+        """Stop BMC."""
+        self.stop()
+
+    @property
+    def active_sessions(self) -> int:
+        """Number of established sessions."""
+        return sum(1 for session in self._sessions.values() if session.integrity_key is not None)
+
+    def expire_sessions(self) -> None:
+        """Drop all sessions, as BMC does after session inactivity timeout."""
+        self._sessions.clear()
+
+    def start(self) -> None:
+        """Start BMC in background thread and wait until it listens."""
+        if self._thread is not None:
+            return
+        ready = threading.Event()
+        self._loop = asyncio.new_event_loop()
+
+        def run() -> None:
+            asyncio.set_event_loop(self._loop)
+            self._transport, _ = self._loop.run_until_complete(
+                self._loop.create_datagram_endpoint(lambda: _BmcProtocol(self), local_addr=(self.ip, self.port))
+            )
+            self.port = self._transport.get_extra_info("sockname")[1]
+            ready.set()
+            self._loop.run_forever()
+            self._transport.close()
+            self._loop.run_until_complete(asyncio.sleep(0))
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="bmc-simulator", daemon=True)
+        self._thread.start()
+        ready.wait()
+        logger.log(level=log_levels.MODULE_DEBUG, msg=f"Simulated BMC on {self.ip}:{self.port}")
+
+    def stop(self) -> None:
+        """Stop BMC and wait for its thread."""
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._thread = None
+        self._loop = None
+        self._transport = None
+
+    def _handle_datagram(self, transport: asyncio.DatagramTransport, data: bytes, addr: Tuple[str, int]) -> None:
+        """
+        Process RMCP packet and send response.
+
+        :param transport: Transport of BMC
+        :param data: Received datagram
+        :param addr: Address of remote console
+        """
+        if self.loss and self._random.random() < self.loss:
+            self.requests["dropped"] += 1
+            return
+        try:
+            if data[:4] == RMCP_HEADER and len(data) > 14 and data[4] == AUTH_TYPE_NONE:
+                message_length = data[13]
+                response = self._handle_session_less(data[14:][:message_length])
+            else:
+                response = self._handle_session_packet(data)
+        except (IpmiSessionException, IndexError, struct.error):
+            self.requests["malformed"] += 1
+            return
+        if response is None:
+            return
+        if self.response_delay:
+            self._loop.call_later(self.response_delay, transport.sendto, response, addr)
+        else:
+            transport.sendto(response, addr)
+
+    @staticmethod
+    def _build_response(netfn: int, sequence: int, command: int, completion_code: int, data: bytes = b"") -> bytes:
+        """
+        Build IPMI response message addressed to remote console.
+
+        :param netfn: Network function of request
+        :param sequence: Sequence number of request
+        :param command: Command code
+        :param completion_code: Completion code
+        :param data: Response data
+        :return: Encoded message
+        """
+        header = bytes([0x81, (netfn | 1) << 2])
+        body = bytes([0x20, sequence << 2, command, completion_code]) + data
+        return header + bytes([-sum(header) & 0xFF]) + body + bytes([-sum(body) & 0xFF])
+
+    def _handle_session_less(self, message: bytes) -> Optional[bytes]:
+        """
+        Answer Get Channel Authentication Capabilities sent outside of session.
+
+        :param message: IPMI request message
+        :return: Response packet, None when request is not supported outside of session
+        """
+        netfn, sequence, command, _ = parse_ipmi_message(message)
+        if (netfn, command) != (NETFN_APP, CMD_GET_CHANNEL_AUTH_CAPABILITIES):
+            return None
+        self.requests["channel_auth_capabilities"] += 1
+        # channel 1, IPMI v2.0 extended capabilities, non-null usernames, IPMI v2.0 connections supported
+        response = self._build_response(
+            netfn, sequence, command, COMPLETION_OK, bytes([1, 0x80, 0x04, 0x02, 0, 0, 0, 0])
+        )
+        return RMCP_HEADER + struct.pack("<BIIB", AUTH_TYPE_NONE, 0, 0, len(response)) + response
+
+    def _handle_session_packet(self, data: bytes) -> Optional[bytes]:
+        """
+        Process RMCP+ packet of session setup or established session.
+
+        :param data: Received datagram
+        :return: Response packet, None when packet is dropped
+        """
+        session_id = struct.unpack_from("<I", data, 6)[0]
+        if session_id == 0:
+            payload_type, _, _, payload = parse_session_packet(data)
+            if payload_type == PAYLOAD_OPEN_SESSION_REQUEST:
+                return self._open_session(payload)
+            if payload_type == PAYLOAD_RAKP_1:
+                return self._rakp_1(payload)
+            if payload_type == PAYLOAD_RAKP_3:
+                return self._rakp_3(payload)
+            return None
+        session = self._sessions.get(session_id)
+        if session is None or session.integrity_key is None:
+            self.requests["unknown_session"] += 1
+            return None
+        payload_type, _, _, payload = parse_session_packet(
+            data, integrity_key=session.integrity_key, confidentiality_key=session.confidentiality_key
+        )
+        if payload_type != PAYLOAD_IPMI:
+            return None
+        netfn, sequence, command, request = parse_ipmi_message(payload)
+        completion_code, response = self._handle_command(session, netfn, command, request)
+        return build_session_packet(
+            PAYLOAD_IPMI,
+            self._build_response(netfn, sequence, command, completion_code, response),
+            session_id=session.console_session_id,
+            integrity_key=session.integrity_key,
+            confidentiality_key=session.confidentiality_key,
+        )
+
+    def _open_session(self, payload: bytes) -> bytes:
+        """
+        Answer Open Session Request, cipher suite 3 is accepted.
+
+        :param payload: Request payload
+        :return: Response packet
+        """
+        self.requests["open_session"] += 1
+        tag, privilege, _, console_session_id = struct.unpack_from("<BBHI", payload)
+        bmc_session_id = int.from_bytes(os.urandom(4), "little") or 1
+        self._sessions[bmc_session_id] = _BmcSession(console_session_id, privilege or PRIVILEGE_ADMINISTRATOR)
+        response = struct.pack("<BBBxII", tag, 0, privilege, console_session_id, bmc_session_id) + payload[8:32]
+        return build_session_packet(PAYLOAD_OPEN_SESSION_RESPONSE, response)
+
+    def _rakp_1(self, payload: bytes) -> Optional[bytes]:
+        """
+        Answer RAKP 1 with RAKP 2 proving knowledge of user password.
+
+        :param payload: RAKP 1 payload
+        :return: RAKP 2 packet, None for unknown session
+        """
+        self.requests["rakp"] += 1
+        tag, bmc_session_id = struct.unpack_from("<B3xI", payload)
+        session = self._sessions.get(bmc_session_id)
+        if session is None:
+            return None
+        session.console_random = payload[8:24]
+        username_length = payload[27]
+        username = payload[28:][:username_length]
+        session.user = bytes([payload[24], len(username)]) + username
+        if username.decode() != self.username:
+            response = struct.pack("<BB2xI", tag, UNAUTHORIZED_NAME, session.console_session_id)
+            return build_session_packet(PAYLOAD_RAKP_2, response)
+        session.bmc_random = os.urandom(16)
+        session_ids = struct.pack("<II", session.console_session_id, bmc_session_id)
+        key_exchange_code = hmac_sha1(
+            self._password_key, session_ids + session.console_random + session.bmc_random + self._guid + session.user
+        )
+        response = struct.pack("<BB2xI", tag, 0, session.console_session_id) + session.bmc_random + self._guid
+        return build_session_packet(PAYLOAD_RAKP_2, response + key_exchange_code)
+
+    def _rakp_3(self, payload: bytes) -> Optional[bytes]:
+        """
+        Verify RAKP 3 and answer with RAKP 4, session becomes established.
+
+        :param payload: RAKP 3 payload
+        :return: RAKP 4 packet, None for unknown session
+        """
+        self.requests["rakp"] += 1
+        tag, _, bmc_session_id = struct.unpack_from("<BB2xI", payload)
+        session = self._sessions.get(bmc_session_id)
+        if session is None or not session.bmc_random:
+            return None
+        expected = hmac_sha1(
+            self._password_key, session.bmc_random + struct.pack("<I", session.console_session_id) + session.user
+        )
+        if not hmac.compare_digest(expected, payload[8:28]):
+            self._sessions.pop(bmc_session_id)
+            response = struct.pack("<BB2xI", tag, INVALID_INTEGRITY_CHECK, session.console_session_id)
+            return build_session_packet(PAYLOAD_RAKP_4, response)
+        sik = hmac_sha1(self._password_key, session.console_random + session.bmc_random + session.user)
+        session.integrity_key, session.confidentiality_key = derive_session_keys(sik)
+        integrity_check = hmac_sha1(sik, session.console_random + struct.pack("<I", bmc_session_id) + self._guid)
+        response = struct.pack("<BB2xI", tag, 0, session.console_session_id)
+        return build_session_packet(PAYLOAD_RAKP_4, response + integrity_check[:INTEGRITY_CHECK_SIZE])
+
+    @property
+    def _password_key(self) -> bytes:
+        """Password of user padded to 20 bytes."""
+        return self.password.encode()[:20].ljust(20, b"\x00")
+
+    def _handle_command(self, session: _BmcSession, netfn: int, command: int, request: bytes) -> Tuple[int, bytes]:
+        """
+        Execute IPMI command in session.
+
+        :param session: Session state
+        :param netfn: Network function
+        :param command: Command code
+        :param request: Request data
+        :return: Completion code and response data
+        """
+        if (netfn, command) == (NETFN_APP, CMD_SET_SESSION_PRIVILEGE):
+            self.requests["set_privilege"] += 1
+            if request[0] > session.privilege:
+                return INSUFFICIENT_PRIVILEGE, b""
+            session.current_privilege = request[0]
+            return COMPLETION_OK, request[:1]
+        if (netfn, command) == (NETFN_APP, CMD_CLOSE_SESSION):
+            self.requests["close_session"] += 1
+            self._sessions.pop(struct.unpack_from("<I", request)[0], None)
+            return COMPLETION_OK, b""
+        if (netfn, command) == (NETFN_CHASSIS, CMD_GET_CHASSIS_STATUS):
+            self.requests["chassis_status"] += 1
+            return COMPLETION_OK, bytes([int(self.power_on), 0, 0, 0])
+        if (netfn, command) == (NETFN_CHASSIS, CMD_CHASSIS_CONTROL):
+            self.requests["chassis_control"] += 1
+            if session.current_privilege < OPERATOR_PRIVILEGE:
+                return INSUFFICIENT_PRIVILEGE, b""
+            return self._chassis_control(request[0]), b""
+        if (netfn, command) == (NETFN_SENSOR, CMD_GET_SENSOR_READING):
+            self.requests["sensor_reading"] += 1
+            if request[0] not in self.sensors:
+                return NOT_PRESENT, b""
+            # scanning enabled, no thresholds crossed
+            return COMPLETION_OK, bytes([self.sensors[request[0]], 0x40, 0x00])
+        self.requests["unsupported"] += 1
+        return INVALID_COMMAND, b""
+
+    def _chassis_control(self, control: int) -> int:
+        """
+        Apply chassis control to simulated power state.
+
+        :param control: Chassis control code
+        :return: Completion code
+        """
+        if control == POWER_CYCLE and not self.power_on and self.reject_cycle_when_off:
+            return NOT_SUPPORTED_IN_STATE
+        self.controls.append(control)
+        if control in (POWER_DOWN, SOFT_SHUTDOWN):
+            self.power_on = False
+        elif control in (POWER_UP, HARD_RESET):
+            self.power_on = True
+        elif control == POWER_CYCLE and self.power_on:
+            self.power_on = False
+            self._loop.call_later(self.cycle_time, setattr, self, "power_on", True)
+        return COMPLETION_OK
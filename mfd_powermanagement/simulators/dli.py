@@ -0,0 +1,259 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: MIT
+"""Module for local HTTP server simulating JSON REST API of Digital Loggers power switches."""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import TracebackType
+from typing import Dict, List, Optional, Tuple, Type
+from urllib.parse import parse_qs
+
+from mfd_common_libs import add_logging_level, log_levels
+
+logger = logging.getLogger(__name__)
+add_logging_level("MODULE_DEBUG", log_levels.MODULE_DEBUG)
+
+REALM = "DLI simulator"
+OUTLETS_PATH = "/restapi/relay/outlets/"
+# `/restapi/relay/outlets/<index>/<leaf>/` or `/restapi/relay/outlets/=<index>,<index>/<leaf>/`
+OUTLET_URL_REGEX = re.compile(r"^/restapi/relay/outlets/(?P<selector>=?[\d,]+)/(?P<leaf>state|cycle)/$")
+DIGEST_FIELD_REGEX = re.compile(r'(\w+)=(?:"([^"]*)"|([^,\s]*))')
+
+
+def _md5(text: str) -> str:
+    """
+    Compute hex digest of text.
+
+    :param text: Text to hash
+    :return: MD5 hex digest
+    """
+    return hashlib.md5(text.encode()).hexdigest()
+
+
+class _DliRequestHandler(BaseHTTPRequestHandler):
+    """Request handler passing authenticated requests to simulator."""
+
+    protocol_version = "HTTP/1.1"
+    server: "_DliHTTPServer"
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.simulator.requests["connection"] += 1
+
+    def log_message(self, format: str, *args: object) -> None:
+        logger.log(level=log_levels.MODULE_DEBUG, msg=f"DLI simulator: {format % args}")
+
+    def _send(self, status: int, body: Optional[object] = None, headers: Optional[Dict[str, str]] = None) -> None:
+        data = b"" if body is None else json.dumps(body).encode()
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if body is not None:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _handle(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode() if length else ""
+        simulator = self.server.simulator
+        if not simulator.authorized(self.command, self.headers.get("Authorization", "")):
+            simulator.requests["unauthorized"] += 1
+            challenge = f'Digest realm="{REALM}", qop="auth", nonce="{simulator.nonce}", algorithm=MD5'
+            self._send(401, headers={"WWW-Authenticate": challenge})
+            return
+        status, response = simulator.handle(self.command, self.path, self.headers, body)
+        self._send(status, response)
+
+    do_GET = do_PUT = do_POST = _handle
+
+
+class _DliHTTPServer(ThreadingHTTPServer):
+    """HTTP server with reference to simulator."""
+
+    daemon_threads = True
+
+    def __init__(self, simulator: "DLISimulator") -> None:
+        self.simulator = simulator
+        super().__init__((simulator.ip, simulator.port), _DliRequestHandler)
+
+
+class DLISimulator:
+    """
+    Digital Loggers power switch serving JSON REST API on localhost HTTP with digest authentication.
+
+    Supports listing outlets, reading and setting state of single outlet or matrix of outlets
+    (`/restapi/relay/outlets/=0,1,4/state/`) and cycling outlet. Outlets are indexed from 0, as in REST API.
+    With `rest=False` simulates old firmware, which answers 404 to REST API.
+
+    Usage example:
+    >>> with DLISimulator(username="admin", password="1234", outlets=8) as switch:
+    >>>     dli = DLI(host=f"{switch.ip}:{switch.port}", username="admin", password="1234")
+    >>>     dli.power_off(outlet_number=1)
+    >>>     switch.states[0]
+    False
+    """
+
+    def __init__(
+        self,
+        *,
+        username: str = "admin",
+        password: str = "1234",
+        outlets: int = 8,
+        rest: bool = True,
+        response_delay: float = 0,
+        ip: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        """
+        Init of DLISimulator.
+
+        :param username: User accepted by switch
+        :param password: Password of user
+        :param outlets: Number of outlets, all initially on
+        :param rest: Whether switch serves REST API, old firmware doesn't
+        :param response_delay: Time in seconds after which switch responds to request
+        :param ip: IP address to listen on
+        :param port: TCP port to listen on, free port is chosen when 0
+        """
+        self.username = username
+        self.password = password
+        self.states: List[bool] = [True] * outlets
+        self.rest = rest
+        self.response_delay = response_delay
+        self.ip = ip
+        self.port = port
+        self.cycle_delay = 0.0
+        self.requests: Counter = Counter()
+        self.nonce = os.urandom(16).hex()
+        self._lock = threading.Lock()
+        self._server: Optional[_DliHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "DLISimulator":
+        """Start switch."""
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        __exc_type: Type[BaseException] | None,
+        __exc_value: BaseException | None,
+        __traceback: TracebackType | None,
+    ) -> None:
+        """Stop switch."""
+        self.stop()
+
+    def start(self) -> None:
+        """Start switch in background thread."""
+        if self._thread is not None:
+            return
+        self._server = _DliHTTPServer(self)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, name="dli-simulator", daemon=True
+        )
+        self._thread.start()
+        logger.log(level=log_levels.MODULE_DEBUG, msg=f"Simulated DLI switch on {self.ip}:{self.port}")
+
+    def stop(self) -> None:
+        """Stop switch and wait for its thread."""
+        if self._thread is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._thread = None
+        self._server = None
+
+    def authorized(self, method: str, authorization: str) -> bool:
+        """
+        Verify digest authentication of request.
+
+        :param method: HTTP method of request
+        :param authorization: Value of Authorization header
+        :return: Whether credentials are valid
+        """
+        if not authorization.startswith("Digest "):
+            return False
+        fields = {name: quoted or plain for name, quoted, plain in DIGEST_FIELD_REGEX.findall(authorization)}
+        if fields.get("username") != self.username or fields.get("nonce") != self.nonce:
+            return False
+        ha1 = _md5(f"{self.username}:{REALM}:{self.password}")
+        ha2 = _md5(f"{method}:{fields.get('uri')}")
+        expected = _md5(f"{ha1}:{self.nonce}:{fields.get('nc')}:{fields.get('cnonce')}:{fields.get('qop')}:{ha2}")
+        return fields.get("response") == expected
+
+    def handle(self, method: str, path: str, headers: Dict[str, str], body: str) -> Tuple[int, Optional[object]]:
+        """
+        Handle authenticated REST API request.
+
+        :param method: HTTP method
+        :param path: Path of request
+        :param headers: Headers of request
+        :param body: Form encoded body of request
+        :return: HTTP status and JSON body, None for empty body
+        """
+        if self.response_delay:
+            time.sleep(self.response_delay)
+        if not self.rest or not path.startswith(OUTLETS_PATH):
+            self.requests["not_found"] += 1
+            return 404, None
+        if method != "GET" and headers.get("X-CSRF") is None:
+            self.requests["forbidden"] += 1
+            return 403, None
+        if path == OUTLETS_PATH and method == "GET":
+            self.requests["list"] += 1
+            with self._lock:
+                return 200, [
+                    {"name": f"Outlet {index + 1}", "state": state, "physical_state": state, "locked": False}
+                    for index, state in enumerate(self.states)
+                ]
+        match = OUTLET_URL_REGEX.match(path)
+        if match is None:
+            self.requests["not_found"] += 1
+            return 404, None
+        selector = match.group("selector")
+        indexes = [int(index) for index in selector.lstrip("=").split(",")]
+        if any(index >= len(self.states) for index in indexes):
+            self.requests["not_found"] += 1
+            return 404, None
+        if match.group("leaf") == "cycle" and method == "POST" and len(indexes) == 1:
+            self.requests["cycle"] += 1
+            with self._lock:
+                self.states[indexes[0]] = False
+            threading.Timer(self.cycle_delay, self._set, args=(indexes, True)).start()
+            return 204, None
+        if match.group("leaf") == "state" and method == "GET":
+            self.requests["get_state"] += 1
+            with self._lock:
+                states = [self.states[index] for index in indexes]
+            return 200, states if selector.startswith("=") else states[0]
+        if match.group("leaf") == "state" and method == "PUT":
+            self.requests["set_state"] += 1
+            value = parse_qs(body).get("value", [""])[0]
+            if value not in ("true", "false"):
+                return 400, None
+            self._set(indexes, value == "true")
+            return 204, None
+        self.requests["not_allowed"] += 1
+        return 405, None
+
+    def _set(self, indexes: List[int], state: bool) -> None:
+        """
+        Set state of outlets.
+
+        :param indexes: Indexes of outlets, from 0
+        :param state: True for on
+        """
+        with self._lock:
+            for index in indexes:
+                self.states[index] = state
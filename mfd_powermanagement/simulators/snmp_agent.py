@@ -0,0 +1,443 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: MIT
+"""Module for local SNMP agent simulating outlet tables of APC and Raritan PDUs."""
+
+import asyncio
+import bisect
+import logging
+import random
+import threading
+from collections import Counter
+from types import TracebackType
+from typing import Dict, List, Optional, Tuple, Type
+
+from mfd_common_libs import add_logging_level, log_levels
+from pyasn1.codec.ber import decoder, encoder
+from pyasn1.error import PyAsn1Error
+from pysnmp.proto import api
+
+from ..pdu import APC, PDU, PDUStates
+
+logger = logging.getLogger(__name__)
+add_logging_level("MODULE_DEBUG", log_levels.MODULE_DEBUG)
+
+OID = Tuple[int, ...]
+
+# SNMP error statuses, RFC 3416
+TOO_BIG = 1
+NO_SUCH_NAME = 2
+BAD_VALUE = 3
+WRONG_VALUE = 10
+NO_CREATION = 11
+# Space reserved for growth of BER length fields when variable bindings are added to response
+LENGTH_SLACK = 8
+
+
+def _to_oid(oid: str) -> OID:
+    """
+    Convert dotted OID into tuple of integers.
+
+    :param oid: Dotted SNMP Object Identifier
+    :return: Tuple of OID arcs
+    """
+    return tuple(int(arc) for arc in oid.split("."))
+
+
+class _AgentProtocol(asyncio.DatagramProtocol):
+    """Datagram protocol passing SNMP requests to simulator."""
+
+    def __init__(self, simulator: "PDUAgentSimulator") -> None:
+        self._simulator = simulator
+        self.transport: Optional[asyncio.DatagramTransport] = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        self._simulator._handle_datagram(self.transport, data, addr)
+
+
+class PDUAgentSimulator:
+    """
+    SNMP v1/v2c agent simulating outlet control, status and metering tables of PDU on localhost UDP.
+
+    OIDs and commands are taken from PDU class (:class:`APC` or :class:`Raritan`), so PDU objects can be pointed
+    to the simulator for end to end tests and benchmarks of SNMP client, batched operations and fleet driver.
+    Agent runs own event loop in background thread.
+
+    Usage example:
+    >>> with PDUAgentSimulator(vendor=Raritan, outlet_count=24, relay_latency=0.05, loss=0.01) as agent:
+    >>>     pdu = Raritan(ip=agent.ip, udp_port=agent.port)
+    >>>     pdu.power_off_outlets(range(1, 25))
+    >>>     agent.outlet_states[3]
+    PDUStates.off
+    """
+
+    def __init__(
+        self,
+        *,
+        vendor: Type[PDU] = APC,
+        outlet_count: int = 8,
+        relay_latency: float = 0,
+        cycle_time: float = 0.1,
+        response_delay: float = 0,
+        loss: float = 0,
+        community_string: str = "private",
+        max_message_size: int = 1472,
+        ip: str = "127.0.0.1",
+        port: int = 0,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        Init of PDUAgentSimulator.
+
+        :param vendor: PDU class, which OIDs and commands are simulated
+        :param outlet_count: Number of outlets, all are powered on initially
+        :param relay_latency: Time in seconds after which outlet status reflects received command
+        :param cycle_time: Time in seconds for which outlet stays off during power cycle
+        :param response_delay: Time in seconds after which agent responds to request
+        :param loss: Probability of dropping received request, between 0 and 1
+        :param community_string: Community accepted by agent, requests with other community are dropped
+        :param max_message_size: Maximum size of response, GETBULK responses are truncated to fit, other requests
+        fail with tooBig error when they don't fit
+        :param ip: IP address to listen on
+        :param port: UDP port to listen on, free port is chosen when 0
+        :param seed: Seed of random generator used for packet loss
+        """
+        self.vendor = vendor
+        self.outlet_count = outlet_count
+        self.relay_latency = relay_latency
+        self.cycle_time = cycle_time
+        self.response_delay = response_delay
+        self.loss = loss
+        self.community_string = community_string
+        self.max_message_size = max_message_size
+        self.ip = ip
+        self.port = port
+        self.requests: Counter = Counter()
+        self.set_sizes: List[int] = []
+        self._random = random.Random(seed)
+        self._control = _to_oid(vendor.OUTLET_CONTROL)
+        self._status = _to_oid(vendor.OUTLET_STATUS) if vendor.OUTLET_STATUS else None
+        self._commands = {
+            int(vendor.ON_COMMAND): PDUStates.on,
+            int(vendor.OFF_COMMAND): PDUStates.off,
+            int(vendor.CYCLE_COMMAND): PDUStates.cycle,
+        }
+        self._outlet_states = {outlet: PDUStates.on for outlet in range(1, outlet_count + 1)}
+        self._metering: Dict[int, Dict[str, float]] = {outlet: {} for outlet in self._outlet_states}
+        self._values: Dict[OID, Tuple[str, int]] = {}
+        self._build_tables()
+        self._oids = sorted(self._values)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _build_tables(self) -> None:
+        """Register OIDs of simulated table cells with their column and outlet."""
+        for outlet in self._outlet_states:
+            self._values[self._control + (outlet,)] = ("control", outlet)
+            if self._status is not None:
+                self._values[self._status + (outlet,)] = ("status", outlet)
+            for measurement, oid, suffix, _ in self.vendor.OUTLET_METERING:
+                self._values[_to_oid(oid) + (outlet,) + suffix] = (measurement, outlet)
+
+    def __enter__(self) -> "PDUAgentSimulator":
+        """Start agent."""
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        __exc_type: Type[BaseException] | None,
+        __exc_value: BaseException | None,
+        __traceback: TracebackType | None,
+    ) -> None:
+        """Stop agent."""
+        self.stop()
+
+    @property
+    def outlet_states(self) -> Dict[int, PDUStates]:
+        """Current power state of each outlet."""
+        return dict(self._outlet_states)
+
+    def set_outlet_state(self, outlet_number: int, state: PDUStates) -> None:
+        """
+        Set power state of outlet directly, without SNMP request.
+
+        :param outlet_number: Number of outlet
+        :param state: PDUStates.on or PDUStates.off
+        """
+        self._outlet_states[outlet_number] = state
+
+    def set_metering(self, outlet_number: int, *, current: float, power: float, energy: float) -> None:
+        """
+        Set load reported by metering table of outlet.
+
+        :param outlet_number: Number of outlet
+        :param current: Current in amperes
+        :param power: Power in watts
+        :param energy: Energy in kilowatt-hours
+        """
+        self._metering[outlet_number] = {"current": current, "power": power, "energy": energy}
+
+    def start(self) -> None:
+        """Start agent in background thread and wait until it listens."""
+        if self._thread is not None:
+            return
+        ready = threading.Event()
+        self._loop = asyncio.new_event_loop()
+
+        def run() -> None:
+            asyncio.set_event_loop(self._loop)
+            self._transport, _ = self._loop.run_until_complete(
+                self._loop.create_datagram_endpoint(lambda: _AgentProtocol(self), local_addr=(self.ip, self.port))
+            )
+            self.port = self._transport.get_extra_info("sockname")[1]
+            ready.set()
+            self._loop.run_forever()
+            self._transport.close()
+            self._loop.run_until_complete(asyncio.sleep(0))
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name=f"pdu-agent-{self.vendor.__name__}", daemon=True)
+        self._thread.start()
+        ready.wait()
+        logger.log(
+            level=log_levels.MODULE_DEBUG, msg=f"Simulated {self.vendor.__name__} agent on {self.ip}:{self.port}"
+        )
+
+    def stop(self) -> None:
+        """Stop agent and wait for its thread."""
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._thread = None
+        self._loop = None
+        self._transport = None
+
+    def _get_value(self, oid: OID, protocol: object) -> Optional[object]:
+        """
+        Get current value of table cell.
+
+        :param oid: OID of cell
+        :param protocol: SNMP protocol module
+        :return: Value of cell, None if cell doesn't exist
+        """
+        cell = self._values.get(oid)
+        if cell is None:
+            return None
+        column, outlet = cell
+        state = self._outlet_states[outlet]
+        if column == "control":
+            return protocol.Integer(int(self.vendor.ON_COMMAND if state is PDUStates.on else self.vendor.OFF_COMMAND))
+        if column == "status":
+            return protocol.Integer(int(self.vendor.ON_STATUS if state is PDUStates.on else self.vendor.OFF_STATUS))
+        scale = next(scale for measurement, _, _, scale in self.vendor.OUTLET_METERING if measurement == column)
+        return protocol.Gauge32(round(self._metering[outlet].get(column, 0) / scale))
+
+    def _get_next(self, oid: OID) -> Optional[OID]:
+        """
+        Get OID of next existing cell in lexicographic order.
+
+        :param oid: Preceding OID
+        :return: Next OID, None if end of MIB view was reached
+        """
+        index = bisect.bisect_right(self._oids, oid)
+        return self._oids[index] if index < len(self._oids) else None
+
+    def _apply_command(self, outlet: int, command: PDUStates) -> None:
+        """
+        Switch relay of outlet, called after relay latency.
+
+        :param outlet: Number of outlet
+        :param command: Requested state
+        """
+        if command is PDUStates.cycle:
+            self._outlet_states[outlet] = PDUStates.off
+            self._loop.call_later(self.cycle_time, self._outlet_states.__setitem__, outlet, PDUStates.on)
+        else:
+            self._outlet_states[outlet] = command
+
+    def _handle_datagram(self, transport: asyncio.DatagramTransport, data: bytes, addr: Tuple[str, int]) -> None:
+        """
+        Process SNMP request and send response.
+
+        :param transport: Transport of agent
+        :param data: Received datagram
+        :param addr: Address of manager
+        """
+        if self.loss and self._random.random() < self.loss:
+            self.requests["dropped"] += 1
+            return
+        try:
+            protocol = api.PROTOCOL_MODULES[int(api.decodeMessageVersion(data))]
+            request, _ = decoder.decode(data, asn1Spec=protocol.Message())
+        except (PyAsn1Error, KeyError):
+            self.requests["malformed"] += 1
+            return
+        if str(protocol.apiMessage.get_community(request)) != self.community_string:
+            self.requests["bad_community"] += 1
+            return
+
+        response = protocol.apiMessage.get_response(request)
+        request_pdu = protocol.apiMessage.get_pdu(request)
+        response_pdu = protocol.apiMessage.get_pdu(response)
+        var_binds = [(tuple(oid), value) for oid, value in protocol.apiPDU.get_varbinds(request_pdu)]
+        if request_pdu.isSameTypeWith(protocol.SetRequestPDU()):
+            self.requests["set"] += 1
+            self.set_sizes.append(len(var_binds))
+            self._handle_set(protocol, response_pdu, var_binds)
+        elif request_pdu.isSameTypeWith(protocol.GetRequestPDU()):
+            self.requests["get"] += 1
+            self._handle_get(protocol, response_pdu, var_binds)
+        elif request_pdu.isSameTypeWith(protocol.GetNextRequestPDU()):
+            self.requests["getnext"] += 1
+            self._handle_get_next(protocol, response_pdu, var_binds)
+        elif protocol is api.v2c and request_pdu.isSameTypeWith(protocol.GetBulkRequestPDU()):
+            self.requests["getbulk"] += 1
+            self._handle_get_bulk(protocol, response, request_pdu, response_pdu, var_binds)
+        else:
+            self.requests["unsupported"] += 1
+            return
+
+        message = encoder.encode(response)
+        if len(message) > self.max_message_size:
+            protocol.apiPDU.set_error_status(response_pdu, TOO_BIG)
+            protocol.apiPDU.set_error_index(response_pdu, 0)
+            protocol.apiPDU.set_varbinds(response_pdu, var_binds if protocol is api.v1 else [])
+            message = encoder.encode(response)
+        if self.response_delay:
+            self._loop.call_later(self.response_delay, transport.sendto, message, addr)
+        else:
+            transport.sendto(message, addr)
+
+    def _set_error(self, protocol: object, response_pdu: object, var_binds: list, status: int, index: int) -> None:
+        """
+        Set error status and index of response, variable bindings are returned unchanged.
+
+        :param protocol: SNMP protocol module
+        :param response_pdu: Response PDU
+        :param var_binds: Variable bindings of request
+        :param status: Error status
+        :param index: 1-based index of failed variable binding
+        """
+        protocol.apiPDU.set_error_status(response_pdu, status)
+        protocol.apiPDU.set_error_index(response_pdu, index)
+        protocol.apiPDU.set_varbinds(response_pdu, var_binds)
+
+    def _handle_set(self, protocol: object, response_pdu: object, var_binds: list) -> None:
+        """
+        Validate all variable bindings of SET request and apply them, none are applied when any is invalid.
+
+        :param protocol: SNMP protocol module
+        :param response_pdu: Response PDU
+        :param var_binds: Variable bindings of request
+        """
+        commands = []
+        for index, (oid, value) in enumerate(var_binds, start=1):
+            if self._values.get(oid, ("", 0))[0] != "control":
+                status = NO_SUCH_NAME if protocol is api.v1 else NO_CREATION
+                return self._set_error(protocol, response_pdu, var_binds, status, index)
+            try:
+                command = self._commands[int(value)]
+            except (KeyError, TypeError, ValueError, PyAsn1Error):
+                status = BAD_VALUE if protocol is api.v1 else WRONG_VALUE
+                return self._set_error(protocol, response_pdu, var_binds, status, index)
+            commands.append((oid[-1], command))
+        for outlet, command in commands:
+            if self.relay_latency:
+                self._loop.call_later(self.relay_latency, self._apply_command, outlet, command)
+            else:
+                self._apply_command(outlet, command)
+        protocol.apiPDU.set_varbinds(response_pdu, var_binds)
+
+    def _handle_get(self, protocol: object, response_pdu: object, var_binds: list) -> None:
+        """
+        Read requested cells, missing cells are reported as noSuchInstance (v2c) or noSuchName error (v1).
+
+        :param protocol: SNMP protocol module
+        :param response_pdu: Response PDU
+        :param var_binds: Variable bindings of request
+        """
+        response_var_binds = []
+        for index, (oid, _) in enumerate(var_binds, start=1):
+            value = self._get_value(oid, protocol)
+            if value is None:
+                if protocol is api.v1:
+                    return self._set_error(protocol, response_pdu, var_binds, NO_SUCH_NAME, index)
+                value = protocol.NoSuchInstance()
+            response_var_binds.append((oid, value))
+        protocol.apiPDU.set_varbinds(response_pdu, response_var_binds)
+
+    def _handle_get_next(self, protocol: object, response_pdu: object, var_binds: list) -> None:
+        """
+        Read cells following requested OIDs.
+
+        :param protocol: SNMP protocol module
+        :param response_pdu: Response PDU
+        :param var_binds: Variable bindings of request
+        """
+        response_var_binds = []
+        for index, (oid, _) in enumerate(var_binds, start=1):
+            next_oid = self._get_next(oid)
+            if next_oid is None:
+                if protocol is api.v1:
+                    return self._set_error(protocol, response_pdu, var_binds, NO_SUCH_NAME, index)
+                response_var_binds.append((oid, protocol.EndOfMibView()))
+            else:
+                response_var_binds.append((next_oid, self._get_value(next_oid, protocol)))
+        protocol.apiPDU.set_varbinds(response_pdu, response_var_binds)
+
+    def _handle_get_bulk(
+        self,
+        protocol: object,
+        response: object,
+        request_pdu: object,
+        response_pdu: object,
+        var_binds: list,
+    ) -> None:
+        """
+        Read cells following requested OIDs repeatedly, response is truncated to maximum message size.
+
+        :param protocol: SNMP protocol module
+        :param response: Response message
+        :param request_pdu: Request PDU
+        :param response_pdu: Response PDU
+        :param var_binds: Variable bindings of request
+        """
+        non_repeaters = int(protocol.apiBulkPDU.get_non_repeaters(request_pdu))
+        max_repetitions = int(protocol.apiBulkPDU.get_max_repetitions(request_pdu))
+        size = len(encoder.encode(response)) + LENGTH_SLACK
+        response_var_binds = []
+
+        def add(oid: OID) -> Optional[OID]:
+            nonlocal size
+            next_oid = self._get_next(oid)
+            var_bind = (
+                (oid, protocol.EndOfMibView()) if next_oid is None else (next_oid, self._get_value(next_oid, protocol))
+            )
+            encoded = protocol.VarBind()
+            protocol.apiVarBind.set_oid_value(encoded, var_bind)
+            size += len(encoder.encode(encoded))
+            if size > self.max_message_size:
+                return None
+            response_var_binds.append(var_bind)
+            return next_oid or oid
+
+        for oid, _ in var_binds[:non_repeaters]:
+            if add(oid) is None:
+                break
+        else:
+            current = [oid for oid, _ in var_binds[non_repeaters:]]
+            for _ in range(max_repetitions if current else 0):
+                for column, oid in enumerate(current):
+                    next_oid = add(oid)
+                    if next_oid is None:
+                        break
+                    current[column] = next_oid
+                else:
+                    continue
+                break
+        protocol.apiPDU.set_varbinds(response_pdu, response_var_binds)
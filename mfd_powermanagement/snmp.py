@@ -0,0 +1,709 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: MIT
+"""Module for long-lived SNMP client used by SNMP controlled power devices."""
+
+import asyncio
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from types import TracebackType
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    ClassVar,
+    Coroutine,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from mfd_common_libs import add_logging_level, log_levels
+from pyasn1.codec.ber import encoder
+from pysnmp.entity import config
+from pysnmp.entity.engine import SnmpEngine
+from pysnmp.hlapi.v3arch import CommunityData, ContextData, UdpTransportTarget, UsmUserData
+from pysnmp.hlapi.v3arch.asyncio.cmdgen import bulk_cmd, get_cmd, set_cmd
+from pysnmp.proto import errind
+from pysnmp.proto.api import v2c
+from pysnmp.proto.rfc1902 import Integer32, OctetString
+from pysnmp.proto.rfc1905 import EndOfMibView
+from pysnmp.smi import builder, view
+from pysnmp.smi.rfc1902 import ObjectIdentity, ObjectType
+
+from .exceptions import PDUConfigurationException, PDUSNMPException, PowerManagementException
+
+logger = logging.getLogger(__name__)
+add_logging_level("MODULE_DEBUG", log_levels.MODULE_DEBUG)
+
+SnmpResult = Tuple[object, object, object, Tuple[ObjectType, ...]]
+T = TypeVar("T")
+
+# UDP payload fitting into Ethernet MTU, agents are required to accept at least 484 octets
+DEFAULT_MAX_MESSAGE_SIZE = 1472
+# BER encoded SNMPv2c message and PDU headers without community and variable bindings
+SNMP_MESSAGE_OVERHEAD = 32
+# BER encoded SNMPv3 message with authPriv security parameters and scoped PDU headers without user name
+SNMP_V3_MESSAGE_OVERHEAD = 160
+TOO_BIG_ERROR_STATUS = 1
+# USM user used for discovery of authoritative engine ID, agent answers with report containing its engine ID
+DISCOVERY_USER_NAME = "mfd-discovery"
+DISCOVERY_OID = "1.3.6.1.2.1.1.1.0"
+
+# Reports of agent, which changed its engine ID e.g. after replacement or reset
+STALE_ENGINE_ID_ERRORS = (errind.UnknownEngineID, errind.WrongDigest)
+
+# Number of distinct OID and value pairs kept precompiled, enough for every outlet and command of several PDUs
+VAR_BIND_CACHE_SIZE = 4096
+
+_mib_view_controller: Optional[view.MibViewController] = None
+_mib_lock = threading.Lock()
+_localized_keys: Dict[tuple, Tuple[OctetString, Optional[OctetString]]] = {}
+_engine_ids: Dict[Tuple[str, int], bytes] = {}
+_usm_lock = threading.Lock()
+
+
+@lru_cache(maxsize=VAR_BIND_CACHE_SIZE)
+def get_var_bind_size(oid: str, value: int) -> int:
+    """
+    Get size of BER encoded variable binding with integer value, sizes are cached per OID and value.
+
+    :param oid: SNMP Object Identifier with instance number
+    :param value: Integer value of variable binding
+    :return: Size of encoded variable binding in octets
+    """
+    var_bind = v2c.VarBind()
+    v2c.apiVarBind.set_oid_value(var_bind, (v2c.ObjectIdentifier(oid), v2c.Integer32(value)))
+    return len(encoder.encode(var_bind))
+
+
+def _localize_keys(usm_user: UsmUserData, engine_id: OctetString) -> Tuple[OctetString, Optional[OctetString]]:
+    """
+    Localize authentication and privacy keys of USM user for authoritative SNMP engine.
+
+    :param usm_user: USM user with pass phrase or master keys
+    :param engine_id: Authoritative engine ID of agent
+    :return: Localized authentication key and localized privacy key, None if privacy is not used
+    """
+    auth_protocol = usm_user.authentication_protocol
+    auth_service = config.AUTH_SERVICES[auth_protocol]
+    auth_key = OctetString(usm_user.authentication_key)
+    if usm_user.authKeyType < config.USM_KEY_TYPE_MASTER:
+        auth_key = auth_service.hash_passphrase(auth_key)
+    if usm_user.authKeyType < config.USM_KEY_TYPE_LOCALIZED:
+        auth_key = auth_service.localize_key(auth_key, engine_id)
+
+    if usm_user.privacy_protocol == config.USM_PRIV_NONE:
+        return auth_key, None
+    priv_service = config.PRIV_SERVICES[usm_user.privacy_protocol]
+    priv_key = OctetString(usm_user.privacy_key)
+    if usm_user.privKeyType < config.USM_KEY_TYPE_MASTER:
+        priv_key = priv_service.hash_passphrase(auth_protocol, priv_key)
+    if usm_user.privKeyType < config.USM_KEY_TYPE_LOCALIZED:
+        priv_key = priv_service.localize_key(auth_protocol, priv_key, engine_id)
+    return auth_key, priv_key
+
+
+def _usm_user_key(usm_user: UsmUserData) -> tuple:
+    """
+    Get key identifying USM user with its protocols and key material.
+
+    :param usm_user: USM user
+    :return: Hashable key, different for users differing in anything but security engine ID
+    """
+    return (
+        str(usm_user.userName),
+        tuple(usm_user.authentication_protocol),
+        tuple(usm_user.privacy_protocol),
+        usm_user.authKeyType,
+        bytes(OctetString(usm_user.authentication_key)) if usm_user.authentication_key is not None else None,
+        usm_user.privKeyType,
+        bytes(OctetString(usm_user.privacy_key)) if usm_user.privacy_key is not None else None,
+    )
+
+
+def clear_engine_id_cache(ip: Optional[str] = None, udp_port: int = 161) -> None:
+    """
+    Forget discovered SNMPv3 engine IDs, so they are discovered again by next request.
+
+    Needed when agent was replaced or reset and changed its engine ID, clients rediscover it on their own
+    when agent reports unknown engine ID or wrong digest.
+
+    :param ip: IP address of agent, engine IDs of all agents are forgotten when not passed
+    :param udp_port: UDP port of agent
+    """
+    with _usm_lock:
+        if ip is None:
+            _engine_ids.clear()
+        else:
+            _engine_ids.pop((ip, udp_port), None)
+
+
+def localize_usm_user(usm_user: UsmUserData, engine_id: bytes) -> UsmUserData:
+    """
+    Get USM user with keys localized for authoritative SNMP engine of agent.
+
+    Key localization hashes pass phrase over a megabyte of data, so localized keys are cached in process
+    by engine ID, user name, protocols and key material. Commands using returned user pay no crypto setup cost.
+
+    :param usm_user: USM user with pass phrase, master or localized keys
+    :param engine_id: Authoritative engine ID of agent
+    :return: USM user with localized keys bound to engine ID
+    """
+    if usm_user.authentication_protocol == config.USM_AUTH_NONE:
+        return usm_user
+    key = (bytes(engine_id), *_usm_user_key(usm_user))
+    with _usm_lock:
+        keys = _localized_keys.get(key)
+        if keys is None:
+            logger.log(
+                level=log_levels.MODULE_DEBUG,
+                msg=f"Localizing SNMPv3 keys of user {usm_user.userName} for engine ID 0x{bytes(engine_id).hex()}",
+            )
+            keys = _localized_keys[key] = _localize_keys(usm_user, OctetString(engine_id))
+    auth_key, priv_key = keys
+    return UsmUserData(
+        usm_user.userName,
+        authKey=auth_key,
+        privKey=priv_key,
+        authProtocol=usm_user.authentication_protocol,
+        privProtocol=usm_user.privacy_protocol if priv_key is not None else None,
+        securityEngineId=OctetString(engine_id),
+        securityName=usm_user.securityName,
+        authKeyType=config.USM_KEY_TYPE_LOCALIZED,
+        privKeyType=config.USM_KEY_TYPE_LOCALIZED,
+    )
+
+
+@lru_cache(maxsize=VAR_BIND_CACHE_SIZE)
+def compile_var_bind(oid: str, value: Optional[int] = None) -> ObjectType:
+    """
+    Get variable binding resolved with MIB, compiled once per OID and value.
+
+    PySNMP resolves every variable binding passed to a request, unless it was resolved before,
+    which costs more than the rest of building the request. Compiled variable bindings are immutable and shared.
+
+    :param oid: SNMP Object Identifier with instance number
+    :param value: Integer value to be set, None for variable binding of GET request
+    :return: Resolved variable binding
+    """
+    global _mib_view_controller
+    with _mib_lock:
+        if _mib_view_controller is None:
+            _mib_view_controller = view.MibViewController(builder.MibBuilder())
+        var_bind = (
+            ObjectType(ObjectIdentity(oid)) if value is None else ObjectType(ObjectIdentity(oid), Integer32(value))
+        )
+        return var_bind.resolve_with_mib(_mib_view_controller)
+
+
+_shared_engine: ContextVar[Optional[SnmpEngine]] = ContextVar("shared_snmp_engine", default=None)
+
+
+@contextmanager
+def shared_snmp_engine() -> Iterator[SnmpEngine]:
+    """
+    Use single SNMP engine for requests of all SnmpClient objects made in current context.
+
+    Has to be entered inside running event loop, engine is closed on exit.
+    Tasks created inside the context inherit it, so they use the same engine as well.
+
+    Usage example:
+    >>> with shared_snmp_engine():
+    >>>     await asyncio.gather(first_pdu.async_power_on(outlet_number=1), second_pdu.async_power_on(outlet_number=1))
+
+    :return: Shared SNMP engine
+    """
+    engine = SnmpEngine()
+    token = _shared_engine.set(engine)
+    try:
+        yield engine
+    finally:
+        _shared_engine.reset(token)
+        SnmpClient._close_engine(engine)
+
+
+def _get_running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """Get event loop running in current thread, None if there is no such."""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class SnmpClient:
+    """
+    Long-lived SNMP client for a single device.
+
+    SNMP engine and UDP transport target are created lazily on first request
+    and reused by all subsequent requests, until client is closed.
+    Synchronous methods run requests in private event loop of the client,
+    `async_*` methods can be awaited directly from any running event loop.
+
+    Usage example:
+    >>> with SnmpClient(ip="10.10.10.10", community_string="private") as client:
+    >>>     client.set(ObjectType(ObjectIdentity("1.3.6.1.4.1.318.1.1.12.3.3.1.1.4.1"), Integer32(1)))
+    >>>
+    >>> await client.async_set(ObjectType(ObjectIdentity("1.3.6.1.4.1.318.1.1.12.3.3.1.1.4.1"), Integer32(1)))
+    >>>
+    >>> usm_user = UsmUserData("admin", "authpass", "privpass", USM_AUTH_HMAC96_SHA, USM_PRIV_CFB128_AES)
+    >>> with SnmpClient(ip="10.10.10.10", usm_user=usm_user) as client:
+    >>>     client.get(ObjectType(ObjectIdentity("1.3.6.1.4.1.318.1.1.12.3.5.1.1.4.1")))
+    """
+
+    _shared_clients: ClassVar[Dict[Tuple[str, int, str, Optional[tuple]], "SnmpClient"]] = {}
+    _shared_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(
+        self,
+        *,
+        ip: str,
+        udp_port: int = 161,
+        community_string: str = "private",
+        timeout: float = 1,
+        retries: int = 5,
+        max_message_size: int = DEFAULT_MAX_MESSAGE_SIZE,
+        usm_user: Optional[UsmUserData] = None,
+    ) -> None:
+        """
+        Init of SnmpClient.
+
+        :param ip: IP address of SNMP agent.
+        :param udp_port: UDP port of SNMP agent.
+        :param community_string: Community to use for SNMP connection.
+        :param timeout: Response timeout in seconds for single request.
+        :param retries: Number of request retries on timeout.
+        :param max_message_size: Maximum size of SNMP message accepted by agent, used for splitting of batches.
+        :param usm_user: SNMPv3 USM user to be used instead of community string.
+        Engine ID of agent is discovered on first request, unless set in user.
+        """
+        self.max_message_size = max_message_size
+        self._ip = ip
+        self._udp_port = udp_port
+        self._community_string = community_string
+        self._timeout = timeout
+        self._retries = retries
+        self._usm_user = usm_user
+        self._auth_data: Optional[Union[CommunityData, UsmUserData]] = (
+            CommunityData(community_string) if usm_user is None else None
+        )
+        self._context_data = ContextData()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sessions: Dict[
+            Tuple[asyncio.AbstractEventLoop, Optional[SnmpEngine]],
+            "asyncio.Task[Tuple[SnmpEngine, UdpTransportTarget]]",
+        ] = {}
+        self._session_guards: Dict[
+            Tuple[asyncio.AbstractEventLoop, Optional[SnmpEngine]], AsyncGenerator[None, None]
+        ] = {}
+        self._lock = threading.RLock()
+        self._shared_key: Optional[Tuple[str, int, str, Optional[tuple]]] = None
+        self._references = 0
+
+    @classmethod
+    def shared(
+        cls,
+        *,
+        ip: str,
+        udp_port: int = 161,
+        community_string: str = "private",
+        usm_user: Optional[UsmUserData] = None,
+    ) -> "SnmpClient":
+        """
+        Get process-wide client for given device, create it if not existing.
+
+        Every call increases reference counter of the client, shared client is closed
+        when :meth:`close` was called for each acquired reference.
+        SNMPv3 clients are shared by user name, protocols and keys.
+
+        :param ip: IP address of SNMP agent.
+        :param udp_port: UDP port of SNMP agent.
+        :param community_string: Community to use for SNMP connection.
+        :param usm_user: SNMPv3 USM user to be used instead of community string.
+        :return: Shared SnmpClient object
+        """
+        key = (ip, udp_port, community_string, _usm_user_key(usm_user) if usm_user is not None else None)
+        with cls._shared_lock:
+            client = cls._shared_clients.get(key)
+            if client is None:
+                client = cls(ip=ip, udp_port=udp_port, community_string=community_string, usm_user=usm_user)
+                client._shared_key = key
+                cls._shared_clients[key] = client
+            client._references += 1
+            return client
+
+    @property
+    def message_overhead(self) -> int:
+        """Size of SNMP message without variable bindings."""
+        if self._usm_user is not None:
+            return SNMP_V3_MESSAGE_OVERHEAD + len(str(self._usm_user.userName))
+        return SNMP_MESSAGE_OVERHEAD + len(self._community_string)
+
+    def split_var_binds(self, var_bind_sizes: List[int]) -> List[List[int]]:
+        """
+        Split variable bindings into batches fitting into maximum message size of agent.
+
+        :param var_bind_sizes: Sizes of encoded variable bindings
+        :return: Batches of indexes of variable bindings
+        """
+        limit = self.max_message_size - self.message_overhead
+        batches = []
+        batch = []
+        batch_size = 0
+        for index, var_bind_size in enumerate(var_bind_sizes):
+            if batch and batch_size + var_bind_size > limit:
+                batches.append(batch)
+                batch = []
+                batch_size = 0
+            batch.append(index)
+            batch_size += var_bind_size
+        if batch:
+            batches.append(batch)
+        return batches
+
+    @property
+    def closed(self) -> bool:
+        """Whether client has no SNMP engine and event loop opened."""
+        return not self._sessions and self._loop is None
+
+    def __enter__(self) -> "SnmpClient":
+        """Enter context of client."""
+        return self
+
+    def __exit__(
+        self,
+        __exc_type: Type[BaseException] | None,
+        __exc_value: BaseException | None,
+        __traceback: TracebackType | None,
+    ) -> None:
+        """Close client."""
+        self.close()
+
+    def close(self) -> None:
+        """Release SNMP engines, sockets and private event loop of the client."""
+        if self._shared_key is not None:
+            with self._shared_lock:
+                # repeated close of released client doesn't release references of other owners
+                self._references = max(self._references - 1, 0)
+                if self._references > 0:
+                    return
+                if self._shared_clients.get(self._shared_key) is self:
+                    self._shared_clients.pop(self._shared_key)
+
+        with self._lock:
+            sessions, self._sessions = self._sessions, {}
+            self._session_guards = {}
+            for (loop, shared_engine), session in sessions.items():
+                if shared_engine is not None or loop.is_closed():
+                    continue
+                if loop is self._loop or loop is _get_running_loop():
+                    self._close_session(session)
+                else:
+                    loop.call_soon_threadsafe(self._close_session, session)
+            if self._loop is not None:
+                if _get_running_loop() is None:
+                    # let transports finish closing of their sockets
+                    self._loop.run_until_complete(self._loop.shutdown_asyncgens())
+                self._loop.close()
+                self._loop = None
+        logger.log(level=log_levels.MODULE_DEBUG, msg=f"SNMP client for {self._ip}:{self._udp_port} closed.")
+
+    @staticmethod
+    def _close_engine(engine: SnmpEngine) -> None:
+        """
+        Close transport dispatcher of the engine.
+
+        :param engine: SNMP engine to be closed
+        """
+        if engine.transport_dispatcher is not None:
+            engine.close_dispatcher()
+
+    @classmethod
+    def _close_session(cls, session: "asyncio.Task[Tuple[SnmpEngine, UdpTransportTarget]]") -> None:
+        """
+        Close SNMP engine of session, session which failed to be created has nothing to be closed.
+
+        Has to be called in event loop of session.
+
+        :param session: Task creating SNMP engine and transport target
+        """
+        if session.done() and not session.cancelled() and session.exception() is None:
+            engine, _ = session.result()
+            cls._close_engine(engine)
+
+    async def _guard_session(
+        self,
+        key: Tuple[asyncio.AbstractEventLoop, Optional[SnmpEngine]],
+        session: "asyncio.Task[Tuple[SnmpEngine, UdpTransportTarget]]",
+    ) -> AsyncGenerator[None, None]:
+        """
+        Close SNMP engine of session when event loop of session shuts down.
+
+        Guard stays suspended in event loop of session, until it's finalized by `loop.shutdown_asyncgens()`,
+        which :func:`asyncio.run` calls before closing the loop, so the engine's sockets are closed while
+        the loop still runs. Engine of client used by subsequent `asyncio.run` calls is not left open by each of them.
+
+        :param key: Event loop and shared SNMP engine of session
+        :param session: Task creating SNMP engine and transport target
+        """
+        try:
+            yield
+        finally:
+            with self._lock:
+                if self._sessions.get(key) is session:
+                    del self._sessions[key]
+                    self._session_guards.pop(key, None)
+                else:
+                    session = None
+            if session is not None:
+                self._close_session(session)
+
+    async def _create_session(self, engine: Optional[SnmpEngine]) -> Tuple[SnmpEngine, UdpTransportTarget]:
+        """
+        Create SNMP engine and transport target for running event loop.
+
+        :param engine: Shared SNMP engine to be used instead of creating new one
+        :return: SNMP engine and UDP transport target
+        """
+        engine = engine if engine is not None else SnmpEngine()
+        transport_target = await UdpTransportTarget.create(
+            (self._ip, self._udp_port), timeout=self._timeout, retries=self._retries
+        )
+        return engine, transport_target
+
+    @staticmethod
+    def _is_session_stale(loop: asyncio.AbstractEventLoop, shared_engine: Optional[SnmpEngine]) -> bool:
+        """
+        Check whether session can't be used anymore, because its event loop or shared engine was closed.
+
+        :param loop: Event loop of session
+        :param shared_engine: Shared SNMP engine of session, None if session owns its engine
+        :return: True if session is stale, False otherwise
+        """
+        return loop.is_closed() or (shared_engine is not None and shared_engine.transport_dispatcher is None)
+
+    async def _async_discover_engine_id(self, engine: SnmpEngine, transport_target: UdpTransportTarget) -> bytes:
+        """
+        Discover authoritative engine ID of agent, engine ID is discovered once per device in process.
+
+        :param engine: SNMP engine used for discovery
+        :param transport_target: UDP transport target of agent
+        :return: Engine ID of agent
+        :raises PDUConfigurationException: if agent didn't report its engine ID
+        """
+        device = (self._ip, self._udp_port)
+        engine_id = _engine_ids.get(device)
+        if engine_id is not None:
+            return engine_id
+
+        engine_ids = []
+
+        def observer(snmp_engine: SnmpEngine, execpoint: str, variables: Dict[str, Any], context: Any) -> None:
+            engine_ids.append(bytes(variables["securityEngineId"]))
+
+        engine.observer.register_observer(observer, "rfc3412.prepareDataElements:internal")
+        try:
+            error_indication, *_ = await get_cmd(
+                engine,
+                UsmUserData(DISCOVERY_USER_NAME),
+                transport_target,
+                self._context_data,
+                ObjectType(ObjectIdentity(DISCOVERY_OID)),
+                lookupMib=False,
+            )
+        finally:
+            engine.observer.unregister_observer(observer)
+        if not engine_ids:
+            raise PDUConfigurationException(
+                f"SNMPv3 engine ID discovery failed: {error_indication} - "
+                "check your configuration and network connection"
+            )
+        engine_id = _engine_ids[device] = engine_ids[-1]
+        logger.log(level=log_levels.MODULE_DEBUG, msg=f"Discovered SNMPv3 engine ID 0x{engine_id.hex()} of {self._ip}")
+        return engine_id
+
+    async def _get_auth_data(
+        self, engine: SnmpEngine, transport_target: UdpTransportTarget
+    ) -> Union[CommunityData, UsmUserData]:
+        """
+        Get authentication data for requests, localize keys of SNMPv3 user on first use.
+
+        :param engine: SNMP engine used for engine ID discovery
+        :param transport_target: UDP transport target of agent
+        :return: Community or USM user with localized keys
+        """
+        if self._auth_data is None:
+            engine_id = self._usm_user.securityEngineId
+            if engine_id is None:
+                engine_id = await self._async_discover_engine_id(engine, transport_target)
+            self._auth_data = localize_usm_user(self._usm_user, engine_id)
+        return self._auth_data
+
+    async def _get_session(self) -> Tuple[SnmpEngine, UdpTransportTarget, Union[CommunityData, UsmUserData]]:
+        """
+        Get SNMP engine, transport target and authentication data for running event loop, create them on first use.
+
+        SNMP engine's transport dispatcher is bound to event loop in which it was used first,
+        so separate engine is kept per event loop. Engine set by :func:`shared_snmp_engine` has precedence.
+
+        :return: SNMP engine, UDP transport target and authentication data
+        """
+        loop = asyncio.get_running_loop()
+        shared_engine = _shared_engine.get()
+        session = self._sessions.get((loop, shared_engine))
+        if session is None:
+            for key in [key for key in self._sessions if self._is_session_stale(*key)]:
+                del self._sessions[key]
+                self._session_guards.pop(key, None)
+            key = (loop, shared_engine)
+            session = self._sessions[key] = loop.create_task(self._create_session(shared_engine))
+            if shared_engine is None:
+                guard = self._session_guards[key] = self._guard_session(key, session)
+                await guard.asend(None)
+        engine, transport_target = await session
+        return engine, transport_target, await self._get_auth_data(engine, transport_target)
+
+    def _is_engine_id_stale(self, error_indication: object) -> bool:
+        """
+        Check whether request failed because agent changed its engine ID since it was discovered.
+
+        :param error_indication: Error indication of request
+        :return: True if engine ID was discovered and agent reported unknown engine ID or wrong digest
+        """
+        return (
+            self._usm_user is not None
+            and self._usm_user.securityEngineId is None
+            and isinstance(error_indication, STALE_ENGINE_ID_ERRORS)
+        )
+
+    async def _async_command(self, command: Callable[..., Awaitable[SnmpResult]], *args: Any) -> SnmpResult:
+        """
+        Send SNMP request, rediscover engine ID of agent and send it again when the engine ID is stale.
+
+        :param command: PySNMP command e.g. `set_cmd`
+        :param args: Arguments of command following context data
+        :return: Tuple of error indication, error status, error index and variable bindings
+        """
+        engine, transport_target, auth_data = await self._get_session()
+        result = await command(engine, auth_data, transport_target, self._context_data, *args, lookupMib=False)
+        if not self._is_engine_id_stale(result[0]):
+            return result
+        logger.log(
+            level=log_levels.MODULE_DEBUG,
+            msg=f"SNMPv3 engine ID of {self._ip} is stale ({result[0]}), discovering it again",
+        )
+        clear_engine_id_cache(self._ip, self._udp_port)
+        self._auth_data = None
+        engine, transport_target, auth_data = await self._get_session()
+        return await command(engine, auth_data, transport_target, self._context_data, *args, lookupMib=False)
+
+    async def async_set(self, *var_binds: ObjectType) -> SnmpResult:
+        """
+        Send SNMP SET request with given variable bindings in running event loop.
+
+        Response variable bindings are not resolved with MIB, they are pairs of OID and value.
+
+        :param var_binds: Variable bindings to be set
+        :return: Tuple of error indication, error status, error index and variable bindings
+        """
+        return await self._async_command(set_cmd, *var_binds)
+
+    async def async_get(self, *var_binds: ObjectType) -> SnmpResult:
+        """
+        Send SNMP GET request for given variable bindings in running event loop.
+
+        Response variable bindings are not resolved with MIB, they are pairs of OID and value.
+
+        :param var_binds: Variable bindings to be read
+        :return: Tuple of error indication, error status, error index and variable bindings
+        """
+        return await self._async_command(get_cmd, *var_binds)
+
+    async def async_bulk_walk(self, oid: str, max_repetitions: int = 64) -> Dict[Tuple[int, ...], Any]:
+        """
+        Read all instances of MIB table column using GETBULK requests in running event loop.
+
+        Single request is enough when all instances fit into `max_repetitions` and maximum message size of agent.
+
+        :param oid: SNMP Object Identifier of table column
+        :param max_repetitions: Number of instances requested in single GETBULK request
+        :return: Values of column for each instance index
+        :raises PDUConfigurationException: if there is a misconfiguration or timeout eg. wrong IP selected
+        :raises PDUSNMPException: if there is an error returned from remote device via SNMP
+        """
+        root = tuple(int(arc) for arc in oid.split("."))
+        root_length = len(root)
+        values = {}
+        current = root
+        while True:
+            error_indication, error_status, error_index, var_binds = await self._async_command(
+                bulk_cmd, 0, max_repetitions, ObjectType(ObjectIdentity(".".join(str(arc) for arc in current)))
+            )
+            if error_indication:
+                raise PDUConfigurationException(f"{error_indication} - check your configuration and network connection")
+            if error_status:
+                raise PDUSNMPException(f"{error_status} error occurred for {oid}")
+            for name, value in var_binds:
+                name = tuple(name)
+                if isinstance(value, EndOfMibView) or name[:root_length] != root or name <= current:
+                    return values
+                values[name[root_length:]] = value
+                current = name
+            if not var_binds:
+                return values
+
+    def run(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        """
+        Run coroutine to completion in private event loop of the client.
+
+        :param coroutine: Coroutine to be awaited
+        :return: Result of coroutine
+        :raises PowerManagementException: when called from running event loop
+        """
+        if _get_running_loop() is not None:
+            coroutine.close()
+            raise PowerManagementException(
+                "Synchronous SNMP call is not allowed inside running event loop, use async_* methods instead"
+            )
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+            return self._loop.run_until_complete(coroutine)
+
+    def set(self, *var_binds: ObjectType) -> SnmpResult:
+        """
+        Send SNMP SET request with given variable bindings.
+
+        :param var_binds: Variable bindings to be set
+        :return: Tuple of error indication, error status, error index and variable bindings
+        """
+        return self.run(self.async_set(*var_binds))
+
+    def get(self, *var_binds: ObjectType) -> SnmpResult:
+        """
+        Send SNMP GET request for given variable bindings.
+
+        :param var_binds: Variable bindings to be read
+        :return: Tuple of error indication, error status, error index and variable bindings
+        """
+        return self.run(self.async_get(*var_binds))
+
+    def bulk_walk(self, oid: str, max_repetitions: int = 64) -> Dict[Tuple[int, ...], Any]:
+        """
+        Read all instances of MIB table column using GETBULK requests.
+
+        :param oid: SNMP Object Identifier of table column
+        :param max_repetitions: Number of instances requested in single GETBULK request
+        :return: Values of column for each instance index
+        :raises PDUConfigurationException: if there is a misconfiguration or timeout eg. wrong IP selected
+        :raises PDUSNMPException: if there is an error returned from remote device via SNMP
+        """
+        return self.run(self.async_bulk_walk(oid, max_repetitions))
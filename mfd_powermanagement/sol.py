@@ -0,0 +1,257 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: MIT
+"""Module for Serial-over-LAN console."""
+
+import logging
+import re
+import threading
+import time
+import typing
+from collections import deque
+from types import TracebackType
+from typing import Dict, List, Optional, Type
+
+from mfd_common_libs import add_logging_level, log_levels
+
+from .exceptions import PowerManagementException
+
+if typing.TYPE_CHECKING:
+    from mfd_connect import Connection
+    from mfd_connect.process import RemoteProcess
+
+logger = logging.getLogger(__name__)
+add_logging_level("MODULE_DEBUG", log_levels.MODULE_DEBUG)
+
+# Boot milestones printed on serial console, matched within single line
+BOOT_PATTERNS = {
+    "post_complete": r"Press \[?(F2|F12|DEL|ESC)\]?|BdsDxe: (loading|starting)|Booting from",
+    "bootloader": r"GNU GRUB|Loading Linux|Windows Boot Manager|ESXi .* boot",
+    "kernel": r"Linux version \d|Booting the kernel|Starting kernel",
+    "login_prompt": r"login:\s*$",
+}
+# Last characters of prompts printed without new line e.g. `login: `, `Password:`, `grub>`, `sh-5.1#`
+PROMPT_ENDINGS = tuple(":>#$?]")
+# Escape sequence terminating SOL session in ipmitool and ipmiutil
+SOL_ESCAPE = "\n~.\n"
+
+
+class SolPatternMatcher:
+    """
+    Incremental matcher of patterns in console output.
+
+    Output is fed in chunks of any size, down to single characters. Each pattern is matched within single line.
+    Line is searched when it ends and incomplete line (e.g. `login: ` prompt without new line) only when
+    chunk ends with prompt-like character, so output fed character by character isn't searched again
+    after each character. Last `max_line` characters of line are searched. Each pattern is reported once,
+    until :meth:`reset`.
+    """
+
+    def __init__(self, patterns: Dict[str, str], *, max_line: int = 1024) -> None:
+        """
+        Init of SolPatternMatcher.
+
+        :param patterns: Regular expressions by event name
+        :param max_line: Maximal length of line searched for patterns, longer lines are searched by their end
+        """
+        self._patterns = {name: re.compile(pattern) for name, pattern in patterns.items()}
+        self.max_line = max_line
+        self._line = ""
+        self.matches: Dict[str, str] = {}
+
+    @property
+    def names(self) -> List[str]:
+        """Names of patterns."""
+        return list(self._patterns)
+
+    def reset(self) -> None:
+        """Forget matched patterns and incomplete line."""
+        self._line = ""
+        self.matches = {}
+
+    def _search(self, matched: List[str]) -> None:
+        """
+        Search patterns, which weren't matched yet, in current line.
+
+        :param matched: Names of patterns matched by this search are appended to it
+        """
+        max_line = self.max_line
+        line = self._line[-max_line:]
+        for name, pattern in self._patterns.items():
+            if name in self.matches:
+                continue
+            match = pattern.search(line)
+            if match is not None:
+                self.matches[name] = match.group()
+                matched.append(name)
+
+    def feed(self, data: str) -> List[str]:
+        """
+        Search patterns in next chunk of output.
+
+        :param data: Next chunk of output
+        :return: Names of patterns matched for the first time
+        """
+        matched = []
+        max_line = self.max_line
+        pieces = re.split(r"[\r\n]", data)
+        for index, piece in enumerate(pieces):
+            self._line = f"{self._line}{piece}"
+            # line is trimmed once it's twice as long as searched part, not by every character
+            if len(self._line) > 2 * max_line:
+                self._line = self._line[-max_line:]
+            if index < len(pieces) - 1:
+                if self._line:
+                    self._search(matched)
+                self._line = ""
+            elif piece.rstrip()[-1:] in PROMPT_ENDINGS:
+                self._search(matched)
+        return matched
+
+
+class SolConsole:
+    """
+    Serial-over-LAN console read in background, signalling boot milestones as they are printed.
+
+    SOL session is activated once by command started through mfd_connect connection, e.g. `ipmitool ... sol activate`.
+    Output is fed to :class:`SolPatternMatcher` as it arrives and time of each matched event is stored,
+    so caller can continue right after milestone instead of waiting worst-case delay.
+
+    Usage example:
+    >>> with ipmi.sol() as console:
+    >>>     ipmi.set_state(state=IpmiStates.up)
+    >>>     console.wait_for("login_prompt", timeout=600)
+    """
+
+    def __init__(
+        self,
+        connection: "Connection",
+        command: str,
+        *,
+        patterns: Optional[Dict[str, str]] = None,
+        history: int = 64 * 1024,
+    ) -> None:
+        """
+        Init of SolConsole.
+
+        :param connection: Connection, on which SOL command is started
+        :param command: Command activating SOL session
+        :param patterns: Regular expressions by event name, BOOT_PATTERNS when not passed
+        :param history: Number of last characters of output kept in `output`
+        """
+        self._connection = connection
+        self._command = command
+        self._matcher = SolPatternMatcher(patterns if patterns is not None else BOOT_PATTERNS)
+        self._history = deque(maxlen=history)
+        self._events = threading.Condition()
+        self.events: Dict[str, float] = {}
+        self._eof = True
+        self._process: Optional["RemoteProcess"] = None
+
+    def __enter__(self) -> "SolConsole":
+        """Start console."""
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        __exc_type: Type[BaseException] | None,
+        __exc_value: BaseException | None,
+        __traceback: TracebackType | None,
+    ) -> None:
+        """Stop console."""
+        self.close()
+
+    @property
+    def running(self) -> bool:
+        """Whether SOL process is alive."""
+        return self._process is not None and not self._eof and self._process.running
+
+    @property
+    def output(self) -> str:
+        """Last characters of console output."""
+        with self._events:
+            return "".join(self._history)
+
+    def _read_output(self, process: "RemoteProcess") -> None:
+        """
+        Feed console output to matcher until end of stream, run in background thread.
+
+        :param process: SOL process
+        """
+        stream = process.stdout_stream
+        while True:
+            try:
+                char = stream.read(1)
+            except Exception as e:
+                logger.log(level=log_levels.MODULE_DEBUG, msg=f"Reading SOL console failed: {e}")
+                char = ""
+            with self._events:
+                if process is not self._process:
+                    return
+                if not char:
+                    self._eof = True
+                    self._events.notify_all()
+                    return
+                self._history.append(char)
+                matched = self._matcher.feed(char)
+                if matched:
+                    now = time.monotonic()
+                    for name in matched:
+                        self.events[name] = now
+                        logger.log(level=log_levels.MODULE_DEBUG, msg=f"SOL console event: {name}")
+                    self._events.notify_all()
+
+    def start(self) -> None:
+        """Activate SOL session, if it isn't running."""
+        if self.running:
+            return
+        self.close()
+        self._eof = False
+        self._process = self._connection.start_process(self._command, enable_input=True, stderr_to_stdout=True)
+        threading.Thread(target=self._read_output, args=(self._process,), name="sol-console", daemon=True).start()
+        logger.log(level=log_levels.MODULE_DEBUG, msg="Started SOL console")
+
+    def reset(self) -> None:
+        """Forget matched events, e.g. before next power action."""
+        with self._events:
+            self._matcher.reset()
+            self.events = {}
+
+    def wait_for(self, event: str, timeout: float) -> float:
+        """
+        Wait until console prints event.
+
+        :param event: Name of pattern
+        :param timeout: Time in seconds to wait
+        :return: Time of event, in seconds of `time.monotonic()`
+        :raises ValueError: when there is no pattern of that name
+        :raises PowerManagementException: when console exits or event isn't printed in time
+        """
+        if event not in self._matcher.names:
+            raise ValueError(f"Unknown SOL event {event}, available: {', '.join(self._matcher.names)}")
+        with self._events:
+            if not self._events.wait_for(lambda: event in self.events or self._eof, timeout):
+                raise PowerManagementException(f"SOL console didn't print {event} in {timeout} seconds")
+            if event not in self.events:
+                raise PowerManagementException(f"SOL console exited before {event}, output: {self.output[-200:]}")
+            return self.events[event]
+
+    def close(self) -> None:
+        """Terminate SOL session and its process."""
+        with self._events:
+            process, self._process = self._process, None
+            self._eof = True
+            self._events.notify_all()
+        if process is None or not process.running:
+            return
+        try:
+            process.stdin_stream.write(SOL_ESCAPE)
+            process.stdin_stream.flush()
+            process.wait(timeout=5)
+        except Exception as e:
+            logger.log(level=log_levels.MODULE_DEBUG, msg=f"Terminating SOL session failed: {e}")
+        if process.running:
+            try:
+                process.kill(wait=5)
+            except Exception as e:
+                logger.log(level=log_levels.MODULE_DEBUG, msg=f"Killing SOL console failed: {e}")
@@ -1,8 +1,12 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: MIT
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import dlipower
 import pytest
 import mfd_powermanagement.base
-from mfd_powermanagement import DLI, DliSocketPowerStates
+from mfd_powermanagement import DLI, DliBackend, DliSocketPowerStates
 from mfd_connect import Connection
 from mfd_typing import OSName
 
@@ -10,6 +14,7 @@ from mfd_typing import OSName
 @pytest.fixture()
 def prepare_connection_mocks(mocker):
     mocker.patch("dlipower.PowerSwitch", autospec=True)
+    mocker.patch("mfd_powermanagement.dli.DliRestClient.available", return_value=False)
     mocker.patch.object(mfd_powermanagement.base.PowerManagement, "_host", "127.0.0.1", create=True)
     mocker.patch.object(mfd_powermanagement.base.PowerManagement, "_username", create=True)
     mocker.patch.object(mfd_powermanagement.base.PowerManagement, "_password", create=True)
@@ -23,27 +28,64 @@ def prepare_connection_mocks(mocker):
 class TestDLI:
     def test_power_on(self, mocker, prepare_connection_mocks):
         dli = DLI(connection=prepare_connection_mocks, ip="127.0.0.1", username="admin", password="........")
-        mocker.patch.object(dli.wps, "on")
+        mocker.patch.object(dli.wps, "on", return_value=False)
 
-        dli.power_on(outlet_number=1)
+        assert dli.power_on(outlet_number=1) is True
 
         dli.wps.on.assert_called_once_with(outlet=1)
 
+    def test_power_on_failed(self, mocker, prepare_connection_mocks):
+        dli = DLI(connection=prepare_connection_mocks, ip="127.0.0.1", username="admin", password="........")
+        # dlipower returns True on failure
+        mocker.patch.object(dli.wps, "on", return_value=True)
+
+        assert dli.power_on(outlet_number=1) is False
+
     def test_power_off(self, mocker, prepare_connection_mocks):
         dli = DLI(connection=prepare_connection_mocks, ip="127.0.0.1", username="admin", password="........")
-        mocker.patch.object(dli.wps, "off")
+        mocker.patch.object(dli.wps, "off", return_value=False)
 
-        dli.power_off(outlet_number=4)
+        assert dli.power_off(outlet_number=4) is True
 
         dli.wps.off.assert_called_once_with(outlet=4)
 
     def test_power_cycle(self, mocker, prepare_connection_mocks):
         dli = DLI(connection=prepare_connection_mocks, ip="127.0.0.1", username="admin", password="........")
-        dli.wps.cycle = mocker.Mock()
+        sleep = mocker.patch("mfd_powermanagement.dli.time.sleep")
+        manager = mocker.Mock()
+        manager.attach_mock(dli.wps.off, "off")
+        manager.attach_mock(dli.wps.on, "on")
+        manager.attach_mock(sleep, "sleep")
+        dli.wps.off.return_value = False
+        dli.wps.on.return_value = False
+
+        assert dli.power_cycle(outlet_number=3, time_delay=1) is True
+
+        assert manager.mock_calls == [mocker.call.off(outlet=3), mocker.call.sleep(1), mocker.call.on(outlet=3)]
+        dli.wps.cycle.assert_not_called()
+
+    def test_power_cycle_off_failed(self, mocker, prepare_connection_mocks):
+        dli = DLI(connection=prepare_connection_mocks, ip="127.0.0.1", username="admin", password="........")
+        sleep = mocker.patch("mfd_powermanagement.dli.time.sleep")
+        dli.wps.off.return_value = True
 
-        dli.power_cycle(outlet_number=3, time_delay=1)
+        assert dli.power_cycle(outlet_number=3, time_delay=1) is False
 
-        dli.wps.cycle.assert_called_once_with(outlet=3)
+        sleep.assert_not_called()
+        dli.wps.on.assert_not_called()
+
+    def test_concurrent_power_cycle_per_call_delay(self, mocker, prepare_connection_mocks):
+        dli = DLI(connection=prepare_connection_mocks, ip="127.0.0.1", username="admin", password="........")
+        sleep = mocker.patch("mfd_powermanagement.dli.time.sleep")
+        dli.wps.off.return_value = False
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            for outlet in range(1, 5):
+                executor.submit(dli.power_cycle, outlet_number=outlet, time_delay=outlet * 10)
+
+        assert sorted(call.args[0] for call in sleep.call_args_list) == [10, 20, 30, 40]
+        assert sorted(call.kwargs["outlet"] for call in dli.wps.on.call_args_list) == [1, 2, 3, 4]
+        assert not hasattr(dli.wps, "cycletime")
 
     def test_set_state_on(self, mocker, prepare_connection_mocks):
         dli = DLI(connection=prepare_connection_mocks, ip="127.0.0.1", username="admin", password="........")
@@ -60,3 +102,113 @@ class TestDLI:
         dli.set_state(state=DliSocketPowerStates.off, outlet_number=7)
 
         dli.power_off.assert_called_once_with(outlet_number=7)
+
+
+class TestDliClient:
+    def test_init_without_network(self, mocker, prepare_connection_mocks):
+        power_switch = dlipower.PowerSwitch
+        available = mocker.patch("mfd_powermanagement.dli.DliRestClient.available")
+        dlis = [
+            DLI(connection=prepare_connection_mocks, ip="127.0.0.1", username="admin", password="........")
+            for _ in range(100)
+        ]
+        power_switch.assert_not_called()
+        available.assert_not_called()
+        assert all(dli._client is None for dli in dlis)
+
+    def test_shared_per_host_and_credentials(self, mocker, prepare_connection_mocks):
+        power_switch = dlipower.PowerSwitch
+        first = DLI(connection=prepare_connection_mocks, ip="127.0.0.1", username="admin", password="........")
+        second = DLI(connection=prepare_connection_mocks, ip="127.0.0.1", username="admin", password="........")
+        other = DLI(connection=prepare_connection_mocks, ip="127.0.0.1", username="user", password="........")
+        assert first.connect() is second.connect()
+        assert other.connect() is not first.connect()
+        assert power_switch.call_count == 2
+
+    def test_close(self, mocker, prepare_connection_mocks):
+        first = DLI(connection=prepare_connection_mocks, ip="127.0.0.1", username="admin", password="........")
+        second = DLI(connection=prepare_connection_mocks, ip="127.0.0.1", username="admin", password="........")
+        client = first.connect()
+        assert second.connect() is client
+        first.close()
+        assert client.connected
+        second.close()
+        assert not client.connected
+        assert first.connect() is not client
+
+    def test_dlipower_backend(self, mocker, prepare_connection_mocks):
+        available = mocker.patch("mfd_powermanagement.dli.DliRestClient.available")
+        dli = DLI(
+            connection=prepare_connection_mocks,
+            ip="127.0.0.1",
+            username="admin",
+            password="........",
+            backend=DliBackend.dlipower,
+        )
+        assert dli.rest is None
+        available.assert_not_called()
+
+    def test_lock_outlets(self, mocker, prepare_connection_mocks):
+        dli = DLI(connection=prepare_connection_mocks, ip="127.0.0.1", username="admin", password="........")
+        client = dli.connect()
+        locked = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with client.lock_outlets([2, 1]):
+                locked.set()
+                release.wait(5)
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        locked.wait(5)
+        with client.lock_outlets([3]):
+            pass
+        assert not client._outlet_locks[1].acquire(blocking=False)
+        release.set()
+        thread.join()
+        with client.lock_outlets([1, 3]):
+            assert client._outlet_locks[1].locked()
+
+
+class TestDLIBatch:
+    @pytest.fixture()
+    def dli(self, prepare_connection_mocks):
+        dli = DLI(connection=prepare_connection_mocks, ip="127.0.0.1", username="admin", password="........")
+        dli.wps.on.return_value = False
+        dli.wps.off.return_value = False
+        return dli
+
+    def test_set_states_dlipower(self, dli):
+        assert dli.set_states({1: DliSocketPowerStates.off, 2: DliSocketPowerStates.on, 3: DliSocketPowerStates.off})
+        assert [call.kwargs["outlet"] for call in dli.wps.off.call_args_list] == [1, 3]
+        dli.wps.on.assert_called_once_with(outlet=2)
+
+    def test_set_states_dlipower_failure(self, dli):
+        dli.wps.off.side_effect = [False, True]
+        assert dli.power_off_outlets([1, 2]) is False
+
+    @pytest.mark.parametrize("dlipower_result, expected", [(False, True), (True, False)])
+    def test_single_and_batch_results_agree(self, dli, dlipower_result, expected):
+        dli.wps.on.return_value = dlipower_result
+        dli.wps.off.return_value = dlipower_result
+        assert dli.power_on(outlet_number=1) is expected
+        assert dli.power_on_outlets([1]) is expected
+        assert dli.set_state(state=DliSocketPowerStates.off, outlet_number=1) is expected
+        assert dli.set_states({1: DliSocketPowerStates.off}) is expected
+        assert dli.power_off_outlets([1]) is expected
+
+    def test_power_cycle_outlets_single_delay(self, dli, mocker):
+        sleep = mocker.patch("mfd_powermanagement.dli.time.sleep")
+        manager = mocker.Mock()
+        manager.attach_mock(dli.wps.off, "off")
+        manager.attach_mock(dli.wps.on, "on")
+        manager.attach_mock(sleep, "sleep")
+        assert dli.power_cycle_outlets([1, 2], time_delay=15) is True
+        assert manager.mock_calls == [
+            mocker.call.off(outlet=1),
+            mocker.call.off(outlet=2),
+            mocker.call.sleep(15),
+            mocker.call.on(outlet=1),
+            mocker.call.on(outlet=2),
+        ]
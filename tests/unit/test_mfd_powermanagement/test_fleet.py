@@ -0,0 +1,185 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: MIT
+import asyncio
+import threading
+import time
+from functools import partial
+
+import pytest
+from mfd_connect import Connection
+from mfd_typing import OSName
+
+from mfd_powermanagement import APC, Ipmi, IpmiFleet, IpmiStates, PDUFleet, PDUStates
+from mfd_powermanagement.exceptions import (
+    PDUBatchException,
+    PDUConfigurationException,
+    PDUSNMPException,
+    PowerManagementException,
+)
+from mfd_powermanagement.ipmi import IpmiType
+
+
+class TestPDUFleet:
+    @pytest.fixture(autouse=True)
+    def mock_shared_engine(self, mocker):
+        return mocker.patch("mfd_powermanagement.fleet.shared_snmp_engine")
+
+    @pytest.fixture()
+    def track_concurrency(self):
+        in_flight = {"all": 0, "max_all": 0}
+
+        async def fake_set_states(pdu, states):
+            device = pdu._ip
+            in_flight["all"] += 1
+            in_flight[device] = in_flight.get(device, 0) + 1
+            in_flight["max_all"] = max(in_flight["max_all"], in_flight["all"])
+            in_flight[f"max_{device}"] = max(in_flight.get(f"max_{device}", 0), in_flight[device])
+            await asyncio.sleep(0.01)
+            in_flight["all"] -= 1
+            in_flight[device] -= 1
+
+        return in_flight, fake_set_states
+
+    def _make_pdus(self, fake_set_states, ips, count):
+        pdus = []
+        for ip in ips:
+            for _ in range(count):
+                pdu = APC(ip=ip)
+                pdu.async_set_states = partial(fake_set_states, pdu)
+                pdus.append(pdu)
+        return pdus
+
+    def test_invalid_limits(self):
+        with pytest.raises(ValueError):
+            PDUFleet(max_per_device=0)
+
+    def test_run_groups_outlets_per_pdu(self, mocker, mock_shared_engine):
+        pdu = APC(ip="10.10.10.10")
+        pdu.async_set_states = mocker.AsyncMock()
+        results = PDUFleet().run([(pdu, 1, PDUStates.off), (pdu, 2, PDUStates.on), (pdu, 1, PDUStates.on)])
+        assert pdu.async_set_states.await_args_list == [
+            mocker.call({1: PDUStates.off, 2: PDUStates.on}),
+            mocker.call({1: PDUStates.on}),
+        ]
+        assert [(result.outlet_number, result.state, result.success) for result in results] == [
+            (1, PDUStates.off, True),
+            (2, PDUStates.on, True),
+            (1, PDUStates.on, True),
+        ]
+        mock_shared_engine.assert_called_once()
+
+    def test_run_concurrency_limits(self, track_concurrency):
+        in_flight, fake_set_states = track_concurrency
+        pdus = self._make_pdus(fake_set_states, ["10.10.10.10", "10.10.10.11", "10.10.10.12"], 4)
+        results = PDUFleet(max_concurrency=4, max_per_device=2).run([(pdu, 1, PDUStates.off) for pdu in pdus])
+        assert all(result.success for result in results)
+        assert in_flight["max_all"] == 4
+        assert in_flight["max_10.10.10.10"] == 2
+        assert in_flight["max_10.10.10.11"] == 2
+
+    def test_run_partial_failure(self, mocker):
+        first_pdu = APC(ip="10.10.10.10")
+        second_pdu = APC(ip="10.10.10.11")
+        batch_error = PDUConfigurationException("Wrong outlet")
+        error = PDUSNMPException("Timeout")
+        first_pdu.async_set_states = mocker.AsyncMock(side_effect=PDUBatchException({2: batch_error}))
+        second_pdu.async_set_states = mocker.AsyncMock(side_effect=error)
+        results = PDUFleet().run(
+            [(first_pdu, 1, PDUStates.off), (second_pdu, 1, PDUStates.off), (first_pdu, 2, PDUStates.off)]
+        )
+        assert [result.pdu for result in results] == [first_pdu, second_pdu, first_pdu]
+        assert [result.error for result in results] == [None, error, batch_error]
+        assert [result.success for result in results] == [True, False, False]
+
+
+class TestIpmiFleet:
+    @pytest.fixture()
+    def connection(self, mocker):
+        conn = mocker.create_autospec(Connection)
+        conn.get_os_name.return_value = OSName.LINUX
+        return conn
+
+    def _make_ipmis(self, connection, count, ip="10.10.10.{}"):
+        return [
+            Ipmi(
+                connection=connection,
+                ip=ip.format(index),
+                username="user",
+                password="password",
+                ipmi_type=IpmiType.IPMITool,
+            )
+            for index in range(count)
+        ]
+
+    def test_invalid_limits(self):
+        with pytest.raises(ValueError):
+            IpmiFleet(attempts=0)
+
+    def test_unknown_action(self, connection):
+        with pytest.raises(ValueError):
+            IpmiFleet().run(self._make_ipmis(connection, 1), "explode")
+
+    def test_run_method_name(self, connection, mocker):
+        ipmis = self._make_ipmis(connection, 5)
+        for ipmi in ipmis:
+            ipmi.get_state = mocker.Mock(return_value=IpmiStates.up)
+        results = IpmiFleet().run(ipmis, "get_state")
+        assert [result.ipmi for result in results] == ipmis
+        assert all(result.success and result.result is IpmiStates.up and result.attempts == 1 for result in results)
+
+    def test_retry_isolated_per_target(self, connection, mocker):
+        ipmis = self._make_ipmis(connection, 3)
+        ipmis[0].power_down = mocker.Mock(side_effect=[PowerManagementException("busy"), None])
+        ipmis[1].power_down = mocker.Mock(side_effect=PowerManagementException("down"))
+        ipmis[2].power_down = mocker.Mock()
+        results = IpmiFleet(attempts=3, retry_delay=0).run(ipmis, "power_down")
+        assert [(result.success, result.attempts) for result in results] == [(True, 2), (False, 3), (True, 1)]
+        assert isinstance(results[1].error, PowerManagementException)
+
+    def test_unexpected_error_not_retried(self, connection, mocker):
+        action = mocker.Mock(side_effect=RuntimeError("bug"))
+        (result,) = IpmiFleet(attempts=3, retry_delay=0).run(self._make_ipmis(connection, 1), action)
+        assert isinstance(result.error, RuntimeError)
+        assert action.call_count == 1
+
+    def test_stream_in_completion_order(self, connection):
+        ipmis = self._make_ipmis(connection, 3)
+        delays = {id(ipmis[0]): 0.3, id(ipmis[1]): 0, id(ipmis[2]): 0.1}
+        results = IpmiFleet().stream(ipmis, lambda ipmi: time.sleep(delays[id(ipmi)]))
+        assert [result.ipmi for result in results] == [ipmis[1], ipmis[2], ipmis[0]]
+
+    def test_concurrency_limits(self, connection):
+        ipmis = self._make_ipmis(connection, 6, ip="10.10.10.{}") + self._make_ipmis(connection, 4, ip="10.10.20.1")
+        lock = threading.Lock()
+        in_flight = {"all": 0, "max_all": 0, "bmc": 0, "max_bmc": 0}
+
+        def action(ipmi):
+            shared = str(ipmi._host) == "10.10.20.1"
+            with lock:
+                in_flight["all"] += 1
+                in_flight["max_all"] = max(in_flight["max_all"], in_flight["all"])
+                if shared:
+                    in_flight["bmc"] += 1
+                    in_flight["max_bmc"] = max(in_flight["max_bmc"], in_flight["bmc"])
+            time.sleep(0.02)
+            with lock:
+                in_flight["all"] -= 1
+                in_flight["bmc"] -= shared
+
+        results = IpmiFleet(max_workers=4).run(ipmis, action)
+        assert all(result.success for result in results)
+        assert in_flight["max_all"] <= 4
+        assert in_flight["max_bmc"] == 1
+
+    def test_busy_bmc_does_not_block_workers(self, connection):
+        slow = self._make_ipmis(connection, 4, ip="10.10.20.1")
+        fast = self._make_ipmis(connection, 4, ip="10.10.10.{}")
+        finished = {}
+        start = time.monotonic()
+
+        def action(ipmi):
+            time.sleep(0.2 if ipmi in slow else 0.01)
+            finished[id(ipmi)] = time.monotonic() - start
+
+        IpmiFleet(max_workers=2).run(slow + fast, action)
+        assert max(finished[id(ipmi)] for ipmi in fast) < 0.2
@@ -0,0 +1,115 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: MIT
+import pytest
+from mfd_connect import Connection
+from mfd_typing import OSName
+
+from mfd_powermanagement import DLI
+from mfd_powermanagement.exceptions import PowerManagementException
+from mfd_powermanagement.inrush import InrushScheduler, InrushTarget
+from mfd_powermanagement.snmp import _shared_engine
+
+
+class TestInrushScheduler:
+    @pytest.fixture
+    def pdu(self, mocker):
+        device = mocker.Mock(spec=["async_power_on"])
+        device.async_power_on = mocker.AsyncMock()
+        return device
+
+    @pytest.fixture
+    def dli(self, mocker):
+        mocker.patch("dlipower.PowerSwitch", autospec=True)
+        mocker.patch("mfd_powermanagement.dli.DliRestClient.available", return_value=False)
+        connection = mocker.create_autospec(Connection)
+        connection.get_os_name.return_value = OSName.LINUX
+        device = DLI(connection=connection, host="127.0.0.1", username="admin", password="........")
+        # dlipower returns False on success
+        device.wps.on.return_value = False
+        yield device
+        device.close()
+
+    def test_plan_stagger_only(self, pdu):
+        scheduler = InrushScheduler(budgets={"A": 100}, min_stagger=0.5)
+        schedule = scheduler.plan([InrushTarget(pdu, outlet, "A") for outlet in range(1, 5)])
+        assert [entry.planned_start for entry in schedule] == [0, 0.5, 1.0, 1.5]
+
+    def test_plan_budget_limited(self, pdu):
+        scheduler = InrushScheduler(budgets={"A": 10}, min_stagger=0)
+        targets = [InrushTarget(pdu, outlet, "A", inrush=4, inrush_duration=2) for outlet in range(1, 6)]
+        schedule = scheduler.plan(targets)
+        assert [entry.planned_start for entry in schedule] == [0, 0, 2, 2, 4]
+
+    def test_plan_largest_first_fills_budget(self, pdu):
+        scheduler = InrushScheduler(budgets={"A": 10}, min_stagger=0)
+        targets = [
+            InrushTarget(pdu, 1, "A", inrush=3),
+            InrushTarget(pdu, 2, "A", inrush=7),
+            InrushTarget(pdu, 3, "A", inrush=6),
+            InrushTarget(pdu, 4, "A", inrush=4),
+        ]
+        schedule = scheduler.plan(targets)
+        assert [(entry.target.outlet_number, entry.planned_start) for entry in schedule] == [
+            (2, 0),
+            (1, 0),
+            (3, 1),
+            (4, 1),
+        ]
+
+    def test_plan_circuits_independent(self, pdu, dli):
+        scheduler = InrushScheduler(budgets={"A": 5}, min_stagger=1, default_budget=5)
+        schedule = scheduler.plan([InrushTarget(pdu, 1, "A", inrush=5), InrushTarget(dli, 1, "B", inrush=5)])
+        assert [entry.planned_start for entry in schedule] == [0, 0]
+
+    def test_plan_never_exceeds_budget(self, pdu):
+        scheduler = InrushScheduler(budgets={"A": 16}, min_stagger=0.1)
+        targets = [
+            InrushTarget(pdu, outlet, "A", inrush=1 + outlet % 7, inrush_duration=0.3 + outlet % 3 / 10)
+            for outlet in range(1, 30)
+        ]
+        schedule = scheduler.plan(targets)
+        starts = sorted(entry.planned_start for entry in schedule)
+        assert all(second - first >= 0.1 - 1e-9 for first, second in zip(starts, starts[1:]))
+        for entry in schedule:
+            load = sum(
+                other.target.inrush
+                for other in schedule
+                if other.planned_start <= entry.planned_start < other.planned_end - 1e-9
+            )
+            assert load <= 16
+
+    def test_plan_inrush_over_budget(self, pdu):
+        with pytest.raises(ValueError):
+            InrushScheduler(budgets={"A": 5}).plan([InrushTarget(pdu, 1, "A", inrush=6)])
+
+    def test_plan_missing_budget(self, pdu):
+        with pytest.raises(ValueError):
+            InrushScheduler(budgets={"A": 5}).plan([InrushTarget(pdu, 1, "B")])
+
+    def test_run(self, pdu, dli, mocker):
+        dli.wps.on.side_effect = [False, True]
+        scheduler = InrushScheduler(budgets={"A": 10, "B": 10}, min_stagger=0.01)
+        targets = [InrushTarget(pdu, outlet, "A", inrush=4, inrush_duration=0.02) for outlet in (1, 2, 3)]
+        targets += [InrushTarget(dli, outlet, "B") for outlet in (1, 2)]
+        timeline = scheduler.run(targets)
+        assert pdu.async_power_on.await_args_list == [mocker.call(outlet_number=n) for n in (1, 2, 3)]
+        assert dli.wps.on.call_args_list == [mocker.call(outlet=n) for n in (1, 2)]
+        for entry in timeline:
+            assert entry.start >= entry.planned_start
+            assert entry.end >= entry.start
+        starts = [entry.start for entry in timeline if entry.target.circuit == "A"]
+        assert starts[2] - starts[1] >= 0.01
+        first, second = [entry for entry in timeline if entry.target.circuit == "B"]
+        assert first.success
+        assert not second.success
+        assert isinstance(second.error, PowerManagementException)
+
+    def test_run_shares_snmp_engine(self, pdu):
+        engines = []
+        pdu.async_power_on.side_effect = lambda outlet_number: engines.append(_shared_engine.get())
+        scheduler = InrushScheduler(budgets={"A": 10}, min_stagger=0)
+        scheduler.run([InrushTarget(pdu, outlet, "A", inrush_duration=0) for outlet in (1, 2, 3)])
+        assert len(engines) == 3
+        assert engines[0] is not None
+        assert all(engine is engines[0] for engine in engines)
+        assert _shared_engine.get() is None
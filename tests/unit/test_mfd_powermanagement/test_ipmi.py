@@ -1,14 +1,48 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: MIT
+import io
+import sys
+import time
 from ipaddress import ip_address
+from pathlib import Path
+from subprocess import CalledProcessError
 
 import pytest
-from mfd_connect import Connection
+from mfd_connect import Connection, LocalConnection
 from mfd_typing import OSName
 
 from mfd_powermanagement import Ipmi, IpmiStates
-from mfd_powermanagement.exceptions import PowerManagementException
-from mfd_powermanagement.ipmi import IpmiType, ipmi_ver
+from mfd_powermanagement.exceptions import IpmiSessionException, PowerManagementException
+from mfd_powermanagement.ipmi import (
+    BATCH_MARKER,
+    IpmiBatch,
+    IpmiSensor,
+    IpmiToolShell,
+    IpmiType,
+    clear_tool_availability_cache,
+    ipmi_ver,
+    parse_sdr_list,
+)
+from mfd_powermanagement.retry import IpmiFailureKind, IpmiRetryPolicy
+
+CYCLE_REJECTED = "Set Chassis Power Control to Cycle failed: Command not supported in present state\n"
+
+FAKE_IPMITOOL_SHELL = """
+import sys
+sys.stdout.write("ipmitool> ")
+sys.stdout.flush()
+for line in sys.stdin:
+    command = line.strip()
+    if command == "exit":
+        break
+    if command == "crash":
+        sys.exit(1)
+    if command == "hang":
+        continue
+    print(f"Chassis Power Control: {command.split()[-1]}")
+    sys.stdout.write("ipmitool> ")
+    sys.stdout.flush()
+"""
 
 
 @pytest.mark.parametrize("ipmi_type", [IpmiType.IPMIUtil, IpmiType.IPMITool])
@@ -117,10 +151,88 @@ class TestIPMI:
             password="expected_password",
             ipmi_type=ipmi_type,
         )
+        sleep = mocker.patch("mfd_powermanagement.ipmi.time.sleep")
         with pytest.raises(PowerManagementException):
             ipmi.set_state(state=IpmiStates.up, retry_count=3)
         # 4 because +1 with retry_count, because of init
         assert connection.execute_command.call_count == 4
+        assert sleep.call_count == 2
+        assert [attempt.kind for attempt in ipmi.last_attempts] == [IpmiFailureKind.transient] * 3
+
+    def test_set_state_fatal_not_retried(self, connection, mocker, ipmi_type):
+        ipmi = Ipmi(
+            connection=connection,
+            ip="10.10.10.10",
+            username="expected_username",
+            password="expected_password",
+            ipmi_type=ipmi_type,
+        )
+        connection.execute_command.side_effect = CalledProcessError(
+            1, "ipmitool", output="", stderr="Error: RAKP 2 HMAC is invalid\n"
+        )
+        sleep = mocker.patch("mfd_powermanagement.ipmi.time.sleep")
+        with pytest.raises(PowerManagementException):
+            ipmi.set_state(state=IpmiStates.up, retry_count=3)
+        assert connection.execute_command.call_count == 2
+        sleep.assert_not_called()
+        assert ipmi.last_attempts[0].kind is IpmiFailureKind.fatal
+        assert "HMAC is invalid" in ipmi.last_attempts[0].output
+
+    def test_set_state_error_output(self, connection, mocker, ipmi_type):
+        ipmi = Ipmi(
+            connection=connection,
+            ip="10.10.10.10",
+            username="expected_username",
+            password="expected_password",
+            ipmi_type=ipmi_type,
+        )
+        connection.execute_command.side_effect = CalledProcessError(1, "ipmitool", output="", stderr=CYCLE_REJECTED)
+        sleep = mocker.patch("mfd_powermanagement.ipmi.time.sleep")
+        with pytest.raises(PowerManagementException):
+            ipmi.set_state(state=IpmiStates.cycle, retry_count=3)
+        sleep.assert_not_called()
+        assert [(attempt.success, attempt.kind) for attempt in ipmi.last_attempts] == [(False, IpmiFailureKind.fatal)]
+
+    @pytest.mark.parametrize(
+        "output",
+        [
+            "Get HPM.x Capabilities request failed, compcode = c9\nChassis Power Control: Up/On\n",
+            "lan2_validate_response: error, rseq 2 != 3\nipmiutil power, completed successfully\n",
+        ],
+    )
+    def test_set_state_success_with_noise(self, connection, mocker, ipmi_type, output):
+        ipmi = Ipmi(
+            connection=connection,
+            ip="10.10.10.10",
+            username="expected_username",
+            password="expected_password",
+            ipmi_type=ipmi_type,
+        )
+        connection.execute_command.return_value = mocker.Mock(stdout=output, stderr="")
+        sleep = mocker.patch("mfd_powermanagement.ipmi.time.sleep")
+        ipmi.set_state(state=IpmiStates.up, retry_count=3)
+        sleep.assert_not_called()
+        assert [attempt.success for attempt in ipmi.last_attempts] == [True]
+
+    def test_set_state_busy_then_success(self, connection, mocker, ipmi_type):
+        policy = IpmiRetryPolicy(base_delay=5, busy_delay=0.1, jitter=0)
+        ipmi = Ipmi(
+            connection=connection,
+            ip="10.10.10.10",
+            username="expected_username",
+            password="expected_password",
+            ipmi_type=ipmi_type,
+            retry_policy=policy,
+        )
+        busy, success = mocker.Mock(stdout="Node busy"), mocker.Mock(stdout="Chassis Power Control: Up/On")
+        connection.execute_command.side_effect = [busy, success]
+        sleep = mocker.patch("mfd_powermanagement.ipmi.time.sleep")
+        ipmi.set_state(state=IpmiStates.up, retry_count=3)
+        sleep.assert_called_once_with(0.1)
+        assert [(attempt.success, attempt.kind) for attempt in ipmi.last_attempts] == [
+            (False, IpmiFailureKind.busy),
+            (True, None),
+        ]
 
     def test_power_up(self, connection, mocker, ipmi_type):
         ipmi = Ipmi(
@@ -154,9 +266,711 @@ class TestIPMI:
             password="expected_password",
             ipmi_type=ipmi_type,
         )
-        ipmi.set_state = mocker.Mock()
-        mocker.patch("time.sleep", mocker.Mock())
+        manager = mocker.Mock()
+        ipmi.set_state = manager.set_state
+        ipmi.wait_for_state = manager.wait_for_state
         ipmi.powercycle()
-        ipmi.set_state.assert_any_call(state=IpmiStates.down, retry_count=3)
-        ipmi.set_state.assert_any_call(state=IpmiStates.up, retry_count=3)
-        assert ipmi.set_state.call_count == 2
+        assert manager.mock_calls == [
+            mocker.call.set_state(state=IpmiStates.down, retry_count=3),
+            mocker.call.wait_for_state(IpmiStates.down, timeout=60),
+            mocker.call.set_state(state=IpmiStates.up, retry_count=3),
+            mocker.call.wait_for_state(IpmiStates.up, timeout=60),
+        ]
+
+    def test_powercycle_native(self, connection, mocker, ipmi_type):
+        ipmi = Ipmi(
+            connection=connection,
+            ip="10.10.10.10",
+            username="expected_username",
+            password="expected_password",
+            ipmi_type=ipmi_type,
+        )
+        manager = mocker.Mock()
+        ipmi.set_state = manager.set_state
+        ipmi.wait_for_state = manager.wait_for_state
+        ipmi.powercycle(native_cycle=True)
+        assert manager.mock_calls == [
+            mocker.call.set_state(state=IpmiStates.cycle, retry_count=3),
+            mocker.call.wait_for_state(IpmiStates.down, timeout=60, max_interval=0.25),
+            mocker.call.wait_for_state(IpmiStates.up, timeout=60),
+        ]
+
+    def test_powercycle_native_fallback(self, connection, mocker, ipmi_type):
+        ipmi = Ipmi(
+            connection=connection,
+            ip="10.10.10.10",
+            username="expected_username",
+            password="expected_password",
+            ipmi_type=ipmi_type,
+        )
+        manager = mocker.Mock()
+        manager.set_state.side_effect = [PowerManagementException("Multiple failure on calls"), None, None]
+        ipmi.set_state = manager.set_state
+        ipmi.wait_for_state = manager.wait_for_state
+        ipmi.powercycle(native_cycle=True)
+        assert manager.mock_calls == [
+            mocker.call.set_state(state=IpmiStates.cycle, retry_count=3),
+            mocker.call.set_state(state=IpmiStates.down, retry_count=3),
+            mocker.call.wait_for_state(IpmiStates.down, timeout=60),
+            mocker.call.set_state(state=IpmiStates.up, retry_count=3),
+            mocker.call.wait_for_state(IpmiStates.up, timeout=60),
+        ]
+
+    def test_powercycle_native_not_confirmed(self, connection, mocker, ipmi_type):
+        ipmi = Ipmi(
+            connection=connection,
+            ip="10.10.10.10",
+            username="expected_username",
+            password="expected_password",
+            ipmi_type=ipmi_type,
+        )
+        manager = mocker.Mock()
+        manager.wait_for_state.side_effect = PowerManagementException("Chassis didn't reach state down")
+        ipmi.set_state = manager.set_state
+        ipmi.wait_for_state = manager.wait_for_state
+        with pytest.raises(PowerManagementException):
+            ipmi.powercycle(native_cycle=True)
+        assert manager.mock_calls == [
+            mocker.call.set_state(state=IpmiStates.cycle, retry_count=3),
+            mocker.call.wait_for_state(IpmiStates.down, timeout=60, max_interval=0.25),
+        ]
+
+    def test_powercycle_boot_event(self, connection, mocker, ipmi_type):
+        ipmi = Ipmi(
+            connection=connection,
+            ip="10.10.10.10",
+            username="expected_username",
+            password="expected_password",
+            ipmi_type=ipmi_type,
+        )
+        manager = mocker.Mock()
+        console = manager.console
+        console.__enter__ = mocker.Mock(return_value=console)
+        console.__exit__ = mocker.Mock(return_value=None)
+        mocker.patch("mfd_powermanagement.ipmi.SolConsole", return_value=console)
+        ipmi.set_state = manager.set_state
+        ipmi.wait_for_state = manager.wait_for_state
+        ipmi.powercycle(boot_event="login_prompt", boot_timeout=300)
+        assert manager.mock_calls == [
+            mocker.call.console.__enter__(),
+            mocker.call.set_state(state=IpmiStates.down, retry_count=3),
+            mocker.call.wait_for_state(IpmiStates.down, timeout=60),
+            mocker.call.console.reset(),
+            mocker.call.set_state(state=IpmiStates.up, retry_count=3),
+            mocker.call.wait_for_state(IpmiStates.up, timeout=60),
+            mocker.call.console.wait_for("login_prompt", timeout=300),
+            mocker.call.console.__exit__(None, None, None),
+        ]
+
+    def test_sol_command(self, connection, ipmi_type):
+        ipmi = Ipmi(
+            connection=connection,
+            ip="10.10.10.10",
+            username="expected_username",
+            password="expected_password",
+            ipmi_type=ipmi_type,
+        )
+        expected = {
+            IpmiType.IPMIUtil: "ipmiutil sol -a -F lan2 -N 10.10.10.10 -U expected_username -P expected_password",
+            IpmiType.IPMITool: "ipmitool -I lanplus -H 10.10.10.10 -U expected_username -P expected_password "
+            "sol activate",
+        }
+        assert ipmi.sol()._command == expected[ipmi_type]
+
+    @pytest.mark.parametrize(
+        "output, expected_state",
+        [
+            ("Chassis Power is on\n", IpmiStates.up),
+            ("Chassis Power is off\n", IpmiStates.down),
+            ("Chassis Status   = 01   (on, restore_policy=stay_off)\n", IpmiStates.up),
+            ("Chassis Status   = 00   (off, restore_policy=stay_off)\n", IpmiStates.down),
+        ],
+    )
+    def test_get_state(self, connection, mocker, ipmi_type, output, expected_state):
+        ipmi = Ipmi(
+            connection=connection,
+            ip="10.10.10.10",
+            username="expected_username",
+            password="expected_password",
+            ipmi_type=ipmi_type,
+        )
+        connection.execute_command.return_value.stdout = output
+        assert ipmi.get_state() is expected_state
+        if ipmi_type == IpmiType.IPMIUtil:
+            connection.execute_command.assert_called_with(
+                "ipmiutil health -F lan2 -N 10.10.10.10 -U expected_username -P expected_password"
+            )
+        elif ipmi_type == IpmiType.IPMITool:
+            connection.execute_command.assert_called_with(
+                "ipmitool -I lanplus -H 10.10.10.10 -U expected_username -P expected_password chassis power status"
+            )
+
+    def test_get_state_unknown_output(self, connection, ipmi_type):
+        ipmi = Ipmi(
+            connection=connection,
+            ip="10.10.10.10",
+            username="expected_username",
+            password="expected_password",
+            ipmi_type=ipmi_type,
+        )
+        connection.execute_command.return_value.stdout = "Error: Unable to establish IPMI v2 / RMCP+ session"
+        with pytest.raises(PowerManagementException):
+            ipmi.get_state()
+
+    def test_wait_for_state_retries_failed_command(self, connection, mocker, ipmi_type):
+        ipmi = Ipmi(
+            connection=connection,
+            ip="10.10.10.10",
+            username="expected_username",
+            password="expected_password",
+            ipmi_type=ipmi_type,
+        )
+        connection.execute_command.side_effect = [
+            CalledProcessError(1, "ipmitool", output="", stderr="Error: Unable to establish IPMI v2 / RMCP+ session\n"),
+            mocker.Mock(stdout="Chassis Power is on\n"),
+        ]
+        sleep = mocker.patch("mfd_powermanagement.ipmi.time.sleep")
+        ipmi.wait_for_state(IpmiStates.up, timeout=1)
+        sleep.assert_called_once_with(0.25)
+
+    def test_wait_for_state(self, connection, mocker, ipmi_type):
+        ipmi = Ipmi(
+            connection=connection,
+            ip="10.10.10.10",
+            username="expected_username",
+            password="expected_password",
+            ipmi_type=ipmi_type,
+        )
+        ipmi.get_state = mocker.Mock(
+            side_effect=[IpmiStates.up, PowerManagementException("timeout"), IpmiStates.up, IpmiStates.down]
+        )
+        sleep = mocker.patch("mfd_powermanagement.ipmi.time.sleep")
+        ipmi.wait_for_state(IpmiStates.down, timeout=60)
+        assert ipmi.get_state.call_count == 4
+        assert [call.args[0] for call in sleep.call_args_list] == [0.25, 0.5, 1]
+
+    def test_wait_for_state_timeout(self, connection, mocker, ipmi_type):
+        ipmi = Ipmi(
+            connection=connection,
+            ip="10.10.10.10",
+            username="expected_username",
+            password="expected_password",
+            ipmi_type=ipmi_type,
+        )
+        ipmi.get_state = mocker.Mock(return_value=IpmiStates.up)
+        with pytest.raises(PowerManagementException):
+            ipmi.wait_for_state(IpmiStates.down, timeout=0)
+        ipmi.get_state.assert_called_once_with()
+
+    def test_wait_for_state_invalid(self, connection, ipmi_type):
+        ipmi = Ipmi(
+            connection=connection,
+            ip="10.10.10.10",
+            username="expected_username",
+            password="expected_password",
+            ipmi_type=ipmi_type,
+        )
+        with pytest.raises(ValueError):
+            ipmi.wait_for_state(IpmiStates.cycle)
+
+
+class TestIPMIRMCPPlus:
+    @pytest.fixture()
+    def connection(self, mocker):
+        conn = mocker.create_autospec(Connection)
+        conn.get_os_name.return_value = OSName.LINUX
+        return conn
+
+    @pytest.fixture()
+    def session(self, mocker):
+        return mocker.patch("mfd_powermanagement.ipmi.RmcpPlusSession.shared").return_value
+
+    @pytest.fixture()
+    def ipmi(self, connection, session):
+        return Ipmi(
+            connection=connection,
+            ip="10.10.10.10",
+            username="expected_username",
+            password="expected_password",
+            ipmi_type=IpmiType.RMCPPlus,
+            port=6230,
+        )
+
+    def test_init_no_tool_check(self, ipmi, connection, mocker):
+        connection.execute_command.assert_not_called()
+        assert ipmi._session is None
+
+    def test_session_acquired_once(self, ipmi, session, mocker):
+        shared = mocker.patch("mfd_powermanagement.ipmi.RmcpPlusSession.shared", return_value=session)
+        assert ipmi.session is session
+        assert ipmi.session is session
+        shared.assert_called_once_with("10.10.10.10", "expected_username", "expected_password", port=6230)
+
+    def test_session_not_available_for_tool(self, connection):
+        ipmi = Ipmi(
+            connection=connection,
+            ip="10.10.10.10",
+            username="expected_username",
+            password="expected_password",
+            ipmi_type=IpmiType.IPMITool,
+        )
+        with pytest.raises(PowerManagementException):
+            ipmi.session
+
+    @pytest.mark.parametrize("state, control", [(IpmiStates.up, 1), (IpmiStates.down, 0), (IpmiStates.cycle, 2)])
+    def test_set_state(self, ipmi, session, connection, state, control):
+        ipmi.set_state(state=state)
+        session.chassis_control.assert_called_once_with(control)
+        connection.execute_command.assert_not_called()
+
+    def test_set_state_retry(self, ipmi, session, mocker):
+        mocker.patch("mfd_powermanagement.ipmi.time.sleep")
+        session.chassis_control.side_effect = [IpmiSessionException("No response"), None]
+        ipmi.set_state(state=IpmiStates.up, retry_count=3)
+        assert session.chassis_control.call_count == 2
+
+    def test_set_state_failure(self, ipmi, session, mocker):
+        mocker.patch("mfd_powermanagement.ipmi.time.sleep")
+        session.chassis_control.side_effect = IpmiSessionException("No response")
+        with pytest.raises(PowerManagementException):
+            ipmi.set_state(state=IpmiStates.up, retry_count=3)
+        assert session.chassis_control.call_count == 3
+
+    def test_get_state(self, ipmi, session):
+        session.get_chassis_status.return_value = False
+        assert ipmi.get_state() is IpmiStates.down
+
+    def test_close(self, ipmi, session):
+        ipmi.session
+        ipmi.close()
+        session.close.assert_called_once_with()
+        assert ipmi._session is None
+
+
+class TestIpmiToolChassis:
+    """Chassis which is off and rejects power cycle, as reported by ipmitool."""
+
+    @pytest.fixture()
+    def connection(self, mocker):
+        conn = mocker.create_autospec(Connection)
+        conn.get_os_name.return_value = OSName.LINUX
+        chassis = {"on": False}
+
+        def execute_command(command, **kwargs):
+            if command.endswith("chassis power cycle"):
+                raise CalledProcessError(1, command, output="", stderr=CYCLE_REJECTED)
+            if command.endswith("chassis power status"):
+                return mocker.Mock(stdout=f"Chassis Power is {'on' if chassis['on'] else 'off'}\n", stderr="")
+            if command.endswith("chassis power on"):
+                chassis["on"] = True
+                return mocker.Mock(stdout="Chassis Power Control: Up/On\n", stderr="")
+            if command.endswith("chassis power off"):
+                chassis["on"] = False
+                return mocker.Mock(stdout="Chassis Power Control: Down/Off\n", stderr="")
+            return mocker.Mock(stdout="", stderr="")
+
+        conn.execute_command.side_effect = execute_command
+        return conn
+
+    def test_powercycle_native_rejected_when_off(self, connection, mocker):
+        sleep = mocker.patch("mfd_powermanagement.ipmi.time.sleep")
+        ipmi = Ipmi(
+            connection=connection,
+            ip="10.10.10.10",
+            username="expected_username",
+            password="expected_password",
+            ipmi_type=IpmiType.IPMITool,
+        )
+        start = time.monotonic()
+        ipmi.powercycle(timeout=60, native_cycle=True)
+        assert time.monotonic() - start < 1
+        sleep.assert_not_called()
+        commands = [call.args[0].split("expected_password ")[-1] for call in connection.execute_command.call_args_list]
+        assert commands[1:] == [
+            "chassis power cycle",
+            "chassis power off",
+            "chassis power status",
+            "chassis power on",
+            "chassis power status",
+        ]
+
+
+class TestIPMIPersistentShell:
+    @pytest.fixture()
+    def connection(self, mocker):
+        conn = mocker.create_autospec(Connection)
+        conn.get_os_name.return_value = OSName.LINUX
+        return conn
+
+    def test_shell_command(self, connection, mocker):
+        shell = mocker.patch("mfd_powermanagement.ipmi.IpmiToolShell")
+        Ipmi(
+            connection=connection,
+            ip="10.10.10.10",
+            username="expected_username",
+            password="expected_password",
+            ipmi_type=IpmiType.IPMITool,
+            persistent_shell=True,
+        )
+        shell.assert_called_once_with(
+            connection, "ipmitool -I lanplus -H 10.10.10.10 -U expected_username -P expected_password shell"
+        )
+
+    def test_set_state(self, connection, mocker):
+        shell = mocker.patch("mfd_powermanagement.ipmi.IpmiToolShell").return_value
+        shell.execute.return_value = "Chassis Power Control: Up/On"
+        ipmi = Ipmi(
+            connection=connection,
+            ip="10.10.10.10",
+            username="expected_username",
+            password="expected_password",
+            ipmi_type=IpmiType.IPMITool,
+            persistent_shell=True,
+        )
+        ipmi.set_state(state=IpmiStates.up)
+        shell.execute.assert_called_once_with("chassis power on")
+        assert connection.execute_command.call_count == 1
+
+    def test_set_state_failure(self, connection, mocker):
+        shell = mocker.patch("mfd_powermanagement.ipmi.IpmiToolShell").return_value
+        shell.execute.side_effect = PowerManagementException("ipmitool shell exited")
+        mocker.patch("mfd_powermanagement.ipmi.time.sleep")
+        ipmi = Ipmi(
+            connection=connection,
+            ip="10.10.10.10",
+            username="expected_username",
+            password="expected_password",
+            ipmi_type=IpmiType.IPMITool,
+            persistent_shell=True,
+        )
+        with pytest.raises(PowerManagementException):
+            ipmi.set_state(state=IpmiStates.up, retry_count=3)
+        assert shell.execute.call_count == 3
+
+    def test_set_state_error_output(self, connection, mocker):
+        shell = mocker.patch("mfd_powermanagement.ipmi.IpmiToolShell").return_value
+        shell.execute.return_value = CYCLE_REJECTED
+        ipmi = Ipmi(
+            connection=connection,
+            ip="10.10.10.10",
+            username="expected_username",
+            password="expected_password",
+            ipmi_type=IpmiType.IPMITool,
+            persistent_shell=True,
+        )
+        with pytest.raises(PowerManagementException):
+            ipmi.set_state(state=IpmiStates.cycle, retry_count=3)
+        shell.execute.assert_called_once_with("chassis power cycle")
+        assert ipmi.last_attempts[0].kind is IpmiFailureKind.fatal
+
+    def test_get_state(self, connection, mocker):
+        shell = mocker.patch("mfd_powermanagement.ipmi.IpmiToolShell").return_value
+        shell.execute.return_value = "Chassis Power is on\n"
+        ipmi = Ipmi(
+            connection=connection,
+            ip="10.10.10.10",
+            username="expected_username",
+            password="expected_password",
+            ipmi_type=IpmiType.IPMITool,
+            persistent_shell=True,
+        )
+        assert ipmi.get_state() is IpmiStates.up
+        shell.execute.assert_called_once_with("chassis power status")
+
+    def test_ipmiutil_not_supported(self, connection):
+        with pytest.raises(ValueError):
+            Ipmi(
+                connection=connection,
+                ip="10.10.10.10",
+                username="expected_username",
+                password="expected_password",
+                ipmi_type=IpmiType.IPMIUtil,
+                persistent_shell=True,
+            )
+
+
+class TestIpmiToolShell:
+    @pytest.fixture()
+    def shell(self, tmp_path):
+        script = tmp_path / "ipmitool.py"
+        script.write_text(FAKE_IPMITOOL_SHELL)
+        with IpmiToolShell(LocalConnection(), f"{sys.executable} {script}", timeout=2) as shell:
+            yield shell
+
+    def test_execute(self, shell):
+        assert shell.execute("chassis power on") == "Chassis Power Control: on\n"
+        process = shell._process
+        assert shell.execute("chassis power off") == "Chassis Power Control: off\n"
+        assert shell._process is process
+
+    def test_restart_after_exit(self, shell):
+        with pytest.raises(PowerManagementException):
+            shell.execute("crash")
+        assert shell.execute("chassis power on") == "Chassis Power Control: on\n"
+        assert shell.restarts == 1
+
+    def test_stale_reader_after_restart(self, shell, mocker):
+        shell.execute("chassis power on")
+        old = shell._process
+        shell._start()
+        stale = mocker.Mock(stdout_stream=io.StringIO("Chassis Power Control: stale\n"))
+        shell._read_output(stale)
+        shell._read_output(old)
+        assert shell.running
+        assert shell._buffer == []
+        assert shell.execute("chassis power off") == "Chassis Power Control: off\n"
+
+    def test_hang(self, shell):
+        shell.timeout = 0.2
+        with pytest.raises(PowerManagementException):
+            shell.execute("hang")
+        assert not shell.running
+
+    def test_close(self, shell):
+        shell.execute("chassis power on")
+        process = shell._process
+        shell.close()
+        assert not process.running
+        assert not shell.running
+
+
+class TestIpmiBatch:
+    @pytest.fixture()
+    def connection(self, mocker, tmp_path):
+        conn = mocker.create_autospec(Connection)
+        conn.get_os_name.return_value = OSName.LINUX
+        conn.path.side_effect = lambda *args: tmp_path.joinpath(*args[1:])
+        return conn
+
+    @pytest.fixture()
+    def ipmi(self, connection):
+        return Ipmi(
+            connection=connection,
+            ip="10.10.10.10",
+            username="expected_username",
+            password="expected_password",
+            ipmi_type=IpmiType.IPMITool,
+        )
+
+    def test_run(self, ipmi, connection, tmp_path, mocker):
+        scripts = []
+
+        def execute_command(command, **kwargs):
+            script = tmp_path / command.split()[-1].rsplit("/", 1)[-1]
+            scripts.append(script.read_text())
+            return mocker.Mock(
+                stdout=f"Chassis Power Control: Down/Off\n{BATCH_MARKER} 0\n"
+                f"Set Boot Device to pxe\n{BATCH_MARKER} 1\nChassis Power is off\n{BATCH_MARKER} 2\n",
+                stderr="",
+            )
+
+        connection.execute_command.side_effect = execute_command
+        outputs = ipmi.batch().set_state(IpmiStates.down).add("chassis bootdev pxe").get_state().run()
+        assert outputs == ["Chassis Power Control: Down/Off\n", "Set Boot Device to pxe\n", "Chassis Power is off\n"]
+        assert scripts == [
+            f"chassis power off\necho {BATCH_MARKER} 0\nchassis bootdev pxe\necho {BATCH_MARKER} 1\n"
+            f"chassis power status\necho {BATCH_MARKER} 2\n"
+        ]
+        command = connection.execute_command.call_args.args[0]
+        assert command.startswith("ipmitool -I lanplus -H 10.10.10.10 -U expected_username -P expected_password exec ")
+        assert not list(tmp_path.iterdir())
+
+    def test_run_partial(self, ipmi, connection, mocker):
+        connection.execute_command.side_effect = None
+        connection.execute_command.return_value = mocker.Mock(
+            stdout=f"Chassis Power Control: Up/On\n{BATCH_MARKER} 0\n", stderr="Error: Unable to establish session\n"
+        )
+        batch = ipmi.batch().set_state(IpmiStates.up).get_state()
+        assert batch.run() == ["Chassis Power Control: Up/On\n", None]
+        assert batch.errors == "Error: Unable to establish session\n"
+
+    def test_split_output(self):
+        output = f"a\nb\n{BATCH_MARKER} 0\n{BATCH_MARKER} 1\nc\n"
+        assert IpmiBatch.split_output(output, 3) == ["a\nb\n", "", None]
+
+    def test_add_multiline(self, ipmi):
+        with pytest.raises(ValueError):
+            ipmi.batch().add("chassis power on\nchassis power off")
+
+    def test_shell(self, connection, mocker):
+        shell = mocker.patch("mfd_powermanagement.ipmi.IpmiToolShell").return_value
+        shell.execute.side_effect = lambda command: f"{command} done\n"
+        ipmi = Ipmi(
+            connection=connection,
+            ip="10.10.10.10",
+            username="expected_username",
+            password="expected_password",
+            ipmi_type=IpmiType.IPMITool,
+            persistent_shell=True,
+        )
+        assert ipmi.batch().set_state(IpmiStates.up).get_state().run() == [
+            "chassis power on done\n",
+            "chassis power status done\n",
+        ]
+        assert connection.execute_command.call_count == 1
+
+    def test_ipmiutil_not_supported(self, connection):
+        ipmi = Ipmi(
+            connection=connection,
+            ip="10.10.10.10",
+            username="expected_username",
+            password="expected_password",
+            ipmi_type=IpmiType.IPMIUtil,
+        )
+        with pytest.raises(PowerManagementException):
+            ipmi.batch()
+
+
+SDR_LIST = """CPU Temp         | 45 degrees C      | ok
+PS1 Input Power  | 120.50 Watts      | ok
+PS2 Status       | 0x00              | ok
+Fan 3            | no reading        | ns
+"""
+
+
+class TestIpmiSensors:
+    @pytest.fixture()
+    def connection(self, mocker, tmp_path):
+        conn = mocker.create_autospec(Connection)
+        conn.get_os_name.return_value = OSName.LINUX
+        conn.path.side_effect = lambda *args: tmp_path.joinpath(*args[1:])
+        return conn
+
+    @pytest.fixture()
+    def ipmi(self, connection, tmp_path):
+        return Ipmi(
+            connection=connection,
+            ip="10.10.10.10",
+            username="expected_username",
+            password="expected_password",
+            ipmi_type=IpmiType.IPMITool,
+            sdr_cache_dir=str(tmp_path),
+        )
+
+    @pytest.fixture()
+    def bmc(self, connection, mocker):
+        commands = []
+
+        def execute_command(command, **kwargs):
+            commands.append(command)
+            if command.endswith("mc info"):
+                return mocker.Mock(stdout="Device ID                 : 32\nFirmware Revision         : 2.61\n")
+            if " sdr dump " in command:
+                Path(command.split()[-1]).write_bytes(b"sdr")
+                return mocker.Mock(stdout="Dumping Sensor Data Repository to '...'\n")
+            return mocker.Mock(stdout=SDR_LIST)
+
+        connection.execute_command.side_effect = execute_command
+        return commands
+
+    def test_parse_sdr_list(self):
+        assert parse_sdr_list(SDR_LIST) == [
+            IpmiSensor(name="CPU Temp", value=45, unit="degrees C", status="ok"),
+            IpmiSensor(name="PS1 Input Power", value=120.5, unit="Watts", status="ok"),
+            IpmiSensor(name="PS2 Status", value=None, unit="0x00", status="ok"),
+            IpmiSensor(name="Fan 3", value=None, unit="no reading", status="ns"),
+        ]
+
+    def test_get_sensors_dumps_once(self, ipmi, bmc, tmp_path):
+        assert ipmi.get_sensors()[0] == IpmiSensor(name="CPU Temp", value=45, unit="degrees C", status="ok")
+        ipmi.get_sensors()
+        cache = tmp_path / "mfd-ipmi-sdr-10.10.10.10-2.61.bin"
+        prefix = "ipmitool -I lanplus -H 10.10.10.10 -U expected_username -P expected_password"
+        assert bmc == [
+            f"{prefix} mc info",
+            f"{prefix} sdr dump {cache}",
+            f"{prefix} -S {cache} sdr list full",
+            f"{prefix} -S {cache} sdr list full",
+        ]
+
+    def test_get_sensors_reuses_dump(self, ipmi, bmc, tmp_path):
+        (tmp_path / "mfd-ipmi-sdr-10.10.10.10-2.61.bin").write_bytes(b"sdr")
+        ipmi.get_sensors()
+        assert not any(" sdr dump " in command for command in bmc)
+
+    def test_clear_sdr_cache(self, ipmi, bmc, tmp_path):
+        ipmi.get_sensors()
+        ipmi.clear_sdr_cache()
+        assert not list(tmp_path.iterdir())
+        ipmi.get_sensors()
+        assert sum(" sdr dump " in command for command in bmc) == 2
+
+    def test_get_sensors_failure(self, ipmi, bmc, connection, tmp_path):
+        ipmi.get_sensors()
+        connection.execute_command.side_effect = CalledProcessError(1, "ipmitool", "", "Error loading SDR")
+        with pytest.raises(PowerManagementException):
+            ipmi.get_sensors()
+        assert ipmi._sdr_cache is None
+        assert not list(tmp_path.iterdir())
+
+    def test_get_sensors_shell(self, connection, mocker):
+        shell = mocker.patch("mfd_powermanagement.ipmi.IpmiToolShell").return_value
+        shell.execute.return_value = SDR_LIST
+        ipmi = Ipmi(
+            connection=connection,
+            ip="10.10.10.10",
+            username="expected_username",
+            password="expected_password",
+            ipmi_type=IpmiType.IPMITool,
+            persistent_shell=True,
+        )
+        assert len(ipmi.get_sensors()) == 4
+        shell.execute.assert_called_once_with("sdr list full")
+
+    def test_ipmiutil_not_supported(self, connection):
+        ipmi = Ipmi(
+            connection=connection,
+            ip="10.10.10.10",
+            username="expected_username",
+            password="expected_password",
+            ipmi_type=IpmiType.IPMIUtil,
+        )
+        with pytest.raises(PowerManagementException):
+            ipmi.get_sensors()
+
+
+class TestToolAvailabilityCache:
+    @pytest.fixture()
+    def connection(self, mocker):
+        conn = mocker.create_autospec(Connection)
+        conn.get_os_name.return_value = OSName.LINUX
+        conn.execute_command.return_value.stderr = ""
+        yield conn
+        clear_tool_availability_cache()
+
+    def _make_ipmi(self, connection, ipmi_type=IpmiType.IPMITool, ip="10.10.10.10"):
+        return Ipmi(connection=connection, ip=ip, username="user", password="password", ipmi_type=ipmi_type)
+
+    def test_probe_once_per_connection_and_tool(self, connection):
+        for index in range(5):
+            self._make_ipmi(connection, ip=f"10.10.10.{index}")
+        self._make_ipmi(connection, ipmi_type=IpmiType.IPMIUtil)
+        self._make_ipmi(connection, ipmi_type=IpmiType.IPMIUtil)
+        assert [call.args[0] for call in connection.execute_command.call_args_list] == [
+            ipmi_ver[IpmiType.IPMITool],
+            ipmi_ver[IpmiType.IPMIUtil],
+        ]
+
+    def test_probe_per_connection(self, connection, mocker):
+        other = mocker.create_autospec(Connection)
+        other.get_os_name.return_value = OSName.LINUX
+        other.execute_command.return_value.stderr = ""
+        self._make_ipmi(connection)
+        self._make_ipmi(other)
+        assert connection.execute_command.call_count == 1
+        assert other.execute_command.call_count == 1
+
+    def test_failure_not_cached(self, connection):
+        connection.execute_command.return_value.stderr = "ipmitool: command not found"
+        with pytest.raises(PowerManagementException):
+            self._make_ipmi(connection)
+        connection.execute_command.return_value.stderr = ""
+        self._make_ipmi(connection)
+        self._make_ipmi(connection)
+        assert connection.execute_command.call_count == 2
+
+    def test_invalidation(self, connection):
+        self._make_ipmi(connection)
+        clear_tool_availability_cache(connection)
+        self._make_ipmi(connection)
+        assert connection.execute_command.call_count == 2
@@ -1,9 +1,21 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: MIT
+import asyncio
+import itertools
+import math
+import threading
+
 import pytest
+from pysnmp.hlapi.v3arch import UsmUserData
 
-from mfd_powermanagement import APC, Raritan, PDUStates
-from mfd_powermanagement.exceptions import PowerManagementException, PDUConfigurationException, PDUSNMPException
+from mfd_powermanagement import APC, Raritan, PDUStates, PDUCompletionMode
+from mfd_powermanagement.pdu import PDUTelemetrySample, PDUTelemetrySampler, TelemetryRingBuffer
+from mfd_powermanagement.exceptions import (
+    PowerManagementException,
+    PDUBatchException,
+    PDUConfigurationException,
+    PDUSNMPException,
+)
 
 
 class TestPDU:
@@ -47,15 +59,14 @@ class TestPDU:
 
     @pytest.fixture
     def pdu(self):
-        return APC(ip="1.2.3.4")
+        return APC(ip="1.2.3.4", completion_mode=PDUCompletionMode.cool_down)
 
     @pytest.fixture(autouse=True)
     def mock_snmp_deps(self, monkeypatch):
-        monkeypatch.setattr("mfd_powermanagement.pdu.ObjectIdentity", lambda x: x)
-        monkeypatch.setattr("mfd_powermanagement.pdu.CommunityData", lambda x: x)
-        monkeypatch.setattr("mfd_powermanagement.pdu.ContextData", lambda: None)
-        monkeypatch.setattr("mfd_powermanagement.pdu.ObjectType", lambda *a: a)
-        monkeypatch.setattr("mfd_powermanagement.pdu.Integer32", lambda x: x)
+        monkeypatch.setattr(
+            "mfd_powermanagement.pdu.compile_var_bind",
+            lambda oid, value=None: (oid,) if value is None else (oid, value),
+        )
 
     @pytest.fixture
     def mock_logger(self, monkeypatch):
@@ -71,43 +82,33 @@ class TestPDU:
     def mock_sleep(self, monkeypatch):
         called = {}
 
-        def dummy_sleep(seconds):
+        async def dummy_sleep(seconds):
             called["called"] = True
 
-        monkeypatch.setattr("mfd_powermanagement.pdu.time.sleep", dummy_sleep)
+        monkeypatch.setattr("mfd_powermanagement.pdu.asyncio.sleep", dummy_sleep)
         return called
 
     @pytest.fixture
-    def mock_asyncio_run(self, monkeypatch):
-        def fake_asyncio_run(coro, *args, **kwargs):
-            # Will be patched per test
-            return None
-
-        monkeypatch.setattr("mfd_powermanagement.pdu.asyncio.run", fake_asyncio_run)
-        return fake_asyncio_run
-
-    def test_set_oid_success(self, pdu, monkeypatch, mock_logger, mock_sleep, mock_asyncio_run):
-        def fake_asyncio_run(coro, *args, **kwargs):
-            if "set_transport_target" in str(coro):
-                return None
-            return (None, None, None, ["oid=val"])
+    def mock_snmp_client(self, pdu, mocker):
+        client = mocker.Mock()
+        client.run.side_effect = asyncio.run
+        client.async_set = mocker.AsyncMock()
+        pdu._snmp_client = client
+        return client
 
-        monkeypatch.setattr("mfd_powermanagement.pdu.asyncio.run", fake_asyncio_run)
+    def test_set_oid_success(self, pdu, mock_logger, mock_sleep, mock_snmp_client):
+        mock_snmp_client.async_set.return_value = (None, None, None, ["oid=val"])
         pdu._set_oid(oid="1.2.3", instance_number=1, value="1")
+        mock_snmp_client.async_set.assert_called_once_with(("1.2.3.1", 1))
         assert hasattr(mock_logger, "called") or getattr(mock_logger, "called", False)
         assert mock_sleep["called"]
 
-    def test_set_oid_error_indication(self, pdu, monkeypatch, mock_asyncio_run):
-        def fake_asyncio_run(coro, *args, **kwargs):
-            if "set_transport_target" in str(coro):
-                return None
-            return ("error", None, None, [])
-
-        monkeypatch.setattr("mfd_powermanagement.pdu.asyncio.run", fake_asyncio_run)
+    def test_set_oid_error_indication(self, pdu, mock_snmp_client):
+        mock_snmp_client.async_set.return_value = ("error", None, None, [])
         with pytest.raises(PDUConfigurationException):
             pdu._set_oid(oid="1.2.3", instance_number=1, value="1")
 
-    def test_set_oid_error_status(self, pdu, monkeypatch, mock_asyncio_run):
+    def test_set_oid_error_status(self, pdu, mock_snmp_client):
         class DummyStatus:
             def __str__(self):
                 return "snmp error"
@@ -118,15 +119,251 @@ class TestPDU:
             def __bool__(self):
                 return True  # Ensure truthy
 
-        def fake_asyncio_run(coro, *args, **kwargs):
-            if "set_transport_target" in str(coro):
-                return None
-            return (None, DummyStatus(), 1, ["oid=val"])
-
-        monkeypatch.setattr("mfd_powermanagement.pdu.asyncio.run", fake_asyncio_run)
+        mock_snmp_client.async_set.return_value = (None, DummyStatus(), 1, ["oid=val"])
         with pytest.raises(PDUSNMPException):
             pdu._set_oid(oid="1.2.3", instance_number=1, value="1")
 
+    def test_set_oid_in_running_loop(self, pdu, mock_sleep, mock_snmp_client):
+        mock_snmp_client.async_set.return_value = (None, None, None, ["oid=val"])
+        asyncio.run(pdu._async_set_oid(oid="1.2.3", instance_number=1, value="1"))
+        mock_snmp_client.async_set.assert_awaited_once_with(("1.2.3.1", 1))
+        mock_snmp_client.run.assert_not_called()
+        assert mock_sleep["called"]
+
+    def test_async_set_state(self, mocker):
+        pdu = Raritan(ip="10.10.10.10", outlet_number=2)
+        pdu._async_set_oid = mocker.AsyncMock()
+        asyncio.run(pdu.async_set_state(state=PDUStates.off))
+        pdu._async_set_oid.assert_awaited_once_with(oid="1.3.6.1.4.1.13742.6.4.1.2.1.2.1", instance_number=2, value="0")
+
+    @pytest.mark.parametrize(
+        "method, state",
+        [("async_power_on", PDUStates.on), ("async_power_off", PDUStates.off), ("async_power_cycle", PDUStates.cycle)],
+    )
+    def test_async_power_methods(self, mocker, method, state):
+        pdu = APC(ip="10.10.10.10")
+        pdu.async_set_state = mocker.AsyncMock()
+        asyncio.run(getattr(pdu, method)(outlet_number=7))
+        pdu.async_set_state.assert_awaited_once_with(state=state, outlet_number=7)
+
+    def test_async_set_state_without_outlet_number(self):
+        pdu = APC(ip="10.10.10.10")
+        with pytest.raises(PowerManagementException):
+            asyncio.run(pdu.async_set_state(state=PDUStates.on))
+
+    @pytest.fixture
+    def mock_batch_client(self, pdu, mocker):
+        client = mocker.Mock()
+        client.run.side_effect = asyncio.run
+        client.async_set = mocker.AsyncMock()
+        client.message_overhead = 39
+        client.max_message_size = 1472
+        client.split_var_binds.side_effect = lambda sizes: [list(range(len(sizes)))]
+        pdu._snmp_client = client
+        return client
+
+    def test_set_states_single_request(self, pdu, mock_sleep, mock_batch_client):
+        mock_batch_client.async_set.return_value = (None, 0, 0, [])
+        pdu.set_states({1: PDUStates.off, 2: PDUStates.on, 3: PDUStates.cycle})
+        mock_batch_client.async_set.assert_awaited_once_with(
+            ("1.3.6.1.4.1.318.1.1.12.3.3.1.1.4.1", 2),
+            ("1.3.6.1.4.1.318.1.1.12.3.3.1.1.4.2", 1),
+            ("1.3.6.1.4.1.318.1.1.12.3.3.1.1.4.3", 3),
+        )
+        assert mock_sleep["called"]
+
+    def test_set_states_split_batches(self, pdu, mock_sleep, mock_batch_client):
+        mock_batch_client.split_var_binds.side_effect = lambda sizes: [[0, 1], [2]]
+        mock_batch_client.async_set.return_value = (None, 0, 0, [])
+        pdu.power_off_outlets([1, 2, 3])
+        assert mock_batch_client.async_set.await_count == 2
+        assert len(mock_batch_client.async_set.await_args_list[0].args) == 2
+        assert len(mock_batch_client.async_set.await_args_list[1].args) == 1
+
+    def test_set_states_error_index(self, pdu, mock_sleep, mock_batch_client):
+        mock_batch_client.async_set.side_effect = [("", 10, 2, []), (None, 0, 0, [])]
+        with pytest.raises(PDUBatchException) as exception:
+            pdu.power_on_outlets([1, 2, 3])
+        assert list(exception.value.errors) == [2]
+        assert isinstance(exception.value.errors[2], PDUSNMPException)
+        assert mock_batch_client.async_set.await_args_list[1].args == (
+            ("1.3.6.1.4.1.318.1.1.12.3.3.1.1.4.1", 1),
+            ("1.3.6.1.4.1.318.1.1.12.3.3.1.1.4.3", 1),
+        )
+        assert mock_sleep["called"]
+
+    def test_set_states_too_big(self, pdu, mock_sleep, mock_batch_client):
+        mock_batch_client.async_set.side_effect = [("", 1, 0, []), (None, 0, 0, []), (None, 0, 0, [])]
+        pdu.power_cycle_outlets([1, 2, 3, 4])
+        assert [len(call.args) for call in mock_batch_client.async_set.await_args_list] == [4, 2, 2]
+        assert mock_batch_client.max_message_size < 1472
+
+    def test_set_states_timeout(self, pdu, mock_sleep, mock_batch_client):
+        mock_batch_client.async_set.return_value = ("No SNMP response received before timeout", 0, 0, [])
+        with pytest.raises(PDUConfigurationException):
+            pdu.power_off_outlets([1, 2])
+        assert not mock_sleep
+
+    def test_status_oids(self):
+        assert APC.OUTLET_STATUS == "1.3.6.1.4.1.318.1.1.12.3.5.1.1.4"
+        assert (APC.ON_STATUS, APC.OFF_STATUS) == ("1", "2")
+        assert Raritan.OUTLET_STATUS == "1.3.6.1.4.1.13742.6.4.1.2.1.3.1"
+        assert (Raritan.ON_STATUS, Raritan.OFF_STATUS) == ("7", "8")
+
+    @pytest.mark.parametrize("value, state", [(1, PDUStates.on), (2, PDUStates.off)])
+    def test_get_state(self, pdu, mock_snmp_client, mocker, value, state):
+        mock_snmp_client.async_get = mocker.AsyncMock(return_value=(None, 0, 0, [("oid", value)]))
+        assert pdu.get_state(outlet_number=3) is state
+        mock_snmp_client.async_get.assert_awaited_once_with(("1.3.6.1.4.1.318.1.1.12.3.5.1.1.4.3",))
+
+    def test_get_state_unknown_status(self, pdu, mock_snmp_client, mocker):
+        mock_snmp_client.async_get = mocker.AsyncMock(return_value=(None, 0, 0, [("oid", 5)]))
+        with pytest.raises(PDUSNMPException):
+            pdu.get_state(outlet_number=3)
+
+    def test_get_state_error_indication(self, pdu, mock_snmp_client, mocker):
+        mock_snmp_client.async_get = mocker.AsyncMock(return_value=("timeout", 0, 0, []))
+        with pytest.raises(PDUConfigurationException):
+            pdu.get_state(outlet_number=3)
+
+    def test_get_state_not_supported(self, pdu, mock_snmp_client, monkeypatch):
+        monkeypatch.setattr(APC, "OUTLET_STATUS", None)
+        with pytest.raises(PowerManagementException):
+            pdu.get_state(outlet_number=3)
+
+    def test_get_outlet_states(self, mock_snmp_client, mocker):
+        pdu = Raritan(ip="10.10.10.10", snmp_client=mock_snmp_client)
+        mock_snmp_client.async_bulk_walk = mocker.AsyncMock(return_value={(1,): 7, (2,): 8, (3,): 7})
+        assert pdu.get_outlet_states() == {1: PDUStates.on, 2: PDUStates.off, 3: PDUStates.on}
+        mock_snmp_client.async_bulk_walk.assert_awaited_once_with("1.3.6.1.4.1.13742.6.4.1.2.1.3.1")
+
+    def test_get_outlet_states_cache(self, pdu, mock_snmp_client, mocker, mock_sleep):
+        mock_snmp_client.async_bulk_walk = mocker.AsyncMock(return_value={(1,): 1, (2,): 2})
+        first = pdu.get_outlet_states(cache_ttl=60)
+        first[1] = PDUStates.off
+        assert pdu.get_outlet_states(cache_ttl=60) == {1: PDUStates.on, 2: PDUStates.off}
+        assert mock_snmp_client.async_bulk_walk.await_count == 1
+        pdu.get_outlet_states()
+        assert mock_snmp_client.async_bulk_walk.await_count == 2
+        mock_snmp_client.async_set.return_value = (None, None, None, ["oid=val"])
+        pdu.power_on(outlet_number=2)
+        pdu.get_outlet_states(cache_ttl=60)
+        assert mock_snmp_client.async_bulk_walk.await_count == 3
+
+    @pytest.fixture
+    def polling_pdu(self, mocker, mock_sleep):
+        pdu = APC(ip="1.2.3.4", completion_timeout=1)
+        client = mocker.Mock()
+        client.run.side_effect = asyncio.run
+        client.async_set = mocker.AsyncMock(return_value=(None, 0, 0, ["oid=val"]))
+        client.message_overhead = 39
+        client.max_message_size = 1472
+        client.split_var_binds.side_effect = lambda sizes: [list(range(len(sizes)))]
+        pdu._snmp_client = client
+        return pdu
+
+    def test_set_state_poll_completion(self, polling_pdu, mocker):
+        polling_pdu.async_get_state = mocker.AsyncMock(side_effect=[PDUStates.on, PDUStates.on, PDUStates.off])
+        polling_pdu.power_off(outlet_number=3)
+        assert polling_pdu.async_get_state.await_count == 3
+        polling_pdu.async_get_state.assert_awaited_with(outlet_number=3)
+
+    def test_set_state_poll_cycle_completion(self, polling_pdu, mocker):
+        polling_pdu.async_get_state = mocker.AsyncMock(side_effect=[PDUStates.on, PDUStates.off])
+        polling_pdu.power_cycle(outlet_number=3)
+        assert polling_pdu.async_get_state.await_count == 2
+
+    def test_set_state_poll_timeout(self, polling_pdu, mocker):
+        polling_pdu.async_get_state = mocker.AsyncMock(return_value=PDUStates.on)
+        polling_pdu._completion_timeout = 0
+        with pytest.raises(PowerManagementException, match="didn't reach off state"):
+            polling_pdu.power_off(outlet_number=3)
+
+    def test_set_states_poll_completion(self, polling_pdu, mocker):
+        polling_pdu.async_get_outlet_states = mocker.AsyncMock(
+            side_effect=[{1: PDUStates.on, 2: PDUStates.on}, {1: PDUStates.off, 2: PDUStates.off}]
+        )
+        polling_pdu.power_off_outlets([1, 2])
+        assert polling_pdu.async_get_outlet_states.await_count == 2
+
+    def test_set_states_poll_timeout(self, polling_pdu, mocker):
+        polling_pdu.async_get_outlet_states = mocker.AsyncMock(return_value={1: PDUStates.off, 2: PDUStates.on})
+        polling_pdu._completion_timeout = 0
+        with pytest.raises(PDUBatchException) as exception:
+            polling_pdu.power_off_outlets([1, 2])
+        assert list(exception.value.errors) == [2]
+
+    def test_cool_down_without_status_oid(self, polling_pdu, mocker, mock_sleep, monkeypatch):
+        monkeypatch.setattr(APC, "OUTLET_STATUS", None)
+        polling_pdu.async_get_state = mocker.AsyncMock()
+        polling_pdu.power_on(outlet_number=3)
+        polling_pdu.async_get_state.assert_not_awaited()
+        assert mock_sleep["called"]
+
+    def test_snmp_client_created_once(self, mocker):
+        client_class = mocker.patch("mfd_powermanagement.pdu.SnmpClient")
+        pdu = APC(ip="10.10.10.10", udp_port=1161, community_string="string")
+        assert pdu.snmp_client is pdu.snmp_client
+        client_class.assert_called_once_with(ip="10.10.10.10", udp_port=1161, community_string="string", usm_user=None)
+
+    def test_snmp_client_v3(self, mocker):
+        client_class = mocker.patch("mfd_powermanagement.pdu.SnmpClient")
+        usm_user = UsmUserData("admin", "authpass123", "privpass123")
+        pdu = APC(ip="10.10.10.10", usm_user=usm_user)
+        assert pdu.snmp_client is client_class.return_value
+        client_class.assert_called_once_with(
+            ip="10.10.10.10", udp_port=161, community_string="private", usm_user=usm_user
+        )
+
+    def test_shared_snmp_client(self, mocker):
+        client_class = mocker.patch("mfd_powermanagement.pdu.SnmpClient")
+        pdu = Raritan(ip="10.10.10.10", share_snmp_client=True)
+        assert pdu.snmp_client is client_class.shared.return_value
+        client_class.shared.assert_called_once_with(
+            ip="10.10.10.10", udp_port=161, community_string="private", usm_user=None
+        )
+
+    def test_close_owned_snmp_client(self, pdu, mocker):
+        client = mocker.Mock()
+        pdu._snmp_client = client
+        with pdu:
+            pass
+        client.close.assert_called_once()
+        assert pdu._snmp_client is None
+
+    def test_close_not_owned_snmp_client(self, mocker):
+        client = mocker.Mock()
+        pdu = APC(ip="10.10.10.10", snmp_client=client)
+        pdu.close()
+        client.close.assert_not_called()
+        assert pdu.snmp_client is client
+
+    def test_set_transport_target_deprecated(self, mocker):
+        client_class = mocker.patch("mfd_powermanagement.pdu.SnmpClient")
+        pdu = APC(ip="10.10.10.10")
+        first = pdu.snmp_client
+        with pytest.deprecated_call():
+            asyncio.run(pdu.set_transport_target("10.10.10.11", 1161))
+        first.close.assert_called_once()
+        assert pdu.snmp_client is client_class.return_value
+        client_class.assert_called_with(ip="10.10.10.11", udp_port=1161, community_string="private", usm_user=None)
+
+    def test_set_transport_target_closes_client_outside_running_loop(self, mocker):
+        mocker.patch("mfd_powermanagement.pdu.SnmpClient")
+        pdu = APC(ip="10.10.10.10")
+        threads = []
+        pdu.snmp_client.close.side_effect = lambda: threads.append(threading.current_thread())
+        with pytest.deprecated_call():
+            asyncio.run(pdu.set_transport_target("10.10.10.11", 1161))
+        assert len(threads) == 1
+        assert threads[0] is not threading.current_thread()
+        assert pdu._snmp_client is None
+
+    def test_set_transport_target_not_owned_snmp_client(self, mocker):
+        pdu = APC(ip="10.10.10.10", snmp_client=mocker.Mock())
+        with pytest.deprecated_call(), pytest.raises(PowerManagementException):
+            asyncio.run(pdu.set_transport_target("10.10.10.11", 1161))
+
     def test_init_pdu_community(self):
         pdu = APC(ip="10.10.10.10")
         assert pdu._community_string == "private"
@@ -154,3 +391,140 @@ class TestPDU:
         match = "Missing outlet number value, not passed in constructor or method parameter"
         with pytest.raises(PowerManagementException, match=match):
             pdu.set_state(state=PDUStates.on)
+
+    def test_get_outlet_metering_apc(self, pdu, mock_snmp_client, mocker):
+        columns = {
+            "1.3.6.1.4.1.318.1.1.26.9.4.3.1.6": {(1,): 4, (2,): 12},
+            "1.3.6.1.4.1.318.1.1.26.9.4.3.1.7": {(1,): 50, (2,): 140},
+            "1.3.6.1.4.1.318.1.1.26.9.4.3.1.11": {(1,): 123},
+        }
+        mock_snmp_client.async_bulk_walk = mocker.AsyncMock(side_effect=lambda oid: columns[oid])
+        metering = pdu.get_outlet_metering()
+        assert list(metering) == [1, 2]
+        assert metering[1][1:] == pytest.approx((0.4, 50.0, 12.3))
+        assert metering[2].power == 140.0
+        assert math.isnan(metering[2].energy)
+        assert metering[1].timestamp == metering[2].timestamp
+
+    def test_get_outlet_metering_raritan_single_walk(self, mock_snmp_client, mocker):
+        pdu = Raritan(ip="10.10.10.10", snmp_client=mock_snmp_client)
+        mock_snmp_client.async_bulk_walk = mocker.AsyncMock(
+            return_value={(1, 1): 1500, (1, 4): 230, (1, 5): 320, (1, 8): 45000, (2, 1): 0, (2, 5): 0, (2, 8): 10}
+        )
+        metering = pdu.get_outlet_metering()
+        mock_snmp_client.async_bulk_walk.assert_awaited_once_with("1.3.6.1.4.1.13742.6.5.4.3.1.4.1")
+        assert metering[1][1:] == pytest.approx((1.5, 320.0, 45.0))
+        assert metering[2][1:] == pytest.approx((0.0, 0.0, 0.01))
+
+    def test_get_outlet_metering_not_supported(self, pdu, mock_snmp_client, monkeypatch):
+        monkeypatch.setattr(APC, "OUTLET_METERING", ())
+        with pytest.raises(PowerManagementException):
+            pdu.get_outlet_metering()
+
+
+class TestTelemetryRingBuffer:
+    def test_append_wraps(self):
+        buffer = TelemetryRingBuffer(3)
+        for number in range(5):
+            buffer.append(PDUTelemetrySample(number, number / 10, number * 10, number))
+        assert len(buffer) == 3
+        assert buffer.total == 5
+        assert [sample.timestamp for sample in buffer] == [2, 3, 4]
+        arrays = buffer.as_arrays()
+        assert list(arrays["power"]) == [20, 30, 40]
+        assert arrays["timestamp"].typecode == "d"
+
+    def test_samples_since(self):
+        buffer = TelemetryRingBuffer(3)
+        for number in range(5):
+            buffer.append(PDUTelemetrySample(number, 0, 0, 0))
+        assert [sample.timestamp for sample in buffer.samples_since(3)] == [3, 4]
+        assert [sample.timestamp for sample in buffer.samples_since(0)] == [2, 3, 4]
+        assert buffer.samples_since(5) == []
+
+    def test_partially_filled(self):
+        buffer = TelemetryRingBuffer(4)
+        buffer.append(PDUTelemetrySample(1, 2, 3, 4))
+        assert list(buffer) == [PDUTelemetrySample(1, 2, 3, 4)]
+        assert list(buffer.as_arrays()["energy"]) == [4]
+
+    def test_invalid_capacity(self):
+        with pytest.raises(ValueError):
+            TelemetryRingBuffer(0)
+
+    def test_read_while_appending(self):
+        buffer = TelemetryRingBuffer(50)
+
+        def append():
+            for number in range(20000):
+                buffer.append(PDUTelemetrySample(number, number, number, number))
+
+        thread = threading.Thread(target=append)
+        thread.start()
+        while thread.is_alive():
+            arrays = buffer.as_arrays()
+            assert list(arrays["timestamp"]) == list(arrays["energy"])
+            timestamps = [sample.timestamp for sample in buffer.samples_since(0)]
+            assert timestamps == sorted(timestamps)
+        thread.join()
+
+
+class TestPDUTelemetrySampler:
+    @pytest.fixture
+    def metered_pdu(self, mocker):
+        pdu = APC(ip="10.10.10.10")
+        counter = itertools.count()
+
+        def get_outlet_metering():
+            number = next(counter)
+            return {outlet: PDUTelemetrySample(number, 0.1, outlet * 10.0, number) for outlet in (1, 2, 3)}
+
+        pdu.get_outlet_metering = mocker.Mock(side_effect=get_outlet_metering)
+        return pdu
+
+    def test_sample_selected_outlets(self, metered_pdu):
+        sampler = PDUTelemetrySampler(metered_pdu, capacity=2, outlets=[1, 3])
+        for _ in range(3):
+            readings = sampler.sample()
+        assert list(readings) == [1, 3]
+        assert sorted(sampler.buffers) == [1, 3]
+        assert [sample.timestamp for sample in sampler.buffers[3]] == [1, 2]
+
+    def test_async_sample(self, metered_pdu, mocker):
+        metered_pdu.async_get_outlet_metering = mocker.AsyncMock(
+            return_value={1: PDUTelemetrySample(1.0, 0.5, 60.0, 1.0)}
+        )
+        sampler = PDUTelemetrySampler(metered_pdu)
+        asyncio.run(sampler.async_sample())
+        assert list(sampler.buffers[1]) == [PDUTelemetrySample(1.0, 0.5, 60.0, 1.0)]
+
+    def test_stream_background_sampling(self, metered_pdu):
+        with PDUTelemetrySampler(metered_pdu, interval=0.001, capacity=100) as sampler:
+            samples = list(itertools.islice(sampler.stream(outlet_number=2, timeout=5), 5))
+        assert not sampler.running
+        timestamps = [sample.timestamp for sample in samples]
+        assert timestamps == sorted(timestamps)
+        assert len(set(timestamps)) == 5
+        assert all(sample.power == 20.0 for sample in samples)
+
+    def test_stream_ends_after_stop(self, metered_pdu):
+        sampler = PDUTelemetrySampler(metered_pdu)
+        sampler.sample()
+        sampler.stop()
+        assert list(sampler.stream(outlet_number=1)) == []
+
+    def test_stream_not_started(self, metered_pdu):
+        sampler = PDUTelemetrySampler(metered_pdu)
+        sampler.sample()
+        samples = []
+        thread = threading.Thread(target=lambda: samples.extend(sampler.stream(outlet_number=1)), daemon=True)
+        thread.start()
+        thread.join(5)
+        assert not thread.is_alive()
+        assert samples == []
+
+    def test_background_errors_recorded(self, metered_pdu):
+        metered_pdu.get_outlet_metering.side_effect = PDUConfigurationException("timeout")
+        with PDUTelemetrySampler(metered_pdu, interval=0.001) as sampler:
+            assert list(sampler.stream(outlet_number=1, timeout=0.05)) == []
+        assert isinstance(sampler.last_error, PDUConfigurationException)
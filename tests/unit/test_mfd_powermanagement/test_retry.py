@@ -0,0 +1,54 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: MIT
+import pytest
+
+from mfd_powermanagement.retry import IpmiFailureKind, IpmiRetryPolicy
+
+
+class TestIpmiRetryPolicy:
+    @pytest.mark.parametrize(
+        "output, kind",
+        [
+            ("Error: Unable to establish IPMI v2 / RMCP+ session\nRAKP 2 HMAC is invalid", IpmiFailureKind.fatal),
+            ("RAKP 2 message indicates an error : unauthorized name", IpmiFailureKind.fatal),
+            ("Authentication of user admin failed, check password", IpmiFailureKind.fatal),
+            ("IPMI command 0x00/0x02 failed, completion code 0xd4", IpmiFailureKind.fatal),
+            ("Set Chassis Power Control to Up/On failed: Node busy", IpmiFailureKind.busy),
+            ("IPMI command 0x00/0x02 failed, completion code 0xc0", IpmiFailureKind.busy),
+            ("Error: Unable to establish IPMI v2 / RMCP+ session", IpmiFailureKind.transient),
+            ("No response from BMC 10.10.10.10:623", IpmiFailureKind.transient),
+            ("", IpmiFailureKind.transient),
+        ],
+    )
+    def test_classify(self, output, kind):
+        assert IpmiRetryPolicy().classify(output) is kind
+
+    def test_custom_patterns(self):
+        policy = IpmiRetryPolicy(fatal_patterns=[r"license expired"], busy_patterns=[r"firmware update"])
+        assert policy.classify("Error: license expired") is IpmiFailureKind.fatal
+        assert policy.classify("firmware update running") is IpmiFailureKind.busy
+
+    def test_exponential_backoff(self):
+        policy = IpmiRetryPolicy(base_delay=0.5, max_delay=3, jitter=0)
+        assert [policy.get_delay(attempt, IpmiFailureKind.transient) for attempt in range(1, 6)] == [
+            0.5,
+            1,
+            2,
+            3,
+            3,
+        ]
+
+    def test_jitter(self):
+        policy = IpmiRetryPolicy(base_delay=1, jitter=0.5, seed=1)
+        delays = {policy.get_delay(1, IpmiFailureKind.transient) for _ in range(20)}
+        assert len(delays) > 1
+        assert all(0.5 <= delay <= 1 for delay in delays)
+
+    def test_busy_and_fatal_delay(self):
+        policy = IpmiRetryPolicy(busy_delay=0.2, jitter=0)
+        assert policy.get_delay(5, IpmiFailureKind.busy) == 0.2
+        assert policy.get_delay(1, IpmiFailureKind.fatal) == 0
+
+    def test_invalid_jitter(self):
+        with pytest.raises(ValueError):
+            IpmiRetryPolicy(jitter=2)
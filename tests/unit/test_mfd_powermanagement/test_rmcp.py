@@ -0,0 +1,135 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: MIT
+import pytest
+
+from mfd_powermanagement.exceptions import IpmiSessionException
+from mfd_powermanagement.rmcp import (
+    PAYLOAD_IPMI,
+    RmcpPlusSession,
+    aes_cbc_decrypt,
+    aes_cbc_encrypt,
+    build_ipmi_message,
+    build_session_packet,
+    derive_session_keys,
+    parse_ipmi_message,
+    parse_session_packet,
+)
+from mfd_powermanagement.simulators import BMCSimulator
+
+
+class TestRmcpPackets:
+    def test_ipmi_message(self):
+        message = build_ipmi_message(0x00, 0x02, b"\x01", 5)
+        assert message == bytes([0x20, 0x00, 0xE0, 0x81, 0x14, 0x02, 0x01, 0x68])
+        assert parse_ipmi_message(message) == (0x00, 5, 0x02, b"\x01")
+
+    def test_ipmi_message_bad_checksum(self):
+        message = bytearray(build_ipmi_message(0x06, 0x3B, b"\x04", 1))
+        message[-1] ^= 0xFF
+        with pytest.raises(IpmiSessionException):
+            parse_ipmi_message(bytes(message))
+
+    @pytest.mark.parametrize("length", [0, 1, 15, 16, 31])
+    def test_aes_cbc_padding(self, length):
+        key = bytes(range(16))
+        data = bytes(range(length))
+        encrypted = aes_cbc_encrypt(key, data, iv=b"\x00" * 16)
+        assert len(encrypted) % 16 == 0
+        assert aes_cbc_decrypt(key, encrypted) == data
+
+    def test_session_packet_roundtrip(self):
+        integrity_key, confidentiality_key = derive_session_keys(b"\x11" * 20)
+        packet = build_session_packet(
+            PAYLOAD_IPMI,
+            b"payload",
+            session_id=0x1234,
+            sequence=7,
+            integrity_key=integrity_key,
+            confidentiality_key=confidentiality_key,
+        )
+        assert (len(packet) - 4 - 12) % 4 == 0
+        assert parse_session_packet(packet, integrity_key=integrity_key, confidentiality_key=confidentiality_key) == (
+            PAYLOAD_IPMI,
+            0x1234,
+            7,
+            b"payload",
+        )
+
+    def test_session_packet_tampered(self):
+        integrity_key, confidentiality_key = derive_session_keys(b"\x11" * 20)
+        packet = bytearray(
+            build_session_packet(
+                PAYLOAD_IPMI, b"payload", integrity_key=integrity_key, confidentiality_key=confidentiality_key
+            )
+        )
+        packet[20] ^= 0x01
+        with pytest.raises(IpmiSessionException, match="Integrity check"):
+            parse_session_packet(bytes(packet), integrity_key=integrity_key, confidentiality_key=confidentiality_key)
+
+    def test_session_packet_unauthenticated_in_session(self):
+        integrity_key, _ = derive_session_keys(b"\x11" * 20)
+        with pytest.raises(IpmiSessionException):
+            parse_session_packet(build_session_packet(PAYLOAD_IPMI, b"payload"), integrity_key=integrity_key)
+
+
+class TestRmcpPlusSession:
+    @pytest.fixture
+    def bmc(self):
+        with BMCSimulator(username="admin", password="secret", sensors={7: 42}) as bmc:
+            yield bmc
+
+    def test_session_reused(self, bmc):
+        with RmcpPlusSession(bmc.ip, "admin", "secret", port=bmc.port) as session:
+            session.chassis_control(0)
+            assert session.get_chassis_status() is False
+            assert session.get_sensor_reading(7) == 42
+            assert bmc.requests["open_session"] == 1
+            assert bmc.active_sessions == 1
+        assert bmc.active_sessions == 0
+        assert bmc.requests["close_session"] == 1
+
+    def test_session_reopened_after_expiry(self, bmc):
+        with RmcpPlusSession(bmc.ip, "admin", "secret", port=bmc.port, timeout=0.05, retries=1) as session:
+            session.chassis_control(0)
+            bmc.expire_sessions()
+            session.chassis_control(1)
+        assert bmc.controls == [0, 1]
+        assert bmc.requests["open_session"] == 2
+
+    def test_wrong_password(self, bmc):
+        with RmcpPlusSession(bmc.ip, "admin", "wrong", port=bmc.port) as session:
+            with pytest.raises(IpmiSessionException, match="Authentication"):
+                session.get_chassis_status()
+            assert not session.active
+
+    def test_unknown_user(self, bmc):
+        with RmcpPlusSession(bmc.ip, "nobody", "secret", port=bmc.port) as session:
+            with pytest.raises(IpmiSessionException, match="0x0d"):
+                session.get_chassis_status()
+
+    def test_completion_code(self, bmc):
+        with RmcpPlusSession(bmc.ip, "admin", "secret", port=bmc.port) as session:
+            with pytest.raises(IpmiSessionException) as exception:
+                session.get_sensor_reading(3)
+            assert exception.value.completion_code == 0xCB
+            assert bmc.requests["open_session"] == 1
+
+    def test_no_response(self, bmc):
+        bmc.loss = 1
+        with RmcpPlusSession(bmc.ip, "admin", "secret", port=bmc.port, timeout=0.02, retries=2) as session:
+            with pytest.raises(IpmiSessionException, match="No response"):
+                session.get_chassis_status()
+        assert bmc.requests["dropped"] == 3
+
+    def test_shared(self, bmc):
+        first = RmcpPlusSession.shared(bmc.ip, "admin", "secret", port=bmc.port)
+        second = RmcpPlusSession.shared(bmc.ip, "admin", "secret", port=bmc.port)
+        assert first is second
+        first.get_chassis_status()
+        first.close()
+        assert second.active
+        second.close()
+        assert not second.active
+        third = RmcpPlusSession.shared(bmc.ip, "admin", "secret", port=bmc.port)
+        assert third is not first
+        third.close()
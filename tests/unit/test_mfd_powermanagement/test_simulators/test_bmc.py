@@ -0,0 +1,109 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: MIT
+import time
+
+import pytest
+from mfd_connect import LocalConnection
+
+from mfd_powermanagement import Ipmi, IpmiStates
+from mfd_powermanagement.exceptions import PowerManagementException
+from mfd_powermanagement.ipmi import IpmiType
+from mfd_powermanagement.retry import IpmiFailureKind
+from mfd_powermanagement.simulators import BMCSimulator
+
+
+class TestBMCSimulator:
+    @pytest.fixture
+    def bmc(self):
+        with BMCSimulator(username="admin", password="secret", cycle_time=0.05) as bmc:
+            yield bmc
+
+    @pytest.fixture
+    def ipmi(self, bmc):
+        with Ipmi(
+            ip=bmc.ip,
+            username="admin",
+            password="secret",
+            ipmi_type=IpmiType.RMCPPlus,
+            port=bmc.port,
+            connection=LocalConnection(),
+        ) as ipmi:
+            yield ipmi
+
+    def test_power_down_and_up(self, ipmi, bmc):
+        ipmi.power_down()
+        assert bmc.power_on is False
+        ipmi.power_up()
+        assert bmc.power_on is True
+        assert bmc.requests["open_session"] == 1
+
+    def test_power_cycle(self, ipmi, bmc):
+        ipmi.set_state(state=IpmiStates.cycle)
+        assert ipmi.session.get_chassis_status() is False
+        time.sleep(0.1)
+        assert ipmi.session.get_chassis_status() is True
+
+    def test_powercycle_confirmed(self, ipmi, bmc):
+        start = time.monotonic()
+        ipmi.powercycle(timeout=5)
+        assert time.monotonic() - start < 2
+        assert bmc.controls == [0, 1]
+        assert bmc.requests["chassis_status"] == 2
+        assert ipmi.get_state() is IpmiStates.up
+
+    def test_powercycle_native(self, ipmi, bmc):
+        ipmi.powercycle(timeout=5, native_cycle=True)
+        assert bmc.controls == [2]
+        assert ipmi.get_state() is IpmiStates.up
+
+    def test_powercycle_native_rejected_when_off(self, ipmi, bmc, mocker):
+        mocker.patch("mfd_powermanagement.ipmi.time.sleep")
+        bmc.power_on = False
+        bmc.reject_cycle_when_off = True
+        ipmi.powercycle(timeout=5, native_cycle=True)
+        assert bmc.controls == [0, 1]
+        assert ipmi.last_attempts[0].success
+        assert bmc.power_on is True
+
+    def test_session_shared_between_objects(self, ipmi, bmc):
+        ipmi.power_down()
+        other = Ipmi(
+            ip=bmc.ip,
+            username="admin",
+            password="secret",
+            ipmi_type=IpmiType.RMCPPlus,
+            port=bmc.port,
+            connection=LocalConnection(),
+        )
+        other.power_up()
+        assert other.session is ipmi.session
+        other.close()
+        assert bmc.requests["open_session"] == 1
+        assert bmc.active_sessions == 1
+
+    def test_session_closed(self, bmc):
+        with Ipmi(
+            ip=bmc.ip,
+            username="admin",
+            password="secret",
+            ipmi_type=IpmiType.RMCPPlus,
+            port=bmc.port,
+            connection=LocalConnection(),
+        ) as ipmi:
+            ipmi.power_down()
+        assert bmc.active_sessions == 0
+
+    def test_wrong_password(self, bmc):
+        with Ipmi(
+            ip=bmc.ip,
+            username="admin",
+            password="wrong",
+            ipmi_type=IpmiType.RMCPPlus,
+            port=bmc.port,
+            connection=LocalConnection(),
+        ) as ipmi:
+            with pytest.raises(PowerManagementException):
+                ipmi.set_state(state=IpmiStates.up, retry_count=2)
+        assert bmc.requests["open_session"] == 1
+        assert ipmi.last_attempts[0].kind is IpmiFailureKind.fatal
+        assert bmc.controls == []
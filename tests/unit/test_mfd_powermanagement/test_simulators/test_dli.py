@@ -0,0 +1,171 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: MIT
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from mfd_connect import LocalConnection
+
+from mfd_powermanagement import DLI, DliBackend, DliSocketPowerStates
+from mfd_powermanagement.dli import DliRestClient
+from mfd_powermanagement.exceptions import PowerManagementException
+from mfd_powermanagement.simulators import DLISimulator
+
+
+class TestDLISimulator:
+    @pytest.fixture
+    def switch(self):
+        with DLISimulator(username="admin", password="secret", outlets=8) as switch:
+            yield switch
+
+    @pytest.fixture
+    def dli(self, switch):
+        dli = DLI(host=f"{switch.ip}:{switch.port}", username="admin", password="secret", connection=LocalConnection())
+        yield dli
+        dli.close()
+
+    def test_rest_backend_selected(self, dli):
+        assert dli.rest is not None
+        assert dli.wps is None
+
+    def test_power_off_and_on(self, dli, switch):
+        assert dli.power_off(outlet_number=3) is True
+        assert switch.states == [True, True, False, True, True, True, True, True]
+        assert dli.set_state(state=DliSocketPowerStates.on, outlet_number=3) is True
+        assert all(switch.states)
+
+    def test_keep_alive(self, dli, switch):
+        for outlet in range(1, 9):
+            dli.power_off(outlet_number=outlet)
+        assert not any(switch.states)
+        assert switch.requests["connection"] == 1
+        assert switch.requests["set_state"] == 8
+
+    def test_multi_outlet(self, dli, switch):
+        dli.rest.set_states([1, 2, 5], False)
+        assert switch.states == [False, False, True, True, False, True, True, True]
+        assert switch.requests["set_state"] == 1
+        assert dli.rest.get_states() == switch.states
+
+    def test_power_cycle(self, dli, switch):
+        start = time.monotonic()
+        assert dli.power_cycle(outlet_number=2, time_delay=0.1) is True
+        assert time.monotonic() - start >= 0.1
+        assert all(switch.states)
+        assert switch.requests["set_state"] == 2
+
+    def test_wrong_password(self, switch):
+        dli = DLI(
+            host=f"{switch.ip}:{switch.port}",
+            username="admin",
+            password="wrong",
+            connection=LocalConnection(),
+            backend=DliBackend.rest,
+        )
+        with pytest.raises(PowerManagementException):
+            dli.connect()
+
+    def test_missing_csrf_header(self, switch):
+        client = DliRestClient(f"{switch.ip}:{switch.port}", "admin", "secret")
+        del client.headers["X-CSRF"]
+        with pytest.raises(PowerManagementException):
+            client.set_states([1], False)
+        assert switch.requests["forbidden"] == 1
+        client.close()
+
+    def test_fallback_to_dlipower(self, mocker):
+        power_switch = mocker.patch("dlipower.PowerSwitch", autospec=True)
+        with DLISimulator(username="admin", password="secret", rest=False) as switch:
+            host = f"{switch.ip}:{switch.port}"
+            dli = DLI(host=host, username="admin", password="secret", connection=LocalConnection())
+            assert dli.rest is None
+        power_switch.assert_called_once_with(hostname=host, userid="admin", password="secret")
+
+    def test_rest_required(self):
+        with DLISimulator(username="admin", password="secret", rest=False) as switch:
+            dli = DLI(
+                host=f"{switch.ip}:{switch.port}",
+                username="admin",
+                password="secret",
+                connection=LocalConnection(),
+                backend=DliBackend.rest,
+            )
+            with pytest.raises(PowerManagementException):
+                dli.power_on(outlet_number=1)
+
+    def test_lazy_connection(self, switch):
+        dli = DLI(host=f"{switch.ip}:{switch.port}", username="admin", password="secret", connection=LocalConnection())
+        assert switch.requests["connection"] == 0
+        dli.power_off(outlet_number=1)
+        assert switch.requests["connection"] == 1
+        dli.close()
+
+    def test_client_shared(self, switch):
+        host = f"{switch.ip}:{switch.port}"
+        with DLI(host=host, username="admin", password="secret", connection=LocalConnection()) as first:
+            with DLI(host=host, username="admin", password="secret", connection=LocalConnection()) as second:
+                first.power_off(outlet_number=1)
+                second.power_off(outlet_number=2)
+                assert first.connect() is second.connect()
+            assert first.rest is not None
+            first.power_on(outlet_number=1)
+        assert switch.requests["list"] == 1
+        assert switch.requests["connection"] == 1
+
+    def test_set_states(self, dli, switch):
+        assert dli.set_states({1: DliSocketPowerStates.off, 2: DliSocketPowerStates.off, 3: DliSocketPowerStates.on})
+        assert switch.states[:3] == [False, False, True]
+        assert switch.requests["set_state"] == 2
+
+    def test_power_off_and_on_outlets(self, dli, switch):
+        assert dli.power_off_outlets(range(1, 9))
+        assert not any(switch.states)
+        assert dli.power_on_outlets(range(1, 9))
+        assert all(switch.states)
+        assert switch.requests["set_state"] == 2
+
+    def test_power_cycle_outlets(self, dli, switch, mocker):
+        sleep = mocker.patch("mfd_powermanagement.dli.time.sleep")
+        assert dli.power_cycle_outlets(range(1, 9), time_delay=15)
+        sleep.assert_called_once_with(15)
+        assert all(switch.states)
+        assert switch.requests["set_state"] == 2
+
+    def test_concurrent_power_cycle(self, dli, switch):
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(
+                executor.map(lambda outlet: dli.power_cycle(outlet_number=outlet, time_delay=0.2), range(1, 9))
+            )
+        assert all(results)
+        assert time.monotonic() - start < 1.6
+        assert all(switch.states)
+        assert switch.requests["set_state"] == 16
+        assert dli.rest.session_count <= dli.rest.pool_size
+        assert switch.requests["connection"] <= dli.rest.pool_size
+
+    def test_same_outlet_serialized(self, dli, switch, mocker):
+        order = []
+        set_states = dli.rest.set_states
+
+        def record(outlets, state):
+            order.append(state)
+            return set_states(outlets, state)
+
+        mocker.patch.object(dli.rest, "set_states", side_effect=record)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            for _ in range(4):
+                executor.submit(dli.power_cycle, outlet_number=1, time_delay=0.05)
+        assert order == [False, True] * 4
+        assert switch.states[0] is True
+
+    def test_session_pool_bounded(self, switch):
+        switch.response_delay = 0.05
+        client = DliRestClient(f"{switch.ip}:{switch.port}", "admin", "secret", pool_size=2)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda outlet: client.set_states([outlet], False), range(1, 9)))
+        assert not any(switch.states)
+        assert client.session_count == 2
+        assert switch.requests["connection"] == 2
+        client.close()
+        assert client.session_count == 0
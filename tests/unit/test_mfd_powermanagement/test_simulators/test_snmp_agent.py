@@ -0,0 +1,103 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: MIT
+import asyncio
+import gc
+import warnings
+
+import pytest
+
+from mfd_powermanagement import APC, PDUCompletionMode, PDUFleet, PDUStates, Raritan
+from mfd_powermanagement.exceptions import PDUConfigurationException, PDUSNMPException
+from mfd_powermanagement.simulators import PDUAgentSimulator
+
+
+class TestPDUAgentSimulator:
+    @pytest.fixture(params=[APC, Raritan])
+    def vendor(self, request):
+        return request.param
+
+    @pytest.fixture
+    def agent(self, vendor):
+        with PDUAgentSimulator(vendor=vendor, outlet_count=24, relay_latency=0.01) as agent:
+            yield agent
+
+    @pytest.fixture
+    def pdu(self, vendor, agent):
+        with vendor(ip=agent.ip, udp_port=agent.port, completion_timeout=5) as pdu:
+            yield pdu
+
+    def test_power_off_and_read_state(self, pdu, agent):
+        pdu.power_off(outlet_number=3)
+        assert agent.outlet_states[3] is PDUStates.off
+        assert pdu.get_state(outlet_number=3) is PDUStates.off
+        assert pdu.get_state(outlet_number=4) is PDUStates.on
+
+    def test_batch_single_request(self, pdu, agent):
+        pdu.power_off_outlets(range(1, 25))
+        assert agent.set_sizes == [24]
+        assert set(pdu.get_outlet_states().values()) == {PDUStates.off}
+        assert agent.requests["getbulk"] >= 1
+
+    def test_batch_too_big_split(self, pdu, agent):
+        agent.max_message_size = 400
+        pdu.power_off_outlets(range(1, 25))
+        assert agent.set_sizes[0] == 24
+        assert all(size < 24 for size in agent.set_sizes[1:])
+        assert set(agent.outlet_states.values()) == {PDUStates.off}
+        assert len(pdu.get_outlet_states()) == 24
+
+    def test_wrong_outlet(self, pdu, agent):
+        with pytest.raises(PDUSNMPException):
+            pdu.power_on(outlet_number=25)
+        assert agent.set_sizes == [1]
+
+    def test_power_cycle(self, pdu, agent):
+        pdu.power_cycle(outlet_number=2)
+        assert agent.requests["set"] == 1
+
+    def test_metering(self, pdu, agent):
+        agent.set_metering(5, current=1.5, power=170, energy=3.2)
+        sample = pdu.get_outlet_metering()[5]
+        assert (sample.current, sample.power, sample.energy) == pytest.approx((1.5, 170, 3.2))
+
+    def test_no_socket_left_after_asyncio_run(self, vendor, agent):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always", ResourceWarning)
+            with vendor(ip=agent.ip, udp_port=agent.port, completion_timeout=5) as pdu:
+                for _ in range(3):
+                    asyncio.run(pdu.async_power_off(outlet_number=1))
+                assert pdu._snmp_client.closed
+            gc.collect()
+        assert agent.outlet_states[1] is PDUStates.off
+        assert not [warning for warning in caught if issubclass(warning.category, ResourceWarning)]
+
+    def test_fleet(self, vendor, agent):
+        pdus = [vendor(ip=agent.ip, udp_port=agent.port) for _ in range(3)]
+        targets = [
+            (pdu, outlet, PDUStates.off)
+            for number, pdu in enumerate(pdus)
+            for outlet in range(number * 8 + 1, number * 8 + 9)
+        ]
+        results = PDUFleet(max_per_device=2).run(targets)
+        assert all(result.success for result in results)
+        assert set(agent.outlet_states.values()) == {PDUStates.off}
+        for pdu in pdus:
+            pdu.close()
+
+    def test_packet_loss_retried(self):
+        with PDUAgentSimulator(outlet_count=8, loss=0.5, seed=3) as agent:
+            with APC(ip=agent.ip, udp_port=agent.port, completion_mode=PDUCompletionMode.cool_down) as pdu:
+                pdu.snmp_client._timeout = 0.05
+                pdu.COOL_DOWN_TIME = 0
+                pdu.power_off_outlets(range(1, 9))
+            assert agent.requests["dropped"] >= 1
+            assert set(agent.outlet_states.values()) == {PDUStates.off}
+
+    def test_wrong_community_timeout(self):
+        with PDUAgentSimulator(community_string="secret") as agent:
+            with APC(ip=agent.ip, udp_port=agent.port) as pdu:
+                pdu.snmp_client._timeout = 0.01
+                pdu.snmp_client._retries = 0
+                with pytest.raises(PDUConfigurationException):
+                    pdu.get_state(outlet_number=1)
+            assert agent.requests["bad_community"] == 1
@@ -0,0 +1,279 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: MIT
+import asyncio
+
+import pytest
+from pysnmp.hlapi.v3arch import USM_AUTH_HMAC96_SHA, USM_KEY_TYPE_LOCALIZED, USM_PRIV_CFB128_AES, UsmUserData
+from pysnmp.proto import errind
+from pysnmp.proto.rfc1902 import ObjectName
+from pysnmp.proto.rfc1905 import EndOfMibView
+
+from mfd_powermanagement.exceptions import PDUConfigurationException, PowerManagementException
+from mfd_powermanagement.snmp import (
+    SnmpClient,
+    _engine_ids,
+    compile_var_bind,
+    _localized_keys,
+    clear_engine_id_cache,
+    get_var_bind_size,
+    localize_usm_user,
+    shared_snmp_engine,
+)
+
+
+class TestSnmpClient:
+    @pytest.fixture(autouse=True)
+    def mock_pysnmp(self, mocker):
+        async def fake_create(address, **kwargs):
+            return ("target", address, kwargs)
+
+        async def fake_set_cmd(engine, auth_data, target, context, *var_binds, lookupMib=True):
+            return None, 0, 0, var_binds
+
+        mocker.patch("mfd_powermanagement.snmp.UdpTransportTarget.create", side_effect=fake_create)
+        mocker.patch("mfd_powermanagement.snmp.SnmpEngine", side_effect=lambda: mocker.Mock())
+        return mocker.patch("mfd_powermanagement.snmp.set_cmd", side_effect=fake_set_cmd)
+
+    @pytest.fixture(autouse=True)
+    def clear_shared_clients(self):
+        yield
+        SnmpClient._shared_clients.clear()
+        _engine_ids.clear()
+        _localized_keys.clear()
+
+    @pytest.fixture()
+    def usm_user(self):
+        return UsmUserData("admin", "authpass123", "privpass123", USM_AUTH_HMAC96_SHA, USM_PRIV_CFB128_AES)
+
+    def test_set_reuses_engine_and_transport(self, mock_pysnmp):
+        client = SnmpClient(ip="10.10.10.10", udp_port=1161)
+        assert client.set("vb1") == (None, 0, 0, ("vb1",))
+        assert client.set("vb2") == (None, 0, 0, ("vb2",))
+        first_call, second_call = mock_pysnmp.call_args_list
+        assert first_call.args[0] is second_call.args[0]
+        assert first_call.args[2] is second_call.args[2]
+        assert first_call.args[2] == ("target", ("10.10.10.10", 1161), {"timeout": 1, "retries": 5})
+        client.close()
+
+    def test_async_set_engine_per_loop(self, mock_pysnmp):
+        client = SnmpClient(ip="10.10.10.10")
+
+        async def run():
+            return await asyncio.gather(client.async_set("vb1"), client.async_set("vb2"))
+
+        assert asyncio.run(run()) == [(None, 0, 0, ("vb1",)), (None, 0, 0, ("vb2",))]
+        client.set("vb3")
+        first_call, second_call, third_call = mock_pysnmp.call_args_list
+        assert first_call.args[0] is second_call.args[0]
+        assert first_call.args[0] is not third_call.args[0]
+        client.close()
+        assert client.closed
+
+    def test_shared_snmp_engine(self, mock_pysnmp):
+        first_client = SnmpClient(ip="10.10.10.10")
+        second_client = SnmpClient(ip="10.10.10.11")
+
+        async def run():
+            with shared_snmp_engine() as engine:
+                await asyncio.gather(first_client.async_set("vb1"), second_client.async_set("vb2"))
+            return engine
+
+        engine = asyncio.run(run())
+        first_call, second_call = mock_pysnmp.call_args_list
+        assert first_call.args[0] is engine
+        assert second_call.args[0] is engine
+        engine.close_dispatcher.assert_called_once()
+        first_client.close()
+        engine.close_dispatcher.assert_called_once()
+
+    def test_sync_call_in_running_loop(self):
+        client = SnmpClient(ip="10.10.10.10")
+
+        async def run():
+            client.set("vb")
+
+        with pytest.raises(PowerManagementException):
+            asyncio.run(run())
+
+    def test_close(self):
+        client = SnmpClient(ip="10.10.10.10")
+        assert client.closed
+        client.set("vb")
+        assert not client.closed
+        client.close()
+        assert client.closed
+
+    def test_context_manager(self):
+        with SnmpClient(ip="10.10.10.10") as client:
+            client.set("vb")
+        assert client.closed
+
+    def test_shared_client(self):
+        first = SnmpClient.shared(ip="10.10.10.10")
+        second = SnmpClient.shared(ip="10.10.10.10")
+        other = SnmpClient.shared(ip="10.10.10.11")
+        assert first is second
+        assert first is not other
+        first.set("vb")
+        first.close()
+        assert not first.closed
+        second.close()
+        assert first.closed
+        assert SnmpClient.shared(ip="10.10.10.10") is not first
+
+    def test_shared_client_repeated_close(self):
+        first = SnmpClient.shared(ip="10.10.10.10")
+        first.close()
+        first.close()
+        newer = SnmpClient.shared(ip="10.10.10.10")
+        assert newer is not first
+        newer.set("vb")
+        first.close()
+        assert not newer.closed
+        assert SnmpClient.shared(ip="10.10.10.10") is newer
+
+    def test_split_var_binds(self):
+        client = SnmpClient(ip="10.10.10.10", community_string="private", max_message_size=100)
+        assert client.message_overhead == 39
+        assert client.split_var_binds([25, 25, 25, 25]) == [[0, 1], [2, 3]]
+        assert client.split_var_binds([70, 70]) == [[0], [1]]
+        assert client.split_var_binds([]) == []
+
+    def test_compile_var_bind(self):
+        var_bind = compile_var_bind("1.3.6.1.4.1.318.1.1.12.3.3.1.1.4.7", 2)
+        assert compile_var_bind("1.3.6.1.4.1.318.1.1.12.3.3.1.1.4.7", 2) is var_bind
+        assert compile_var_bind("1.3.6.1.4.1.318.1.1.12.3.3.1.1.4.7", 1) is not var_bind
+        assert var_bind.is_fully_resolved()
+        assert tuple(var_bind[0]) == (1, 3, 6, 1, 4, 1, 318, 1, 1, 12, 3, 3, 1, 1, 4, 7)
+        assert int(var_bind[1]) == 2
+        assert compile_var_bind("1.3.6.1.4.1.318.1.1.12.3.5.1.1.4.7").is_fully_resolved()
+
+    def test_set_without_mib_lookup(self, mock_pysnmp):
+        with SnmpClient(ip="10.10.10.10") as client:
+            client.set("vb")
+        assert mock_pysnmp.call_args.kwargs == {"lookupMib": False}
+
+    def test_get_var_bind_size(self):
+        assert get_var_bind_size("1.3.6.1.4.1.318.1.1.12.3.3.1.1.4.48", 2) == 23
+
+    def test_bulk_walk(self, mocker):
+        responses = [
+            (None, 0, 0, [(ObjectName("1.2.3.1"), 1), (ObjectName("1.2.3.2"), 2)]),
+            (None, 0, 0, [(ObjectName("1.2.3.3"), 1), (ObjectName("1.2.4.1"), 5)]),
+        ]
+        bulk_cmd = mocker.patch("mfd_powermanagement.snmp.bulk_cmd", side_effect=responses)
+        with SnmpClient(ip="10.10.10.10") as client:
+            assert client.bulk_walk("1.2.3", max_repetitions=2) == {(1,): 1, (2,): 2, (3,): 1}
+        assert bulk_cmd.call_count == 2
+        assert bulk_cmd.call_args.args[4:6] == (0, 2)
+
+        bulk_cmd = mocker.patch(
+            "mfd_powermanagement.snmp.bulk_cmd", return_value=(None, 0, 0, [(ObjectName("1.2.3"), EndOfMibView())])
+        )
+        with SnmpClient(ip="10.10.10.10") as client:
+            assert client.bulk_walk("1.2.3") == {}
+
+    def test_bulk_walk_error(self, mocker):
+        mocker.patch("mfd_powermanagement.snmp.bulk_cmd", return_value=("timeout", 0, 0, []))
+        with SnmpClient(ip="10.10.10.10") as client:
+            with pytest.raises(PDUConfigurationException):
+                client.bulk_walk("1.2.3")
+
+    def test_localize_usm_user_cached(self, mocker, usm_user):
+        localize_keys = mocker.patch("mfd_powermanagement.snmp._localize_keys", return_value=(b"auth", b"priv"))
+        first = localize_usm_user(usm_user, b"\x80\x00\x01")
+        second = localize_usm_user(usm_user, b"\x80\x00\x01")
+        localize_usm_user(usm_user, b"\x80\x00\x02")
+        assert localize_keys.call_count == 2
+        assert first.authentication_key == second.authentication_key == b"auth"
+        assert first.privacy_key == b"priv"
+        assert first.authKeyType == first.privKeyType == USM_KEY_TYPE_LOCALIZED
+        assert bytes(first.securityEngineId) == b"\x80\x00\x01"
+        assert first.privacy_protocol == USM_PRIV_CFB128_AES
+
+    def test_localize_usm_user_keys(self, usm_user):
+        localized = localize_usm_user(usm_user, b"\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x02")
+        # RFC 3414 A.3.2 localized SHA key for "maplesyrup" pass phrase
+        reference = localize_usm_user(
+            UsmUserData("admin", "maplesyrup", authProtocol=USM_AUTH_HMAC96_SHA),
+            b"\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x02",
+        )
+        assert bytes(reference.authentication_key).hex() == "6695febc9288e36282235fc7151f128497b38f3f"
+        assert len(localized.privacy_key) == 16
+
+    def test_v3_engine_id_discovered_once(self, mocker, mock_pysnmp, usm_user):
+        async def fake_get_cmd(engine, auth_data, target, context, *var_binds, **kwargs):
+            if auth_data.userName == "mfd-discovery":
+                observer = engine.observer.register_observer.call_args.args[0]
+                observer(engine, "rfc3412.prepareDataElements:internal", {"securityEngineId": b"\x80\x00\x01"}, None)
+                return "unknownUserName", 0, 0, ()
+            return None, 0, 0, var_binds
+
+        get_cmd = mocker.patch("mfd_powermanagement.snmp.get_cmd", side_effect=fake_get_cmd)
+        localize_keys = mocker.patch("mfd_powermanagement.snmp._localize_keys", return_value=(b"auth", b"priv"))
+        for _ in range(2):
+            with SnmpClient(ip="10.10.10.10", usm_user=usm_user) as client:
+                client.get("vb1")
+                client.set("vb2")
+        assert [call.args[1].userName for call in get_cmd.call_args_list] == ["mfd-discovery", "admin", "admin"]
+        assert localize_keys.call_count == 1
+        auth_data = mock_pysnmp.call_args.args[1]
+        assert bytes(auth_data.securityEngineId) == b"\x80\x00\x01"
+        assert auth_data.authKeyType == USM_KEY_TYPE_LOCALIZED
+
+    def test_v3_engine_id_rediscovered_when_stale(self, mocker, mock_pysnmp, usm_user):
+        engine_id = {"current": b"\x80\x00\x01"}
+
+        async def fake_get_cmd(engine, auth_data, target, context, *var_binds, **kwargs):
+            if auth_data.userName == "mfd-discovery":
+                observer = engine.observer.register_observer.call_args.args[0]
+                observer(
+                    engine, "rfc3412.prepareDataElements:internal", {"securityEngineId": engine_id["current"]}, None
+                )
+                return "unknownUserName", 0, 0, ()
+            if bytes(auth_data.securityEngineId) != engine_id["current"]:
+                return errind.unknownEngineID, 0, 0, ()
+            return None, 0, 0, var_binds
+
+        get_cmd = mocker.patch("mfd_powermanagement.snmp.get_cmd", side_effect=fake_get_cmd)
+        with SnmpClient(ip="10.10.10.10", usm_user=usm_user) as client:
+            assert client.get("vb1") == (None, 0, 0, ("vb1",))
+            engine_id["current"] = b"\x80\x00\x02"
+            assert client.get("vb2") == (None, 0, 0, ("vb2",))
+        assert [call.args[1].userName for call in get_cmd.call_args_list] == [
+            "mfd-discovery",
+            "admin",
+            "admin",
+            "mfd-discovery",
+            "admin",
+        ]
+        assert _engine_ids[("10.10.10.10", 161)] == b"\x80\x00\x02"
+
+    def test_clear_engine_id_cache(self):
+        _engine_ids[("10.10.10.10", 161)] = b"\x80\x00\x01"
+        _engine_ids[("10.10.10.11", 161)] = b"\x80\x00\x02"
+        clear_engine_id_cache("10.10.10.10")
+        assert list(_engine_ids) == [("10.10.10.11", 161)]
+        clear_engine_id_cache()
+        assert not _engine_ids
+
+    def test_v3_shared_client_per_credentials(self, usm_user):
+        other_key = UsmUserData("admin", "otherpass123", "privpass123", USM_AUTH_HMAC96_SHA, USM_PRIV_CFB128_AES)
+        same = UsmUserData("admin", "authpass123", "privpass123", USM_AUTH_HMAC96_SHA, USM_PRIV_CFB128_AES)
+        first = SnmpClient.shared(ip="10.10.10.10", usm_user=usm_user)
+        assert SnmpClient.shared(ip="10.10.10.10", usm_user=same) is first
+        assert SnmpClient.shared(ip="10.10.10.10", usm_user=other_key) is not first
+        assert SnmpClient.shared(ip="10.10.10.10", usm_user=UsmUserData("admin", "authpass123")) is not first
+
+    def test_v3_engine_id_discovery_failed(self, mocker, usm_user):
+        async def fake_get_cmd(*args, **kwargs):
+            return "requestTimedOut", 0, 0, ()
+
+        mocker.patch("mfd_powermanagement.snmp.get_cmd", side_effect=fake_get_cmd)
+        with SnmpClient(ip="10.10.10.10", usm_user=usm_user) as client:
+            with pytest.raises(PDUConfigurationException, match="engine ID discovery failed"):
+                client.get("vb1")
+
+    def test_v3_message_overhead(self, usm_user):
+        assert SnmpClient(ip="10.10.10.10", usm_user=usm_user).message_overhead == 165
+        assert SnmpClient(ip="10.10.10.10", community_string="private").message_overhead == 39
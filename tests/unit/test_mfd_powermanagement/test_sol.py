@@ -0,0 +1,109 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: MIT
+import sys
+import time
+
+import pytest
+from mfd_connect import LocalConnection
+
+from mfd_powermanagement.exceptions import PowerManagementException
+from mfd_powermanagement.sol import BOOT_PATTERNS, SolConsole, SolPatternMatcher
+
+FAKE_SOL = """
+import sys
+import time
+for line in ["[SOL Session operational.  Use ~? for help]", "Press [F2] to enter setup", "Loading Linux 6.1",
+             "Linux version 6.1.0"]:
+    print(line, flush=True)
+    time.sleep(0.01)
+sys.stdout.write("host login: ")
+sys.stdout.flush()
+for line in sys.stdin:
+    if line.startswith("~."):
+        break
+"""
+
+
+class TestSolPatternMatcher:
+    def test_feed_chunks(self):
+        matcher = SolPatternMatcher(BOOT_PATTERNS)
+        assert matcher.feed("BdsDxe: loading Boot0001\r\nGNU GR") == ["post_complete"]
+        assert matcher.feed("UB version 2.06\r\n") == ["bootloader"]
+        assert matcher.feed("host log") == []
+        assert matcher.feed("in: ") == ["login_prompt"]
+        assert matcher.matches["login_prompt"] == "login: "
+
+    def test_feed_characters(self):
+        matcher = SolPatternMatcher({"prompt": r"login:\s*$"})
+        matched = [name for char in "x\nhost login: " for name in matcher.feed(char)]
+        assert matched == ["prompt"]
+
+    def test_pattern_within_line(self):
+        matcher = SolPatternMatcher({"event": r"a b"})
+        assert matcher.feed("a\nb\n") == []
+
+    def test_reported_once(self):
+        matcher = SolPatternMatcher({"event": r"ready"})
+        assert matcher.feed("ready\n") == ["event"]
+        assert matcher.feed("ready\n") == []
+        matcher.reset()
+        assert matcher.feed("ready\n") == ["event"]
+
+    def test_max_line(self):
+        matcher = SolPatternMatcher({"event": r"^x"}, max_line=4)
+        assert matcher.feed("xabcdefghi") == []
+        assert len(matcher._line) == 4
+        assert matcher.feed("\n") == []
+
+    def test_line_searched_once(self, mocker):
+        matcher = SolPatternMatcher({"event": r"ready"})
+        pattern = mocker.Mock(wraps=matcher._patterns["event"])
+        matcher._patterns["event"] = pattern
+        for char in "x" * 1000 + "\n":
+            matcher.feed(char)
+        pattern.search.assert_called_once()
+
+    def test_prompt_without_new_line(self):
+        matcher = SolPatternMatcher({"grub": r"grub>\s*$"})
+        matched = [name for char in "GNU GRUB\ngrub> " for name in matcher.feed(char)]
+        assert matched == ["grub"]
+
+
+class TestSolConsole:
+    @pytest.fixture()
+    def console(self, tmp_path):
+        script = tmp_path / "sol.py"
+        script.write_text(FAKE_SOL)
+        with SolConsole(LocalConnection(), f"{sys.executable} {script}") as console:
+            yield console
+
+    def test_wait_for(self, console):
+        event_time = console.wait_for("login_prompt", timeout=10)
+        assert event_time <= time.monotonic()
+        assert list(console.events) == ["post_complete", "bootloader", "kernel", "login_prompt"]
+        assert "Loading Linux" in console.output
+
+    def test_close(self, console):
+        console.wait_for("login_prompt", timeout=10)
+        process = console._process
+        console.close()
+        assert not process.running
+        assert not console.running
+
+    def test_unknown_event(self, console):
+        with pytest.raises(ValueError):
+            console.wait_for("unknown", timeout=1)
+
+    def test_timeout(self, tmp_path):
+        script = tmp_path / "sol.py"
+        script.write_text(FAKE_SOL.replace("host login: ", ""))
+        with SolConsole(LocalConnection(), f"{sys.executable} {script}") as console:
+            with pytest.raises(PowerManagementException):
+                console.wait_for("login_prompt", timeout=0.5)
+
+    def test_exit_before_event(self, tmp_path):
+        script = tmp_path / "sol.py"
+        script.write_text("print('Error: SOL payload already active on another session')\n")
+        with SolConsole(LocalConnection(), f"{sys.executable} {script}") as console:
+            with pytest.raises(PowerManagementException, match="exited"):
+                console.wait_for("login_prompt", timeout=10)